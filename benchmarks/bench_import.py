@@ -0,0 +1,60 @@
+"""
+Замер времени импорта модулей polyseq в "холодном" процессе.
+
+Каждый импорт выполняется в отдельном интерпретаторе (как у короткоживущих воркеров),
+замер повторяется несколько раз, выводится медиана. Для сравнения замеряется
+импорт matplotlib.pyplot, который раньше подтягивался вместе с polyseq.generators.
+
+Запуск:
+    python benchmarks/bench_import.py [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = (
+    'polyseq.generators',
+    'polyseq.transformers',
+    'polyseq.filters',
+    'polyseq.aggregates',
+    'polyseq.visualization',
+    'matplotlib.pyplot',
+)
+
+_PROBE = (
+    'import sys, time\n'
+    't = time.perf_counter()\n'
+    'import {module}\n'
+    'print(time.perf_counter() - t, "matplotlib" in sys.modules)\n'
+)
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module: str, repeat: int) -> tuple[float, bool]:
+    """Медианное время импорта модуля в новом процессе (с) и признак загрузки matplotlib."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (_ROOT, os.environ.get('PYTHONPATH')))))
+    times, loads_matplotlib = [], False
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', _PROBE.format(module=module)],
+                             capture_output=True, text=True, check=True, env=env).stdout.split()
+        times.append(float(out[0]))
+        loads_matplotlib = out[1] == 'True'
+    return statistics.median(times), loads_matplotlib
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='количество запусков на модуль')
+    args = parser.parse_args()
+
+    print(f'{"module":<24}{"import, ms":>12}  matplotlib loaded')
+    for module in MODULES:
+        seconds, loads_matplotlib = measure(module, args.repeat)
+        print(f'{module:<24}{seconds * 1000:>12.1f}  {"yes" if loads_matplotlib else "no"}')
+
+
+if __name__ == '__main__':
+    main()
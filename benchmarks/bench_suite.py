@@ -0,0 +1,218 @@
+"""
+Бенчмарки публичных функций polyseq на масштабируемых размерах входных данных.
+
+Для каждой функции и каждой пары (количество многоугольников, количество вершин)
+замеряются пропускная способность (многоугольников в секунду), задержка
+(время обработки одного многоугольника) и пиковое потребление памяти (tracemalloc).
+Результаты сохраняются в JSON; два JSON-файла можно сравнить и найти регрессии.
+
+Запуск:
+    python benchmarks/bench_suite.py run --polygons 1000 100000 --vertices 3 100 --out new.json
+    python benchmarks/bench_suite.py compare old.json new.json --threshold 0.1
+    python benchmarks/bench_suite.py list
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from polyseq.generators import gen_reg_polygon_seq, gen_random_polygon_seq, gen_random_polygon_batch
+from polyseq.transformers import (tr_translate, tr_rotate, tr_symmetry, tr_homothety, tr_stretch_plane,
+                                  tr_translate_batch, tr_rotate_batch, tr_symmetry_batch, tr_homothety_batch,
+                                  tr_stretch_plane_batch, Transform)
+from polyseq.filters import (flt_convex_polygon, flt_vertex_point, flt_area_lt, flt_shortest_side_lt,
+                             flt_point_inside, flt_polygon_vertices)
+from polyseq.aggregates import (agr_origin_nearest, agr_max_side, agr_min_area, agr_perimeter, agr_area,
+                                agr_summary)
+
+
+def _consume(iterable):
+    deque(iterable, maxlen=0)
+
+
+def _visualize(polygons, batched=False):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from polyseq.visualization import visualize
+    ax = visualize(polygons, 0, None, batched=batched)
+    ax.figure.canvas.draw()
+    plt.close('all')
+
+
+# Каждый случай: имя -> (подготовка входа, замеряемая функция).
+# Подготовка получает (n_polygons, n_vertices) и не входит в замер.
+_POLYGONS = lambda n, v: gen_random_polygon_batch(n, n_sides=v, rng=0, packed=False)
+_BATCH = lambda n, v: gen_random_polygon_batch(n, n_sides=v, rng=0)
+_SIZES = lambda n, v: (n, v)
+
+CASES = {
+    'gen_reg_polygon_seq': (_SIZES, lambda nv: _consume(gen_reg_polygon_seq(max(nv[1], 3), n_figs=nv[0]))),
+    'gen_random_polygon_seq': (_SIZES, lambda nv: _consume(gen_random_polygon_seq(nv[0], n_sides=nv[1]))),
+    'gen_random_polygon_batch': (_SIZES, lambda nv: gen_random_polygon_batch(nv[0], n_sides=nv[1], rng=0)),
+
+    'tr_translate': (_POLYGONS, lambda ps: _consume(map(lambda p: tr_translate(p, 1, 2), ps))),
+    'tr_rotate': (_POLYGONS, lambda ps: _consume(map(lambda p: tr_rotate(p, 30), ps))),
+    'tr_symmetry': (_POLYGONS, lambda ps: _consume(map(lambda p: tr_symmetry(p, 'x'), ps))),
+    'tr_homothety': (_POLYGONS, lambda ps: _consume(map(lambda p: tr_homothety(p, (1, 1), 2), ps))),
+    'tr_stretch_plane': (_POLYGONS, lambda ps: _consume(map(lambda p: tr_stretch_plane(p, 2, 3), ps))),
+    'Transform (4 fused steps)': (_POLYGONS, lambda ps: _consume(map(
+        Transform.stretch_plane(cy=3).then(Transform.rotate(45))
+        .then(Transform.homothety((0, 0), 1.5)).then(Transform.translate(3, 3)), ps))),
+    'tr_translate_batch': (_BATCH, lambda b: tr_translate_batch(b, 1, 2)),
+    'tr_rotate_batch': (_BATCH, lambda b: tr_rotate_batch(b, 30)),
+    'tr_symmetry_batch': (_BATCH, lambda b: tr_symmetry_batch(b, 'x')),
+    'tr_homothety_batch': (_BATCH, lambda b: tr_homothety_batch(b, (1, 1), 2)),
+    'tr_stretch_plane_batch': (_BATCH, lambda b: tr_stretch_plane_batch(b, 2, 3)),
+
+    'flt_convex_polygon': (_POLYGONS, lambda ps: _consume(filter(flt_convex_polygon, ps))),
+    'flt_vertex_point': (_POLYGONS, lambda ps: _consume(filter(lambda p: flt_vertex_point(p, (1, 1)), ps))),
+    'flt_area_lt': (_POLYGONS, lambda ps: _consume(filter(lambda p: flt_area_lt(p, 50), ps))),
+    'flt_shortest_side_lt': (_POLYGONS, lambda ps: _consume(filter(lambda p: flt_shortest_side_lt(p, 1), ps))),
+    'flt_point_inside': (_POLYGONS, lambda ps: _consume(filter(lambda p: flt_point_inside(p, (25, 25)), ps))),
+    'flt_polygon_vertices': (_POLYGONS, lambda ps: _consume(filter(
+        lambda p: flt_polygon_vertices(p, ((0, 0), (1, 1))), ps))),
+
+    'agr_origin_nearest': (_POLYGONS, agr_origin_nearest),
+    'agr_max_side': (_POLYGONS, agr_max_side),
+    'agr_min_area': (_POLYGONS, agr_min_area),
+    'agr_perimeter': (_POLYGONS, agr_perimeter),
+    'agr_area': (_POLYGONS, agr_area),
+    'agr_summary': (_POLYGONS, agr_summary),
+
+    'visualize': (_POLYGONS, _visualize),
+    'visualize (batched)': (_BATCH, lambda b: _visualize(b, batched=True)),
+}
+
+# visualize создает по артисту matplotlib на многоугольник, поэтому по умолчанию ограничен по размеру
+_LIMITS = {'visualize': 10**4}
+
+
+def measure(case: str, n_polygons: int, n_vertices: int, repeat: int) -> dict:
+    """Замеряет один случай: лучшее из repeat значений времени и пиковую память отдельным прогоном."""
+    prepare, func = CASES[case]
+    data = prepare(n_polygons, n_vertices)
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = min(times)
+    return {
+        'case': case,
+        'n_polygons': n_polygons,
+        'n_vertices': n_vertices,
+        'seconds': seconds,
+        'throughput': n_polygons / seconds if seconds else math.inf,
+        'latency_us': seconds / n_polygons * 1e6,
+        'peak_mem_bytes': peak,
+    }
+
+
+def run(args):
+    pattern = re.compile(args.filter) if args.filter else None
+    results = []
+    for case in CASES:
+        if pattern and not pattern.search(case):
+            continue
+        for n_polygons in args.polygons:
+            for n_vertices in args.vertices:
+                if n_polygons * n_vertices > args.max_total_vertices or n_polygons > _LIMITS.get(case, math.inf):
+                    continue
+                result = measure(case, n_polygons, n_vertices, args.repeat)
+                results.append(result)
+                print(f'{case:<28}{n_polygons:>10}{n_vertices:>7}  {result["throughput"]:>14,.0f} poly/s  '
+                      f'{result["latency_us"]:>10.3f} us  {result["peak_mem_bytes"] / 2**20:>9.2f} MiB', flush=True)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+def compare(args):
+    """Сравнивает пропускную способность двух прогонов; код возврата 1 при наличии регрессий."""
+    with open(args.baseline) as f:
+        baseline = {(r['case'], r['n_polygons'], r['n_vertices']): r for r in json.load(f)['results']}
+    with open(args.candidate) as f:
+        candidate = json.load(f)['results']
+
+    regressions = 0
+    print(f'{"case":<28}{"polygons":>10}{"verts":>7}{"baseline":>16}{"candidate":>16}{"change":>9}')
+    for result in candidate:
+        key = (result['case'], result['n_polygons'], result['n_vertices'])
+        if key not in baseline:
+            continue
+        old, new = baseline[key]['throughput'], result['throughput']
+        change = new / old - 1
+        flag = ''
+        if change < -args.threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f'{key[0]:<28}{key[1]:>10}{key[2]:>7}{old:>16,.0f}{new:>16,.0f}{change:>+9.1%}{flag}')
+
+    print(f'{regressions} regression(s) beyond {args.threshold:.0%}')
+    sys.exit(1 if regressions else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='запустить бенчмарки')
+    run_parser.add_argument('--polygons', type=int, nargs='+', default=[10**3, 10**4, 10**5],
+                            help='количества многоугольников (от 10^3 до 10^7)')
+    run_parser.add_argument('--vertices', type=int, nargs='+', default=[3, 10, 100],
+                            help='количества вершин в многоугольнике (от 3 до 10^4)')
+    run_parser.add_argument('--max-total-vertices', type=int, default=10**7,
+                            help='пропускать размеры, где многоугольников * вершин больше этого значения')
+    run_parser.add_argument('--repeat', type=int, default=3, help='количество повторов замера времени')
+    run_parser.add_argument('--filter', help='регулярное выражение для отбора случаев по имени')
+    run_parser.add_argument('--out', help='путь к JSON-файлу с результатами')
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser('compare', help='сравнить два JSON-файла с результатами')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='допустимое относительное падение пропускной способности')
+    compare_parser.set_defaults(handler=compare)
+
+    list_parser = commands.add_parser('list', help='перечислить случаи')
+    list_parser.set_defaults(handler=lambda args: print('\n'.join(CASES)))
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,18 @@
+import itertools
 import math
 
+import numpy as np
+
+from polyseq.batch import PolygonBatch
+from polyseq.filters import _convex
+from polyseq.generators import RegPolygonSeq
+from polyseq.instrumentation import instrumented
+from polyseq.polygon import Polygon
+
 def _sides(poly):
     """Возвращает длины рёбер многоугольника в виде кортежа."""
+    if isinstance(poly, Polygon):
+        return poly.sides
     n = len(poly)
     return tuple(
         math.dist(poly[i], poly[(i + 1) % n])
@@ -9,27 +20,985 @@ def _sides(poly):
     )
 def _area(poly: tuple[tuple[float, float], ...]) -> float:
     """Формула площади Гаусса (алгоритм шнурования)."""
+    if isinstance(poly, Polygon):
+        return poly.area
     n = len(poly)
     return 0.5*abs(sum(
         (poly[i][0]*poly[(i+1) % n][1] - poly[(i+1) % n][0]*poly[i][1])
         for i in range(n)))
 
+def _check_strip_not_empty(strip: RegPolygonSeq):
+    if not strip.n_figs:
+        raise ValueError('min/max aggregates of an empty sequence are undefined')
+
+def _strip_nearest_vertex(strip: RegPolygonSeq, point: tuple[float, float]) -> tuple[float, int]:
+    """
+    agr_nearest_vertex для ленты за O(n_sides): для каждой вершины базового многоугольника
+    расстояние до точки – выпуклая функция номера фигуры k, поэтому достаточно
+    проверить два ближайших целых к точке минимума, ограниченных диапазоном [0, n_figs).
+    """
+    _check_strip_not_empty(strip)
+    px, py = point
+    last = strip.n_figs - 1
+    nearest = (math.inf, 0)
+    for x, y in strip.base_poly:
+        x += strip.x_offset
+        if strip.x_shift:
+            k = (px - x) / strip.x_shift
+            candidates = {min(max(math.floor(k), 0), last), min(max(math.ceil(k), 0), last)}
+        else:
+            candidates = {0}
+        nearest = min(nearest, *((math.dist((x + k*strip.x_shift, y), point), k) for k in candidates))
+    return nearest
+
+def _strip_origin_nearest(strip: RegPolygonSeq) -> float:
+    return _strip_nearest_vertex(strip, (0, 0))[0]
+
+def _strip_max_side(strip: RegPolygonSeq) -> float:
+    _check_strip_not_empty(strip)
+    return max(_sides(strip.base_poly))
+
+def _strip_min_area(strip: RegPolygonSeq) -> float:
+    _check_strip_not_empty(strip)
+    return _area(strip.base_poly)
+
+# Замкнутые формулы агрегатов для лент из gen_reg_polygon_seq: все фигуры ленты –
+# копии базового многоугольника, поэтому обходить их не нужно.
+_STRIP_AGGREGATES = {
+    'area': lambda strip: strip.n_figs * _area(strip.base_poly) if strip.n_figs else 0,
+    'perimeter': lambda strip: strip.n_figs * sum(_sides(strip.base_poly)) if strip.n_figs else 0,
+    'max_side': _strip_max_side,
+    'min_area': _strip_min_area,
+    'origin_nearest': _strip_origin_nearest,
+}
+
+
+_NEAREST_CHUNK = 4096  # сколько многоугольников agr_nearest_vertex упаковывает в один пакет
+
+
+def _nearest_vertex(polygon_seq, point: tuple[float, float]) -> tuple[float, int]:
+    if isinstance(polygon_seq, RegPolygonSeq):
+        return _strip_nearest_vertex(polygon_seq, point)
+
+    # обычная последовательность обрабатывается пакетами, поэтому память не зависит от ее длины
+    if isinstance(polygon_seq, PolygonBatch):
+        chunks = (polygon_seq,)
+    else:
+        it = iter(polygon_seq)
+        chunks = map(PolygonBatch.from_polygons, iter(lambda: tuple(itertools.islice(it, _NEAREST_CHUNK)), ()))
+    nearest, first = (math.inf, -1), 0
+    for batch in chunks:
+        if batch.n_vertices:
+            distances = np.hypot(batch.coords[:, 0] - point[0], batch.coords[:, 1] - point[1])
+            vertex = int(np.argmin(distances))
+            k = first + int(np.searchsorted(batch.offsets, vertex, side='right')) - 1
+            nearest = min(nearest, (float(distances[vertex]), k), key=lambda item: item[0])
+        first += len(batch)
+    if nearest[1] < 0:
+        raise ValueError('min/max aggregates of an empty sequence are undefined')
+    return nearest
+
+@instrumented('seq')
+def agr_nearest_vertex(polygon_seq, point: tuple[float, float] = (0, 0)) -> tuple[float, int]:
+    """
+    Ближайшая к точке вершина среди всех многоугольников последовательности.
+    Вершины обрабатываются векторизованно пакетами; для лент из gen_reg_polygon_seq ответ
+    вычисляется по замкнутой формуле, в том числе для бесконечной ленты. Для многих точек-запросов
+    к одной последовательности выгоднее построить polyseq.nearest.NearestIndex.
+
+    Аргументы:
+        polygon_seq: Итерируемая последовательность многоугольников.
+        point: Точка (x, y). По умолчанию начало координат.
+
+    Возвращает:
+        Пара (расстояние, номер многоугольника); при равных расстояниях – наименьший номер.
+
+    Исключения:
+        ValueError: Если в последовательности нет ни одной вершины.
+    """
+    return _nearest_vertex(polygon_seq, point)
+
+@instrumented('seq')
 def agr_origin_nearest(polygon_seq):
-    """Минимальное расстояние от начала координат до любой вершины всех многоугольников."""
-    return min(min(math.dist(point, (0, 0)) for point in poly) for poly in polygon_seq)
+    """Минимальное расстояние от начала координат до любой вершины всех многоугольников (см. agr_nearest_vertex)."""
+    return _nearest_vertex(polygon_seq, (0, 0))[0]
 
+@instrumented('seq')
 def agr_max_side(polygon_seq):
     """Максимальная длина стороны среди всех многоугольников."""
+    if isinstance(polygon_seq, RegPolygonSeq):
+        return _strip_max_side(polygon_seq)
     return max(map(max, map(_sides, polygon_seq)))
 
+@instrumented('seq')
 def agr_min_area(polygon_seq):
     """Минимальная площадь среди всех многоугольников."""
+    if isinstance(polygon_seq, RegPolygonSeq):
+        return _strip_min_area(polygon_seq)
     return min(map(_area, polygon_seq))
 
+@instrumented('seq')
 def agr_perimeter(polygon_seq):
     """Суммарный периметр всех многоугольников из последовательности."""
-    return sum(map(lambda poly: sum(_sides(poly)), polygon_seq))
+    if isinstance(polygon_seq, RegPolygonSeq):
+        return _STRIP_AGGREGATES['perimeter'](polygon_seq)
+    return sum(map(lambda poly: poly.perimeter if isinstance(poly, Polygon) else sum(_sides(poly)), polygon_seq))
 
+@instrumented('seq')
 def agr_area(polygon_seq):
     """Суммарная площадь всех многоугольников из последовательности."""
-    return sum(map(_area, polygon_seq))
\ No newline at end of file
+    if isinstance(polygon_seq, RegPolygonSeq):
+        return _STRIP_AGGREGATES['area'](polygon_seq)
+    return sum(map(_area, polygon_seq))
+
+AGGREGATES = ('area', 'perimeter', 'max_side', 'min_area', 'origin_nearest')
+
+@instrumented('seq')
+def agr_summary(polygon_seq, stats=AGGREGATES) -> dict[str, float]:
+    """
+    Вычисляет несколько агрегатов за один проход по последовательности.
+    Длины сторон и площадь каждого многоугольника считаются не более одного раза
+    и используются всеми запрошенными агрегатами, поэтому последовательность
+    (в том числе генератор) не нужно создавать заново или буферизовать через itertools.tee.
+    Для лент из gen_reg_polygon_seq все агрегаты вычисляются по замкнутым формулам.
+
+    Аргументы:
+        polygon_seq: Итерируемая последовательность многоугольников.
+        stats: Названия агрегатов из AGGREGATES: 'area' (agr_area), 'perimeter' (agr_perimeter),
+               'max_side' (agr_max_side), 'min_area' (agr_min_area), 'origin_nearest' (agr_origin_nearest).
+               По умолчанию – все.
+
+    Возвращает:
+        Словарь {название агрегата: значение}.
+
+    Исключения:
+        ValueError: Если передано неизвестное название агрегата или последовательность пуста,
+                    а запрошен один из агрегатов max_side, min_area, origin_nearest.
+    """
+    stats = tuple(dict.fromkeys(stats))
+    unknown = set(stats) - set(AGGREGATES)
+    if unknown:
+        raise ValueError(f'unknown aggregates: {", ".join(sorted(map(str, unknown)))}')
+
+    if isinstance(polygon_seq, RegPolygonSeq):
+        return {name: _STRIP_AGGREGATES[name](polygon_seq) for name in stats}
+
+    need_sides = 'perimeter' in stats or 'max_side' in stats
+    need_area = 'area' in stats or 'min_area' in stats
+    need_nearest = 'origin_nearest' in stats
+
+    count = 0
+    area, perimeter = 0, 0
+    max_side, min_area, nearest = -math.inf, math.inf, math.inf
+    for poly in polygon_seq:
+        count += 1
+        if need_sides:
+            sides = _sides(poly)
+            perimeter += sum(sides)
+            max_side = max(max_side, *sides)
+        if need_area:
+            poly_area = _area(poly)
+            area += poly_area
+            min_area = min(min_area, poly_area)
+        if need_nearest:
+            nearest = min(nearest, min(math.dist(point, (0, 0)) for point in poly))
+
+    results = {'area': area, 'perimeter': perimeter, 'max_side': max_side,
+               'min_area': min_area, 'origin_nearest': nearest}
+    if not count and {'max_side', 'min_area', 'origin_nearest'} & set(stats):
+        raise ValueError('min/max aggregates of an empty sequence are undefined')
+    return {name: results[name] for name in stats}
+
+
+_PAIR_BLOCK = 1 << 20  # максимальное количество пар-кандидатов, обрабатываемых за раз в agr_intersecting_pairs
+
+
+def _ranges(starts: np.ndarray, stops: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Разворачивает диапазоны позиций [starts[i], stops[i]) в пары (i, позиция)."""
+    counts = np.maximum(stops - starts, 0)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    positions = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(starts, counts)
+    return rows, positions
+
+
+def _expand_ranges(starts: np.ndarray, stops: np.ndarray):
+    """
+    То же, что _ranges, блоками не более _PAIR_BLOCK пар
+    (строка с более длинным диапазоном образует блок целиком).
+    """
+    counts = np.maximum(stops - starts, 0)
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    row = 0
+    while row < len(counts):
+        end = max(row + 1, int(np.searchsorted(bounds, bounds[row] + _PAIR_BLOCK, side='right')) - 1)
+        end = min(end, len(counts))
+        rows, positions = _ranges(starts[row:end], stops[row:end])
+        if len(rows):
+            yield rows + row, positions
+        row = end
+
+
+def _sweep_candidates(boxes: np.ndarray, other_boxes: np.ndarray | None):
+    """
+    Широкая фаза: пары многоугольников с пересекающимися ограничивающими прямоугольниками.
+    Прямоугольники сортируются по xmin; для каждого бинарным поиском находятся те, чей xmin
+    попадает в его [xmin, xmax] (каждая пара находится ровно один раз), затем пары
+    отсеиваются по перекрытию по y.
+    """
+    def pairs(query, order, xs, side):
+        # для каждого query[i]: прямоугольники order[p], xs[p] в [query xmin, query xmax] (с учетом side)
+        starts = np.searchsorted(xs, query[:, 0], side=side)
+        stops = np.searchsorted(xs, query[:, 2], side='right')
+        for rows, positions in _expand_ranges(starts, stops):
+            yield rows, order[positions]
+
+    if other_boxes is None:
+        order = np.argsort(boxes[:, 0], kind='stable')
+        xs = boxes[order, 0]
+        sorted_boxes = boxes[order]
+        starts = np.arange(1, len(boxes) + 1)
+        stops = np.searchsorted(xs, sorted_boxes[:, 2], side='right')
+        sweeps = ((order[rows], order[positions]) for rows, positions in _expand_ranges(starts, stops))
+        left_boxes = right_boxes = boxes
+    else:
+        order = np.argsort(other_boxes[:, 0], kind='stable')
+        other_order = np.argsort(boxes[:, 0], kind='stable')
+
+        def sweeps_two():
+            yield from pairs(boxes, order, other_boxes[order, 0], 'left')
+            for rows, positions in pairs(other_boxes, other_order, boxes[other_order, 0], 'right'):
+                yield positions, rows
+        sweeps = sweeps_two()
+        left_boxes, right_boxes = boxes, other_boxes
+
+    for i, j in sweeps:
+        keep = (left_boxes[i, 1] <= right_boxes[j, 3]) & (right_boxes[j, 1] <= left_boxes[i, 3])
+        yield i[keep], j[keep]
+
+
+def _padded_vertices(batch: PolygonBatch, ids: np.ndarray, width: int) -> np.ndarray:
+    """
+    Индексы вершин многоугольников ids в batch.coords, дополненные до width повтором последней вершины.
+    Повтор дает ребро нулевой длины, которое не меняет ни проекции, ни разделяющие оси.
+    """
+    counts = batch.counts[ids]
+    return batch.offsets[ids, None] + np.minimum(np.arange(width), counts[:, None] - 1)
+
+
+def _separating_edge(batch: PolygonBatch, orientation: np.ndarray, ids: np.ndarray,
+                     other: PolygonBatch, other_ids: np.ndarray, width: int) -> np.ndarray:
+    """
+    Для каждой пары выпуклых многоугольников (batch[ids[p]], other[other_ids[p]]), дополненных до width вершин,
+    и знаков ориентированных площадей orientation многоугольников batch: есть ли ребро первого,
+    внешняя нормаль которого отделяет второй многоугольник (все его вершины строго снаружи).
+    Для выпуклого многоугольника его проекция на внешнюю нормаль ребра ограничена самим ребром,
+    поэтому это в точности проверка теоремы о разделяющей оси по нормалям рёбер первого многоугольника.
+    """
+    vertices = _padded_vertices(batch, ids, width)
+    start = batch.coords[vertices]
+    edge = batch.coords[np.roll(vertices, -1, axis=1)] - start
+    orientation = orientation[ids, None]
+    nx, ny = orientation*edge[..., 1], -orientation*edge[..., 0]
+
+    points = other.coords[_padded_vertices(other, other_ids, width)]
+    distance = nx[:, :, None]*(points[:, None, :, 0] - start[:, :, None, 0]) \
+        + ny[:, :, None]*(points[:, None, :, 1] - start[:, :, None, 1])
+    return (distance.min(axis=2) > 0).any(axis=1)
+
+
+def _edges_touch(batch: PolygonBatch, ids: np.ndarray, other: PolygonBatch, other_ids: np.ndarray,
+                 width: int) -> np.ndarray:
+    """
+    Для каждой пары (batch[ids[p]], other[other_ids[p]]), дополненных до width вершин:
+    пересекается ли (или касается) хотя бы одно ребро первого многоугольника с ребром второго.
+    """
+    vertices = _padded_vertices(batch, ids, width)
+    a0, a1 = batch.coords[vertices][:, :, None], batch.coords[np.roll(vertices, -1, axis=1)][:, :, None]
+    vertices = _padded_vertices(other, other_ids, width)
+    b0, b1 = other.coords[vertices][:, None], other.coords[np.roll(vertices, -1, axis=1)][:, None]
+
+    def orientation(p, q, r):
+        return np.sign((q[..., 0] - p[..., 0])*(r[..., 1] - p[..., 1]) - (q[..., 1] - p[..., 1])*(r[..., 0] - p[..., 0]))
+
+    # отрезки пересекаются, если концы каждого не лежат строго по одну сторону от другого
+    # и их ограничивающие прямоугольники перекрываются (последнее важно для коллинеарных отрезков)
+    touch = (orientation(a0, a1, b0)*orientation(a0, a1, b1) <= 0) \
+        & (orientation(b0, b1, a0)*orientation(b0, b1, a1) <= 0)
+    for axis in (0, 1):
+        touch &= (np.minimum(a0[..., axis], a1[..., axis]) <= np.maximum(b0[..., axis], b1[..., axis])) \
+            & (np.minimum(b0[..., axis], b1[..., axis]) <= np.maximum(a0[..., axis], a1[..., axis]))
+    return touch.any(axis=(1, 2))
+
+
+def _first_vertex_inside(batch: PolygonBatch, ids: np.ndarray, other: PolygonBatch, other_ids: np.ndarray,
+                         width: int) -> np.ndarray:
+    """
+    Лежит ли первая вершина многоугольника batch[ids[p]] внутри other[other_ids[p]] (число оборотов ненулевое).
+    Рёбра нулевой длины, добавленные при дополнении до width вершин, в число оборотов не вносят вклада.
+    """
+    point = batch.coords[batch.offsets[ids]]
+    px, py = point[:, 0, None], point[:, 1, None]
+    vertices = _padded_vertices(other, other_ids, width)
+    start, end = other.coords[vertices], other.coords[np.roll(vertices, -1, axis=1)]
+    x1, y1, x2, y2 = start[..., 0], start[..., 1], end[..., 0], end[..., 1]
+    is_left = (x2 - x1)*(py - y1) - (px - x1)*(y2 - y1)
+    below_1, below_2 = y1 <= py, y2 <= py
+    winding = (below_1 & ~below_2 & (is_left > 0)).sum(axis=1) - (below_2 & ~below_1 & (is_left < 0)).sum(axis=1)
+    return winding != 0
+
+
+def _pairs_intersect(batch: PolygonBatch, orientation: np.ndarray, convex: np.ndarray,
+                     other: PolygonBatch, other_orientation: np.ndarray, other_convex: np.ndarray,
+                     i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    Векторизованная узкая фаза – то же, что flt_polygons_intersect(batch[i], other[j]) для каждой пары:
+    для пар невырожденных выпуклых многоугольников – теорема о разделяющей оси по нормалям рёбер обоих,
+    для остальных – пересечение рёбер или вложенность одного многоугольника в другой.
+    Пары обрабатываются группами одинаковой ширины (наибольшего количества вершин в паре)
+    блоками не более _PAIR_BLOCK пар рёбер.
+    """
+    width = np.maximum(batch.counts[i], other.counts[j])
+    order = np.argsort(width, kind='stable')
+    result = np.empty(len(i), dtype=bool)
+    for group in np.split(order, np.flatnonzero(np.diff(width[order])) + 1):
+        if not len(group):
+            continue
+        m = int(width[group[0]])
+        step = max(1, _PAIR_BLOCK // (m*m))
+        for start in range(0, len(group), step):
+            chunk = group[start:start + step]
+            a, b = i[chunk], j[chunk]
+            fast = convex[a] & other_convex[b]
+            hit = np.empty(len(chunk), dtype=bool)
+            if fast.any():
+                fa, fb = a[fast], b[fast]
+                hit[fast] = ~(_separating_edge(batch, orientation, fa, other, fb, m)
+                              | _separating_edge(other, other_orientation, fb, batch, fa, m))
+            if not fast.all():
+                sa, sb = a[~fast], b[~fast]
+                hit[~fast] = _edges_touch(batch, sa, other, sb, m) \
+                    | _first_vertex_inside(batch, sa, other, sb, m) | _first_vertex_inside(other, sb, batch, sa, m)
+            result[chunk] = hit
+    return result
+
+
+@instrumented('seq')
+def agr_intersecting_pairs(polygon_seq, other_seq=None) -> np.ndarray:
+    """
+    Находит все пары пересекающихся многоугольников (касание считается пересечением).
+
+    Широкая фаза отбирает пары с пересекающимися ограничивающими прямоугольниками методом
+    «сортировки и отсечения» (sweep and prune) по оси x за O(N log N + K), где K – количество
+    пар-кандидатов. Узкая фаза векторизована и дает тот же результат, что flt_polygons_intersect:
+    теорема о разделяющей оси для пар выпуклых многоугольников, пересечение рёбер и вложенность – для остальных.
+
+    Аргументы:
+        polygon_seq: Конечная последовательность многоугольников.
+        other_seq: Вторая конечная последовательность. Если не задана, ищутся пересечения
+                   многоугольников polygon_seq между собой.
+
+    Возвращает:
+        Массив пар номеров размера (n_pairs, 2), упорядоченный лексикографически.
+        Для одной последовательности пара (i, j) включается один раз, с i < j;
+        для двух – i – номер в polygon_seq, j – номер в other_seq.
+    """
+    batch = PolygonBatch.from_polygons(polygon_seq)
+    other = batch if other_seq is None else PolygonBatch.from_polygons(other_seq)
+    orientation = np.sign(batch.signed_areas())
+    convex = batch.is_convex() & (orientation != 0)
+    if other_seq is None:
+        other_orientation, other_convex = orientation, convex
+    else:
+        other_orientation = np.sign(other.signed_areas())
+        other_convex = other.is_convex() & (other_orientation != 0)
+
+    found_i, found_j = [], []
+    for i, j in _sweep_candidates(batch.bboxes(), None if other_seq is None else other.bboxes()):
+        hit = _pairs_intersect(batch, orientation, convex, other, other_orientation, other_convex, i, j)
+        found_i.append(i[hit])
+        found_j.append(j[hit])
+
+    if not found_i:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.column_stack((np.concatenate(found_i), np.concatenate(found_j))).astype(np.int64)
+    if other_seq is None:
+        pairs.sort(axis=1)
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
+CLOSEST_PAIR_KINDS = ('vertex', 'edge')
+_CLOSEST_PAIR_LEAF = 4  # в самосоединении число пар элементов растет как квадрат размера листа
+
+
+def _strip_closest_pair(strip: RegPolygonSeq, kind: str) -> tuple[float, int, int]:
+    """
+    agr_closest_pair для ленты за O(n_sides^2): любая пара (k, k + m) ленты – сдвиг пары (0, m).
+    Для вершин a, b расстояние между a фигуры 0 и b фигуры m – выпуклая функция m, поэтому
+    достаточно двух ближайших целых к точке минимума. Базовый многоугольник правильный (выпуклый),
+    а расстояние между выпуклым многоугольником и его сдвигом не убывает с величиной сдвига,
+    поэтому ближайшая по рёбрам пара – соседние фигуры (0, 1).
+    """
+    if strip.n_figs < 2:
+        raise ValueError('closest pair of a sequence with fewer than two non-empty polygons is undefined')
+    shift, last = strip.x_shift, strip.n_figs - 1
+    if kind == 'edge':
+        from polyseq.nearest import _segment_pair_distances
+        base = np.array(strip.base_poly, dtype=np.float64)
+        a, b = np.repeat(np.arange(len(base)), len(base)), np.tile(np.arange(len(base)), len(base))
+        following = np.roll(np.arange(len(base)), -1)
+        moved = base + (shift, 0)
+        return float(_segment_pair_distances(base[a], base[following[a]], moved[b], moved[following[b]]).min()), 0, 1
+
+    nearest = (math.inf, 0, 1)
+    for (xa, ya), (xb, yb) in itertools.product(strip.base_poly, repeat=2):
+        if shift:
+            m = (xa - xb) / shift
+            candidates = {min(max(math.floor(m), 1), last), min(max(math.ceil(m), 1), last)}
+        else:
+            candidates = {1}
+        nearest = min(nearest, *((math.dist((xa, ya), (xb + m*shift, yb)), 0, m) for m in candidates))
+    return nearest
+
+@instrumented('seq')
+def agr_closest_pair(polygon_seq, kinds=CLOSEST_PAIR_KINDS) -> dict[str, tuple[float, int, int]]:
+    """
+    Минимальный зазор между разными многоугольниками последовательности: наименьшее расстояние
+    между вершинами и между рёбрами (границами) двух разных многоугольников.
+
+    Вершины или рёбра упаковываются в дерево ограничивающих прямоугольников
+    (polyseq.nearest.NearestIndex), и пары узлов дерева обходятся с отсечением по лучшему
+    найденному расстоянию, – O(N log N) для данных без сильных перекрытий вместо перебора всех пар.
+    Для лент из gen_reg_polygon_seq ответ вычисляется по замкнутой формуле, в том числе для бесконечной.
+    Расстояние по рёбрам равно 0 для пересекающихся или касающихся многоугольников; для вложенного
+    многоугольника это расстояние между границами.
+
+    Аргументы:
+        polygon_seq: Последовательность многоугольников (конечная, если это не лента).
+        kinds: Какие расстояния вычислять: 'vertex' и/или 'edge'. По умолчанию оба.
+
+    Возвращает:
+        Словарь {kind: (расстояние, i, j)}, где i < j – номера многоугольников ближайшей пары
+        (при равных расстояниях – одна из ближайших пар).
+
+    Исключения:
+        ValueError: Если kind неизвестен или непустых многоугольников меньше двух.
+    """
+    unknown = set(kinds) - set(CLOSEST_PAIR_KINDS)
+    if unknown:
+        raise ValueError(f'unknown closest pair kinds: {", ".join(sorted(unknown))}')
+    if isinstance(polygon_seq, RegPolygonSeq):
+        return {kind: _strip_closest_pair(polygon_seq, kind) for kind in kinds}
+
+    from polyseq.nearest import NearestIndex
+    batch = PolygonBatch.from_polygons(polygon_seq)
+    if np.count_nonzero(batch.counts) < 2:
+        raise ValueError('closest pair of a sequence with fewer than two non-empty polygons is undefined')
+    result = {}
+    for kind in kinds:
+        index = NearestIndex(batch, kind=kind, leaf_size=_CLOSEST_PAIR_LEAF, split_edges=False)
+        result[kind] = index.closest_pair()[:3]
+    return result
+
+
+def _counter_clockwise(batch: PolygonBatch) -> PolygonBatch:
+    """Многоугольники ненулевой площади с вершинами, упорядоченными против часовой стрелки."""
+    signed = batch.signed_areas()
+    keep = np.flatnonzero(signed)
+    first, stop = batch.offsets[keep], batch.offsets[keep + 1]
+    rows, vertices = _ranges(first, stop)
+    vertices = np.where(signed[keep][rows] < 0, first[rows] + stop[rows] - 1 - vertices, vertices)
+    offsets = np.concatenate(([0], np.cumsum(stop - first)))
+    return PolygonBatch(batch.coords[vertices], offsets)
+
+
+def _union_area_exact(batch: PolygonBatch) -> float:
+    """
+    Точная площадь объединения простых многоугольников. Для каждого ребра вычисляется доля его длины,
+    не покрытая другими многоугольниками (события входа и выхода вдоль ребра), и площадь объединения
+    собирается по формуле Гаусса из непокрытых частей рёбер. Совпадающие рёбра засчитываются
+    многоугольнику с меньшим номером. Рёбра сравниваются только с рёбрами многоугольников,
+    ограничивающие прямоугольники которых пересекаются (см. _sweep_candidates).
+    """
+    batch = _counter_clockwise(batch)
+    if not len(batch):
+        return 0.0
+    start, end = batch.coords, batch.coords[batch.next_vertex()]
+    owner = batch.polygon_ids()
+    counts, offsets = batch.counts, batch.offsets
+
+    bboxes = batch.bboxes()
+    pairs = [np.column_stack(pair) for pair in _sweep_candidates(bboxes, None)]
+    pairs = np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+    pairs = np.concatenate((pairs, pairs[:, ::-1]))
+    pairs = pairs[np.argsort(pairs[:, 0], kind='stable')]
+    # объем работы для многоугольника: его рёбра x рёбра соседей плюс два граничных события на ребро
+    work = counts*(np.bincount(pairs[:, 0], weights=counts[pairs[:, 1]], minlength=len(batch)) + 2)
+    bounds = np.concatenate(([0], np.cumsum(work)))
+
+    partials = []
+    first = 0
+    while first < len(batch):
+        last = min(len(batch), max(first + 1, int(np.searchsorted(bounds, bounds[first] + _PAIR_BLOCK, 'right')) - 1))
+        lo, hi = np.searchsorted(pairs[:, 0], [first, last])
+        pi, pj = pairs[lo:hi, 0], pairs[lo:hi, 1]
+        rows, a = _ranges(offsets[pi], offsets[pi + 1])
+        # ребро, не задевающее ограничивающий прямоугольник соседа, им не покрыто ни в одной точке
+        box = bboxes[pj[rows]]
+        near = (np.minimum(start[a, 0], end[a, 0]) <= box[:, 2]) & (np.maximum(start[a, 0], end[a, 0]) >= box[:, 0]) \
+            & (np.minimum(start[a, 1], end[a, 1]) <= box[:, 3]) & (np.maximum(start[a, 1], end[a, 1]) >= box[:, 1])
+        rows, a = rows[near], a[near]
+        rows, b = _ranges(offsets[pj[rows]], offsets[pj[rows] + 1])
+        a = a[rows]
+
+        A, B, C, D = start[a], end[a], start[b], end[b]
+        AB, CD = B - A, D - C
+        sc = np.sign(AB[:, 0]*(C - A)[:, 1] - AB[:, 1]*(C - A)[:, 0])
+        sd = np.sign(AB[:, 0]*(D - A)[:, 1] - AB[:, 1]*(D - A)[:, 0])
+        # ребро CD пересекает прямую AB: вход в многоугольник или выход из него
+        crossing = (sc != sd) & (np.minimum(sc, sd) < 0)
+        sa = (CD[:, 0]*(A - C)[:, 1] - CD[:, 1]*(A - C)[:, 0])[crossing]
+        sb = (CD[:, 0]*(B - C)[:, 1] - CD[:, 1]*(B - C)[:, 0])[crossing]
+        # сонаправленные рёбра на одной прямой: покрытие засчитывается многоугольнику с меньшим номером
+        collinear = (sc == 0) & (sd == 0) & (owner[b] < owner[a]) & ((AB*CD).sum(axis=1) > 0)
+        along_x = AB[collinear, 0] != 0
+        AC, AD, ABc = (C - A)[collinear], (D - A)[collinear], AB[collinear]
+        t_c = np.where(along_x, AC[:, 0] / np.where(along_x, ABc[:, 0], 1), AC[:, 1] / np.where(along_x, 1, ABc[:, 1]))
+        t_d = np.where(along_x, AD[:, 0] / np.where(along_x, ABc[:, 0], 1), AD[:, 1] / np.where(along_x, 1, ABc[:, 1]))
+
+        own = np.arange(offsets[first], offsets[last])
+        edge = np.concatenate((a[crossing], a[collinear], a[collinear], own, own))
+        t = np.concatenate((sa / (sa - sb), t_c, t_d, np.zeros(len(own)), np.ones(len(own))))
+        delta = np.concatenate((np.sign(sc - sd)[crossing], np.ones(collinear.sum()), -np.ones(collinear.sum()),
+                                np.zeros(2*len(own))))
+        order = np.lexsort((delta, t, edge))
+        edge, t, delta = edge[order], np.clip(t[order], 0.0, 1.0), delta[order]
+
+        # количество покрывающих многоугольников перед каждым событием (накопленная сумма внутри ребра)
+        covered = np.cumsum(delta)
+        row_start = np.flatnonzero(np.concatenate(([True], edge[1:] != edge[:-1])))
+        covered -= np.repeat(covered[row_start] - delta[row_start], np.diff(np.append(row_start, len(edge))))
+        free = np.where((edge[1:] == edge[:-1]) & (covered[:-1] == 0), t[1:] - t[:-1], 0.0)
+        free = np.bincount(edge[1:] - own[0], weights=free, minlength=len(own))
+
+        cross = start[own, 0]*end[own, 1] - start[own, 1]*end[own, 0]
+        _add_exact(partials, math.fsum(cross*free))
+        first = last
+    return 0.5*math.fsum(partials)
+
+
+def _union_area_approx(batch: PolygonBatch, cell_size: float | None) -> float:
+    """
+    Площадь объединения по центрам ячеек сетки со стороной cell_size: ячейка считается покрытой,
+    если ее центр лежит хотя бы в одном многоугольнике. Покрытые центры каждой строки считаются
+    целочисленно по отрезкам PolygonBatch.scanline_spans, строки обрабатываются блоками.
+    """
+    bboxes = batch.bboxes()
+    bboxes = bboxes[np.isfinite(bboxes[:, 0])]
+    if not len(bboxes):
+        return 0.0
+    xmin, ymin = bboxes[:, 0].min(), bboxes[:, 1].min()
+    xmax, ymax = bboxes[:, 2].max(), bboxes[:, 3].max()
+    c = cell_size if cell_size is not None else max(xmax - xmin, ymax - ymin) / 4096
+    if not c:
+        return 0.0
+
+    x0, y0 = math.floor(xmin / c)*c, math.floor(ymin / c)*c
+    ys = y0 + (np.arange(math.ceil((ymax - y0) / c) + 1) + 0.5)*c
+    dy = np.abs(batch.coords[batch.next_vertex(), 1] - batch.coords[:, 1])
+    n_blocks = max(1, math.ceil((dy.sum() / c + len(dy)) / _PAIR_BLOCK))
+
+    cells = 0
+    for block in np.array_split(np.arange(len(ys)), n_blocks):
+        rows, _, left, right = batch.scanline_spans(ys[block])
+        k0 = np.ceil((left - x0) / c - 0.5).astype(np.int64)
+        k1 = np.floor((right - x0) / c - 0.5).astype(np.int64)
+        valid = k1 >= k0
+        rows, k0, k1 = rows[valid], k0[valid], k1[valid]
+        # события +1 в первой покрытой ячейке отрезка и -1 после последней; внутри строки они взаимно
+        # уничтожаются, поэтому накопленная сумма к концу каждой строки нулевая
+        row = np.concatenate((rows, rows))
+        k = np.concatenate((k0, k1 + 1))
+        delta = np.concatenate((np.ones(len(k0), dtype=np.int64), -np.ones(len(k1), dtype=np.int64)))
+        order = np.lexsort((k, row))
+        k, covered = k[order], np.cumsum(delta[order])
+        cells += int(((covered[:-1] > 0)*np.diff(k)).sum())
+    return cells*c*c
+
+
+@instrumented('seq')
+def agr_union_area(polygon_seq, approx: bool = False, cell_size: float | None = None) -> float:
+    """
+    Площадь объединения многоугольников: перекрывающиеся части учитываются один раз (в отличие от agr_area).
+    Многоугольники должны быть простыми (без самопересечений); порядок обхода вершин не важен.
+
+    Точный режим: для каждого ребра находятся отрезки, покрытые другими многоугольниками, и площадь
+    собирается по формуле Гаусса из непокрытых частей рёбер. Рёбра сравниваются только в парах
+    многоугольников с пересекающимися ограничивающими прямоугольниками (sweep and prune),
+    поэтому время – O(N log N + сумма произведений количеств рёбер по таким парам).
+
+    Приближенный режим: количество ячеек сетки со стороной c = cell_size, центры которых покрыты,
+    умноженное на c². Строки сетки обрабатываются векторизованно по отрезкам пересечения
+    многоугольников с горизонталями. Погрешность не превосходит √2·c·P + 2·c²·E, где P – суммарный
+    периметр, E – суммарное количество рёбер многоугольников (ошибаться могут только ячейки,
+    через которые проходит граница).
+
+    Аргументы:
+        polygon_seq: Конечная последовательность многоугольников.
+        approx: Использовать приближенный режим.
+        cell_size: Сторона ячейки сетки приближенного режима. По умолчанию – 1/4096 от большей
+                   стороны общего ограничивающего прямоугольника.
+
+    Исключения:
+        ValueError: Если последовательность – бесконечная лента gen_reg_polygon_seq
+                    или cell_size не положительное число.
+    """
+    if isinstance(polygon_seq, RegPolygonSeq) and polygon_seq.n_figs == math.inf:
+        raise ValueError('union area of an infinite sequence is undefined')
+    if cell_size is not None and not cell_size > 0:
+        raise ValueError('cell_size must be positive')
+
+    batch = PolygonBatch.from_polygons(polygon_seq)
+    if approx:
+        return _union_area_approx(batch, cell_size)
+    return _union_area_exact(batch)
+
+
+def _monotone_chain(points) -> list:
+    """
+    Выпуклая оболочка точек (массива numpy или последовательности пар) алгоритмом Эндрю
+    (монотонная цепочка) за O(n log n). Вершины – против часовой стрелки, начиная с самой левой
+    (затем нижней); точки на сторонах отбрасываются.
+    """
+    if isinstance(points, np.ndarray):
+        pts = np.unique(points.reshape(-1, 2), axis=0).tolist()  # сортировка по x, затем y
+    else:
+        pts = sorted(set(map(tuple, points)))
+    if len(pts) < 3:
+        return pts
+
+    def half(sequence):
+        chain = []
+        for p in sequence:
+            while len(chain) >= 2 and ((chain[-1][0] - chain[-2][0])*(p[1] - chain[-2][1])
+                                       - (chain[-1][1] - chain[-2][1])*(p[0] - chain[-2][0])) <= 0:
+                chain.pop()
+            chain.append(p)
+        return chain[:-1]
+
+    return half(pts) + half(reversed(pts))
+
+
+# направления опорных точек для отсечения Экла – Туссена: восемь направлений через 45°, против часовой стрелки
+_OCTAGON = np.array([(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)], dtype=np.float64)
+
+
+def _akl_toussaint(points: np.ndarray) -> np.ndarray:
+    """
+    Отсечение Экла – Туссена: точки строго внутри многоугольника из крайних точек по восьми направлениям
+    заведомо не лежат на выпуклой оболочке и отбрасываются одной векторизованной проверкой.
+    """
+    if len(points) < 16:
+        return points
+    extremes = points[np.argmax(points @ _OCTAGON.T, axis=0)]
+    extremes = extremes[np.any(extremes != np.roll(extremes, 1, axis=0), axis=1)]
+    if len(extremes) < 3:
+        return points
+    edges = np.roll(extremes, -1, axis=0) - extremes
+    cross = edges[:, 0]*(points[:, None, 1] - extremes[:, 1]) - edges[:, 1]*(points[:, None, 0] - extremes[:, 0])
+    return points[~np.all(cross > 0, axis=1)]
+
+
+def _strip_convex_hull(strip: RegPolygonSeq) -> tuple[tuple[float, float], ...]:
+    """Оболочка ленты – оболочка первой и последней фигур: остальные – их сдвиги вдоль оси x между ними."""
+    if math.isinf(strip.n_figs):
+        raise ValueError('convex hull of an infinite sequence is unbounded')
+    _check_strip_not_empty(strip)
+    return tuple(map(tuple, _monotone_chain(strip[0] + strip[-1])))
+
+
+@instrumented('seq')
+def agr_convex_hull(polygon_seq) -> tuple[tuple[float, float], ...]:
+    """
+    Выпуклая оболочка всех вершин всех многоугольников последовательности.
+
+    Последовательность проходится один раз с ограниченной памятью (см. ConvexHullAccumulator):
+    хранятся только вершины текущей оболочки и буфер новых точек, который периодически
+    сливается с оболочкой. Невыпуклые многоугольники (flt_convex_polygon) сразу заменяются
+    своей оболочкой, так что их внутренние вершины в буфер не попадают. PolygonBatch обрабатывается
+    векторизованно, для лент из gen_reg_polygon_seq оболочка строится по первой и последней фигурам.
+
+    Возвращает:
+        Вершины оболочки против часовой стрелки, начиная с самой левой (затем нижней);
+        для вырожденных случаев – одна или две точки.
+
+    Исключения:
+        ValueError: Если последовательность пуста или является бесконечной лентой.
+    """
+    if isinstance(polygon_seq, RegPolygonSeq):
+        return _strip_convex_hull(polygon_seq)
+    return ConvexHullAccumulator().update_batch(polygon_seq).result()
+
+# ───────────── объединяемые частичные состояния агрегатов ─────────────
+
+_HULL_BUFFER = 1 << 16  # сколько новых точек ConvexHullAccumulator накапливает до слияния с оболочкой
+
+def _add_exact(partials: list[float], x: float):
+    """
+    Точное добавление x к сумме, представленной списком неперекрывающихся частичных сумм
+    (алгоритм Шевчука, тот же, что в math.fsum). Итоговая сумма – math.fsum(partials).
+    """
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        hi = x + y
+        lo = y - (hi - x)
+        if lo:
+            partials[i] = lo
+            i += 1
+        x = hi
+    partials[i:] = [x]
+
+
+def _fsum_terms(values: list[float]) -> list[float]:
+    """
+    Точная сумма values в виде нескольких float, сумма которых без округления равна сумме values:
+    корректно округленная сумма, затем корректно округленный остаток и т.д. Каждое слагаемое
+    считается math.fsum, поэтому пакет обрабатывается без цикла Python по значениям.
+    """
+    terms = []
+    while True:
+        term = math.fsum(itertools.chain(values, [-t for t in terms]))
+        if term:
+            terms.append(term)
+        if not term or not math.isfinite(term):
+            return terms
+
+
+class _Accumulator:
+    """
+    Частичное состояние агрегата: накапливается по многоугольникам (update, update_batch),
+    объединяется с состоянием по другой части данных (merge) и дает итог (result).
+    Состояние сериализуется pickle, а также в словарь JSON-совместимых значений (to_dict / from_dict),
+    поэтому его можно передавать между процессами и машинами.
+    """
+    __slots__ = ('count',)
+    name = None
+
+    def __init__(self):
+        self.count = 0
+
+    def update(self, poly: tuple[tuple[float, float], ...]) -> '_Accumulator':
+        """Учитывает один многоугольник."""
+        self.count += 1
+        self._add(self._metric(poly))
+        return self
+
+    def update_batch(self, polygon_seq) -> '_Accumulator':
+        """
+        Учитывает последовательность многоугольников. Для PolygonBatch метрики всех
+        многоугольников считаются векторизованно, одной операцией numpy.
+        """
+        if isinstance(polygon_seq, PolygonBatch):
+            self.count += len(polygon_seq)
+            if len(polygon_seq):
+                self._add_values(self._batch_metric(polygon_seq))
+        else:
+            for poly in polygon_seq:
+                self.update(poly)
+        return self
+
+    def merge(self, other: '_Accumulator') -> '_Accumulator':
+        """Добавляет к состоянию состояние того же агрегата, посчитанное по другой части данных."""
+        if type(other) is not type(self):
+            raise TypeError(f'cannot merge {type(other).__name__} into {type(self).__name__}')
+        self.count += other.count
+        self._merge_state(other)
+        return self
+
+    def to_dict(self) -> dict:
+        """Состояние в виде словаря JSON-совместимых значений."""
+        return {'aggregate': self.name, 'count': self.count, 'state': self._state()}
+
+    @staticmethod
+    def from_dict(data: dict) -> '_Accumulator':
+        """Восстанавливает состояние, сохраненное to_dict."""
+        try:
+            acc = ACCUMULATORS[data['aggregate']]()
+        except KeyError as e:
+            raise ValueError(f'unknown aggregate: {data.get("aggregate")!r}') from e
+        acc.count = data['count']
+        acc._set_state(data['state'])
+        return acc
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(count={self.count})'
+
+
+class _SumAccumulator(_Accumulator):
+    """Сумма метрики. Суммирование компенсированное и без потери точности при любом количестве слагаемых."""
+    __slots__ = ('partials',)
+
+    def __init__(self):
+        super().__init__()
+        self.partials = []
+
+    def _add(self, value: float):
+        _add_exact(self.partials, value)
+
+    def _add_values(self, values):
+        # пакет добавляется точно, а не округленной суммой: результат не зависит от разбиения на пакеты
+        for term in _fsum_terms(np.asarray(values, dtype=np.float64).tolist()):
+            _add_exact(self.partials, term)
+
+    def _merge_state(self, other):
+        for value in other.partials:
+            _add_exact(self.partials, value)
+
+    def _state(self):
+        return list(self.partials)
+
+    def _set_state(self, state):
+        self.partials = list(state)
+
+    def result(self) -> float:
+        return math.fsum(self.partials)
+
+
+class _ExtremumAccumulator(_Accumulator):
+    """Минимум (_pick = min) или максимум (_pick = max) метрики."""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        super().__init__()
+        self.value = None
+
+    def _add(self, value: float):
+        self.value = value if self.value is None else self._pick(self.value, value)
+
+    def _add_values(self, values):
+        self._add(float(self._pick_array(values)))
+
+    def _merge_state(self, other):
+        if other.value is not None:
+            self._add(other.value)
+
+    def _state(self):
+        return self.value
+
+    def _set_state(self, state):
+        self.value = state
+
+    def result(self) -> float:
+        if self.value is None:
+            raise ValueError('min/max aggregates of an empty sequence are undefined')
+        return self.value
+
+
+class AreaAccumulator(_SumAccumulator):
+    """Частичное состояние agr_area: суммарная площадь."""
+    __slots__ = ()
+    name = 'area'
+    _metric = staticmethod(_area)
+    _batch_metric = staticmethod(PolygonBatch.areas)
+
+
+class PerimeterAccumulator(_SumAccumulator):
+    """Частичное состояние agr_perimeter: суммарный периметр."""
+    __slots__ = ()
+    name = 'perimeter'
+    _metric = staticmethod(lambda poly: poly.perimeter if isinstance(poly, Polygon) else sum(_sides(poly)))
+    _batch_metric = staticmethod(PolygonBatch.side_lengths)
+
+
+class MaxSideAccumulator(_ExtremumAccumulator):
+    """Частичное состояние agr_max_side: максимальная длина стороны."""
+    __slots__ = ()
+    name = 'max_side'
+    _pick, _pick_array = staticmethod(max), staticmethod(np.max)
+    _metric = staticmethod(lambda poly: max(_sides(poly)))
+    _batch_metric = staticmethod(PolygonBatch.side_lengths)
+
+
+class MinAreaAccumulator(_ExtremumAccumulator):
+    """Частичное состояние agr_min_area: минимальная площадь."""
+    __slots__ = ()
+    name = 'min_area'
+    _pick, _pick_array = staticmethod(min), staticmethod(np.min)
+    _metric = staticmethod(_area)
+    _batch_metric = staticmethod(PolygonBatch.areas)
+
+
+class OriginNearestAccumulator(_ExtremumAccumulator):
+    """Частичное состояние agr_origin_nearest: минимальное расстояние от начала координат до вершины."""
+    __slots__ = ()
+    name = 'origin_nearest'
+    _pick, _pick_array = staticmethod(min), staticmethod(np.min)
+    _metric = staticmethod(lambda poly: min(math.dist(point, (0, 0)) for point in poly))
+    _batch_metric = staticmethod(lambda batch: np.hypot(*batch.coords.T))
+
+
+class ConvexHullAccumulator(_Accumulator):
+    """
+    Частичное состояние agr_convex_hull: вершины выпуклой оболочки и буфер новых точек.
+    Буфер сливается с оболочкой, когда в нем набирается более _HULL_BUFFER точек,
+    поэтому память ограничена размером оболочки и буфера, а не длиной последовательности.
+    """
+    __slots__ = ('hull', '_buffer')
+    name = 'convex_hull'
+
+    def __init__(self):
+        super().__init__()
+        self.hull = np.empty((0, 2))
+        self._buffer = []
+
+    @staticmethod
+    def _metric(poly):
+        # внутренние вершины невыпуклого многоугольника отбрасываются сразу
+        return poly if _convex(poly) else _monotone_chain(poly)
+
+    @staticmethod
+    def _batch_metric(batch: PolygonBatch) -> np.ndarray:
+        return batch.coords
+
+    def _add(self, points):
+        self._buffer.extend(points)
+        if len(self._buffer) > _HULL_BUFFER:
+            self._flush()
+
+    def _add_values(self, points: np.ndarray):
+        for start in range(0, len(points), _HULL_BUFFER):
+            self._flush(_akl_toussaint(points[start:start + _HULL_BUFFER]))
+
+    def _flush(self, points: np.ndarray | None = None):
+        """Сливает с оболочкой буфер и дополнительные точки points."""
+        if not self._buffer and points is None:
+            return
+        merged = [self.hull, np.array(self._buffer, dtype=np.float64).reshape(-1, 2)]
+        if points is not None:
+            merged.append(points)
+        self.hull = np.array(_monotone_chain(_akl_toussaint(np.concatenate(merged))),
+                             dtype=np.float64).reshape(-1, 2)
+        self._buffer = []
+
+    def _merge_state(self, other):
+        other._flush()
+        self._flush(other.hull)
+
+    def _state(self):
+        self._flush()
+        return self.hull.tolist()
+
+    def _set_state(self, state):
+        self.hull = np.array(state, dtype=np.float64).reshape(-1, 2)
+        self._buffer = []
+
+    def result(self) -> tuple[tuple[float, float], ...]:
+        self._flush()
+        if not len(self.hull):
+            raise ValueError('convex hull of an empty sequence is undefined')
+        return tuple(map(tuple, self.hull.tolist()))
+
+
+ACCUMULATORS = {acc.name: acc for acc in (AreaAccumulator, PerimeterAccumulator, MaxSideAccumulator,
+                                          MinAreaAccumulator, OriginNearestAccumulator, ConvexHullAccumulator)}
@@ -0,0 +1,286 @@
+"""
+Асинхронные (asyncio) варианты генераторов, стадий map/filter и агрегатов.
+
+Многоугольники передаются между стадиями блоками по chunk_size штук: обработка блока
+(преобразование, фильтрация, накопление агрегата, генерация случайных многоугольников)
+выполняется в исполнителе (concurrent.futures.Executor) через loop.run_in_executor, поэтому
+длинные последовательности не блокируют цикл событий. Каждая стадия держит в работе
+не более max_pending блоков и читает источник, только когда потребитель забирает результат, –
+медленный потребитель притормаживает всю цепочку (backpressure), и память ограничена.
+
+    strip = agen_reg_polygon_seq(n_sides=6, n_figs=10**6)
+    rotated = amap(functools.partial(tr_rotate, angle=60), strip)
+    area = await aagr_area(afilter(flt_convex_polygon, rotated))
+
+Источником стадий служит любой асинхронный итератор (очередь, сокет) или обычная
+последовательность многоугольников; обычные итераторы читаются блоками в потоке по умолчанию.
+По умолчанию исполнитель – пул потоков цикла событий: цикл остается отзывчивым, но чистый Python
+выполняется под GIL. Для параллельных вычислений передайте executor=ProcessPoolExecutor(...):
+тогда функции стадий, как в polyseq.parallel, должны сериализоваться pickle.
+"""
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import itertools
+import math
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable
+
+import numpy as np
+
+from polyseq.aggregates import (agr_area, agr_perimeter, agr_max_side, agr_min_area, agr_origin_nearest,
+                                agr_convex_hull, _Accumulator)
+from polyseq.batch import PolygonBatch
+from polyseq.generators import RegPolygonSeq, gen_reg_polygon_seq, gen_random_polygon_batch
+from polyseq.parallel import _ACCUMULATOR_OF, _run_chunk
+
+_CHUNK = 1000  # размер блока по умолчанию
+_PENDING = 2   # сколько блоков каждая стадия держит в работе по умолчанию
+
+
+def _take(it, n: int) -> tuple:
+    return tuple(itertools.islice(it, n))
+
+
+def _random_chunk(n_sides, task) -> tuple:
+    size, rng = task
+    return gen_random_polygon_batch(size, n_sides, rng=rng, packed=False)
+
+
+def _aggregate_chunk(accumulator: type[_Accumulator], chunk) -> _Accumulator:
+    """Выполняется в исполнителе: накапливает блок, упакованный в PolygonBatch, – векторизованно."""
+    return accumulator().update_batch(PolygonBatch.from_polygons(chunk))
+
+
+def _check_options(chunk_size: int, max_pending: int):
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer')
+    if max_pending < 1:
+        raise ValueError('max_pending must be a positive integer')
+
+
+async def _achunks(polygon_seq, chunk_size: int) -> AsyncIterator[tuple]:
+    """Блоки по chunk_size многоугольников из асинхронного или обычного источника."""
+    if hasattr(polygon_seq, '__aiter__'):
+        chunk = []
+        async for poly in polygon_seq:
+            chunk.append(poly)
+            if len(chunk) == chunk_size:
+                yield tuple(chunk)
+                chunk = []
+        if chunk:
+            yield tuple(chunk)
+        return
+
+    # обычный итератор может быть медленным (генератор, файл): читаем его в потоке,
+    # а не в переданном исполнителе – итератор не обязан сериализоваться
+    loop = asyncio.get_running_loop()
+    it = iter(polygon_seq)
+    while chunk := await loop.run_in_executor(None, _take, it, chunk_size):
+        yield chunk
+
+
+async def _chunk_results(chunks: AsyncIterable, work: Callable, executor, max_pending: int) -> AsyncIterator:
+    """
+    Результаты work по блокам в исходном порядке. В работе одновременно не более max_pending блоков;
+    следующий блок читается из chunks, только когда потребитель забрал самый старый результат.
+    """
+    loop = asyncio.get_running_loop()
+    pending = collections.deque()
+    try:
+        async for chunk in chunks:
+            pending.append(loop.run_in_executor(executor, work, chunk))
+            if len(pending) >= max_pending:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # потребитель прекратил чтение или произошла ошибка – незапущенные блоки не нужны
+        for future in pending:
+            future.cancel()
+
+
+def agen_reg_polygon_seq(n_sides: int, step: int | float = 1, n_figs: int | float = math.inf,
+                         l: int | float = 1, chunk_size: int = _CHUNK) -> AsyncIterator[tuple[tuple[float, float], ...]]:
+    """
+    Асинхронный вариант gen_reg_polygon_seq: та же "лента" правильных многоугольников.
+    Фигуры ленты вычисляются за O(1) каждая, поэтому исполнитель не нужен: после каждого
+    блока из chunk_size фигур управление возвращается циклу событий.
+
+    Аргументы:
+        n_sides, step, n_figs, l: Параметры ленты, как у gen_reg_polygon_seq.
+        chunk_size: Количество фигур между возвратами управления циклу событий.
+
+    Возвращает:
+        Асинхронный итератор по многоугольникам ленты.
+
+    Исключения:
+        ValueError, TypeError: Сразу при вызове, по тем же правилам, что у gen_reg_polygon_seq.
+    """
+    strip = gen_reg_polygon_seq(n_sides, step=step, n_figs=n_figs, l=l)
+    _check_options(chunk_size, 1)
+
+    async def generate():
+        for start in itertools.count(0, chunk_size):
+            if start >= strip.n_figs:
+                return
+            stop = start + chunk_size if math.isinf(strip.n_figs) else min(start + chunk_size, strip.n_figs)
+            # strip[k] считает смещение так же, как обход ленты, – фигуры совпадают побитово
+            for k in range(start, stop):
+                yield strip[k]
+            await asyncio.sleep(0)
+
+    return generate()
+
+
+def agen_random_polygon_seq(n_figs: int | float, n_sides: int | float | None = None,
+                            rng: int | np.random.Generator | np.random.SeedSequence | None = None,
+                            chunk_size: int = _CHUNK,
+                            executor: concurrent.futures.Executor | None = None) -> AsyncIterator[tuple[tuple[float, float], ...]]:
+    """
+    Асинхронный генератор n_figs случайных многоугольников. Многоугольники генерируются блоками
+    функцией gen_random_polygon_batch (те же распределения, что у gen_random_polygon_seq) в исполнителе;
+    следующий блок готовится, пока потребитель обрабатывает текущий.
+
+    Аргументы:
+        n_figs: Количество многоугольников для генерации.
+        n_sides: Количество сторон каждого многоугольника. Если None, выбирается случайно для каждого.
+        rng: Источник случайности, как у gen_random_polygon_batch. При одинаковых seed и chunk_size
+             последовательность воспроизводима (каждый блок получает свой подпоток rng.spawn).
+        chunk_size: Количество многоугольников в блоке.
+        executor: Исполнитель для генерации блоков. По умолчанию – пул потоков цикла событий.
+
+    Возвращает:
+        Асинхронный итератор по многоугольникам – кортежам вершин (float, float).
+
+    Исключения:
+        ValueError, TypeError: Сразу при вызове, по тем же правилам, что у gen_random_polygon_batch.
+    """
+    if not isinstance(n_figs, (int, float)):
+        raise TypeError('n_figs must be a whole numerical value (int or float)')
+    if not float(n_figs).is_integer():
+        raise ValueError('n_figs cannot be a fraction')
+    gen_random_polygon_batch(0, n_sides)  # проверка n_sides по тем же правилам
+    _check_options(chunk_size, 1)
+    rng = np.random.default_rng(rng)
+
+    async def tasks():
+        # у каждого блока свой независимый подпоток: блоки можно генерировать одновременно,
+        # а результат не зависит от того, в каком порядке исполнитель их выполнит
+        for start in range(0, int(n_figs), chunk_size):
+            yield min(chunk_size, int(n_figs) - start), rng.spawn(1)[0]
+
+    async def generate():
+        work = functools.partial(_random_chunk, n_sides)
+        async for chunk in _chunk_results(tasks(), work, executor, _PENDING):
+            for poly in chunk:
+                yield poly
+
+    return generate()
+
+
+def _stage(polygon_seq, stages: tuple, chunk_size: int, executor, max_pending: int) -> AsyncIterator:
+    _check_options(chunk_size, max_pending)
+    work = functools.partial(_run_chunk, stages=stages, aggregate=None)
+
+    async def run():
+        async for chunk in _chunk_results(_achunks(polygon_seq, chunk_size), work, executor, max_pending):
+            for poly in chunk:
+                yield poly
+
+    return run()
+
+
+def amap(func: Callable, polygon_seq: AsyncIterable | Iterable, chunk_size: int = _CHUNK,
+         executor: concurrent.futures.Executor | None = None, max_pending: int = _PENDING) -> AsyncIterator:
+    """
+    Асинхронный map: применяет func (например, преобразование из polyseq.transformers)
+    к каждому многоугольнику. Блоки обрабатываются в исполнителе, порядок сохраняется.
+
+    Аргументы:
+        func: Функция одного многоугольника; для ProcessPoolExecutor – сериализуемая pickle
+              (функция уровня модуля, functools.partial, Transform).
+        polygon_seq: Асинхронный итератор или обычная последовательность многоугольников.
+        chunk_size: Количество многоугольников в блоке.
+        executor: Исполнитель. По умолчанию – пул потоков цикла событий.
+        max_pending: Максимальное количество блоков в работе одновременно.
+
+    Возвращает:
+        Асинхронный итератор по результатам.
+
+    Исключения:
+        ValueError: Если chunk_size или max_pending не положительны.
+    """
+    return _stage(polygon_seq, (('map', func),), chunk_size, executor, max_pending)
+
+
+def afilter(predicate: Callable, polygon_seq: AsyncIterable | Iterable, chunk_size: int = _CHUNK,
+            executor: concurrent.futures.Executor | None = None, max_pending: int = _PENDING) -> AsyncIterator:
+    """
+    Асинхронный filter: оставляет многоугольники, для которых predicate (например, фильтр из
+    polyseq.filters) истинен. Аргументы и исключения – как у amap.
+    """
+    return _stage(polygon_seq, (('filter', predicate),), chunk_size, executor, max_pending)
+
+
+async def aagr(polygon_seq: AsyncIterable | Iterable, aggregate: Callable | type[_Accumulator],
+               chunk_size: int = _CHUNK, executor: concurrent.futures.Executor | None = None,
+               max_pending: int = _PENDING):
+    """
+    Асинхронный агрегат последовательности многоугольников. Каждый блок упаковывается в PolygonBatch
+    и накапливается векторизованно в исполнителе; частичные состояния объединяются через merge.
+    Для лент RegPolygonSeq значение вычисляется по замкнутой формуле без обхода фигур.
+
+    Аргументы:
+        polygon_seq: Асинхронный итератор или обычная конечная последовательность многоугольников.
+        aggregate: Одна из функций agr_area, agr_perimeter, agr_max_side, agr_min_area,
+                   agr_origin_nearest, agr_convex_hull или класс накопителя из polyseq.aggregates.
+        chunk_size: Количество многоугольников в блоке.
+        executor: Исполнитель. По умолчанию – пул потоков цикла событий.
+        max_pending: Максимальное количество блоков в работе одновременно.
+
+    Возвращает:
+        Значение агрегата.
+
+    Исключения:
+        ValueError: Если агрегат не поддерживается, chunk_size или max_pending не положительны,
+                    а также если агрегат пустой последовательности не определен.
+    """
+    _check_options(chunk_size, max_pending)
+    if isinstance(polygon_seq, RegPolygonSeq) and aggregate in _ACCUMULATOR_OF:
+        return aggregate(polygon_seq)
+
+    accumulator = _ACCUMULATOR_OF.get(aggregate, aggregate)
+    if not (isinstance(accumulator, type) and issubclass(accumulator, _Accumulator)):
+        raise ValueError('aggregate must be one of the polyseq.aggregates functions or accumulators')
+
+    state = accumulator()
+    work = functools.partial(_aggregate_chunk, accumulator)
+    async for partial_state in _chunk_results(_achunks(polygon_seq, chunk_size), work, executor, max_pending):
+        state.merge(partial_state)
+    return state.result()
+
+
+async def aagr_area(polygon_seq, **options) -> float:
+    """Асинхронный agr_area: суммарная площадь. Параметры options – как у aagr."""
+    return await aagr(polygon_seq, agr_area, **options)
+
+async def aagr_perimeter(polygon_seq, **options) -> float:
+    """Асинхронный agr_perimeter: суммарный периметр. Параметры options – как у aagr."""
+    return await aagr(polygon_seq, agr_perimeter, **options)
+
+async def aagr_max_side(polygon_seq, **options) -> float:
+    """Асинхронный agr_max_side: максимальная длина стороны. Параметры options – как у aagr."""
+    return await aagr(polygon_seq, agr_max_side, **options)
+
+async def aagr_min_area(polygon_seq, **options) -> float:
+    """Асинхронный agr_min_area: минимальная площадь. Параметры options – как у aagr."""
+    return await aagr(polygon_seq, agr_min_area, **options)
+
+async def aagr_origin_nearest(polygon_seq, **options) -> float:
+    """Асинхронный agr_origin_nearest: расстояние от начала координат до ближайшей вершины. Параметры – как у aagr."""
+    return await aagr(polygon_seq, agr_origin_nearest, **options)
+
+async def aagr_convex_hull(polygon_seq, **options) -> tuple[tuple[float, float], ...]:
+    """Асинхронный agr_convex_hull: выпуклая оболочка всех вершин. Параметры options – как у aagr."""
+    return await aagr(polygon_seq, agr_convex_hull, **options)
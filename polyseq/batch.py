@@ -0,0 +1,218 @@
+import itertools
+from array import array
+from typing import Iterable, Iterator
+
+import numpy as np
+
+
+def _segment_reduce(ufunc: np.ufunc, values: np.ndarray, offsets: np.ndarray, identity: float) -> np.ndarray:
+    """
+    Свертка values по отрезкам [offsets[k], offsets[k+1]) с помощью ufunc.reduceat.
+    Для пустых отрезков (многоугольников без вершин) возвращается identity.
+    """
+    n = len(offsets) - 1
+    result = np.full(n, identity, dtype=np.float64)
+    non_empty = offsets[1:] > offsets[:-1]
+    if non_empty.any():
+        result[non_empty] = ufunc.reduceat(values, offsets[:-1][non_empty])
+    return result
+
+
+class PolygonBatch:
+    """
+    Упакованная (колоночная) последовательность многоугольников на базе numpy.
+
+    Все вершины всех многоугольников хранятся в одном непрерывном массиве
+    coords размера (n_vertices, 2), а границы многоугольников – в массиве
+    offsets размера (n_polygons + 1,): вершины k-го многоугольника –
+    coords[offsets[k]:offsets[k + 1]]. Поэтому многоугольники в одном пакете
+    могут иметь разное количество вершин.
+
+    Аргументы:
+        coords: Массив координат вершин размера (n_vertices, 2).
+        offsets: Неубывающий массив смещений размера (n_polygons + 1,),
+                 offsets[0] == 0, offsets[-1] == n_vertices.
+
+    Исключения:
+        ValueError: Если размеры coords и offsets не согласованы.
+    """
+    __slots__ = ('coords', 'offsets')
+
+    def __init__(self, coords, offsets):
+        coords = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 2)
+        offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+
+        if offsets.ndim != 1 or offsets.size == 0:
+            raise ValueError('offsets must be a non-empty 1-dimensional array')
+
+        if offsets[0] != 0 or offsets[-1] != len(coords):
+            raise ValueError('offsets must start with 0 and end with the number of vertices')
+
+        if np.any(np.diff(offsets) < 0):
+            raise ValueError('offsets must be non-decreasing')
+
+        self.coords = coords
+        self.offsets = offsets
+
+    @classmethod
+    def from_polygons(cls, polygon_seq: Iterable[tuple[tuple[float, float], ...]]) -> 'PolygonBatch':
+        """
+        Упаковывает последовательность многоугольников (кортежей вершин) в PolygonBatch.
+        Последовательность проходится ровно один раз, поэтому подходит любой конечный итератор.
+        """
+        if isinstance(polygon_seq, cls):
+            return polygon_seq
+
+        flat = array('d')
+        counts = array('q')
+        for poly in polygon_seq:
+            counts.append(len(poly))
+            flat.extend(itertools.chain.from_iterable(poly))
+
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(np.frombuffer(counts, dtype=np.int64), out=offsets[1:])
+        return cls(np.frombuffer(flat, dtype=np.float64), offsets)
+
+    def to_polygons(self) -> tuple[tuple[tuple[float, float], ...], ...]:
+        """Распаковывает пакет обратно в кортеж многоугольников – кортежей вершин (float, float)."""
+        vertices = tuple(map(tuple, self.coords.tolist()))
+        bounds = self.offsets.tolist()
+        return tuple(vertices[a:b] for a, b in zip(bounds, bounds[1:]))
+
+    def take(self, ids) -> 'PolygonBatch':
+        """Новый пакет из многоугольников с номерами ids (в указанном порядке) – без распаковки в кортежи."""
+        ids = np.asarray(ids, dtype=np.int64)
+        counts = self.counts[ids]
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        vertices = np.arange(offsets[-1]) - np.repeat(offsets[:-1] - self.offsets[ids], counts)
+        return PolygonBatch(self.coords[vertices], offsets)
+
+    def with_coords(self, coords) -> 'PolygonBatch':
+        """Новый пакет с той же структурой многоугольников, но другими координатами вершин."""
+        return PolygonBatch(coords, self.offsets)
+
+    @property
+    def n_vertices(self) -> int:
+        """Общее количество вершин во всех многоугольниках пакета."""
+        return len(self.coords)
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Количество вершин каждого многоугольника."""
+        return np.diff(self.offsets)
+
+    def vertices(self, k: int) -> np.ndarray:
+        """Вершины k-го многоугольника – представление (view) массива coords без копирования."""
+        return self.coords[self.offsets[k]:self.offsets[k + 1]]
+
+    def next_vertex(self) -> np.ndarray:
+        """
+        Индекс следующей вершины того же многоугольника для каждой вершины пакета:
+        ребро i соединяет coords[i] и coords[next_vertex()[i]] (последняя вершина замыкается на первую).
+        """
+        following = np.arange(1, self.n_vertices + 1, dtype=np.int64)
+        counts = self.counts
+        non_empty = counts > 0
+        following[self.offsets[1:][non_empty] - 1] = self.offsets[:-1][non_empty]
+        return following
+
+    def polygon_ids(self) -> np.ndarray:
+        """Номер многоугольника для каждой вершины пакета."""
+        return np.repeat(np.arange(len(self)), self.counts)
+
+    def side_lengths(self) -> np.ndarray:
+        """Длины всех рёбер пакета; ребро i начинается в вершине i (см. next_vertex)."""
+        return np.hypot(*(self.coords[self.next_vertex()] - self.coords).T)
+
+    def signed_areas(self) -> np.ndarray:
+        """Ориентированные площади: положительные для обхода вершин против часовой стрелки."""
+        following = self.coords[self.next_vertex()]
+        cross = self.coords[:, 0]*following[:, 1] - following[:, 0]*self.coords[:, 1]
+        return 0.5*_segment_reduce(np.add, cross, self.offsets, 0.0)
+
+    def areas(self) -> np.ndarray:
+        """Площади многоугольников пакета по формуле Гаусса (алгоритм шнурования)."""
+        return np.abs(self.signed_areas())
+
+    def is_convex(self) -> np.ndarray:
+        """
+        Выпуклость каждого многоугольника – тот же критерий, что в polyseq.filters.flt_convex_polygon:
+        псевдоскалярные произведения соседних рёбер не меняют знак.
+        """
+        following = self.next_vertex()
+        edges = self.coords[following] - self.coords
+        next_edges = edges[following]
+        cross = edges[:, 0]*next_edges[:, 1] - edges[:, 1]*next_edges[:, 0]
+        return ~((_segment_reduce(np.maximum, cross, self.offsets, 0.0) > 0)
+                 & (_segment_reduce(np.minimum, cross, self.offsets, 0.0) < 0))
+
+    def perimeters(self) -> np.ndarray:
+        """Периметры многоугольников пакета."""
+        return _segment_reduce(np.add, self.side_lengths(), self.offsets, 0.0)
+
+    def max_sides(self) -> np.ndarray:
+        """Длина наибольшей стороны каждого многоугольника (-inf для пустого)."""
+        return _segment_reduce(np.maximum, self.side_lengths(), self.offsets, -np.inf)
+
+    def min_sides(self) -> np.ndarray:
+        """Длина наименьшей стороны каждого многоугольника (inf для пустого)."""
+        return _segment_reduce(np.minimum, self.side_lengths(), self.offsets, np.inf)
+
+    def bboxes(self) -> np.ndarray:
+        """Ограничивающие прямоугольники многоугольников – массив строк (xmin, ymin, xmax, ymax)."""
+        x, y = self.coords[:, 0], self.coords[:, 1]
+        return np.column_stack((_segment_reduce(np.minimum, x, self.offsets, np.inf),
+                                _segment_reduce(np.minimum, y, self.offsets, np.inf),
+                                _segment_reduce(np.maximum, x, self.offsets, -np.inf),
+                                _segment_reduce(np.maximum, y, self.offsets, -np.inf)))
+
+    def scanline_spans(self, ys) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Пересечения многоугольников с горизонтальными прямыми y = ys[r] – отрезки [left, right],
+        лежащие внутри многоугольника (правило чет-нечет, для простых многоугольников совпадает с
+        правилом ненулевого числа оборотов). Ребро учитывается на полуинтервале ymin <= y < ymax,
+        поэтому прямая, проходящая через вершину, пересекает границу четное число раз.
+
+        Аргументы:
+            ys: Возрастающий массив ординат строк.
+
+        Возвращает:
+            Массивы одинаковой длины (номер строки, номер многоугольника, left, right),
+            упорядоченные по номеру многоугольника, затем строки, затем left.
+        """
+        ys = np.asarray(ys, dtype=np.float64)
+        start, end = self.coords, self.coords[self.next_vertex()]
+        y_low, y_high = np.minimum(start[:, 1], end[:, 1]), np.maximum(start[:, 1], end[:, 1])
+        first, stop = np.searchsorted(ys, y_low, side='left'), np.searchsorted(ys, y_high, side='left')
+        counts = np.maximum(stop - first, 0)
+        edges = np.repeat(np.arange(self.n_vertices), counts)
+        rows = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(first, counts)
+
+        (x1, y1), (x2, y2) = start[edges].T, end[edges].T
+        xs = x1 + (ys[rows] - y1)*(x2 - x1)/(y2 - y1)
+        polygons = self.polygon_ids()[edges]
+        order = np.lexsort((xs, polygons*len(ys) + rows))
+        rows, polygons, xs = rows[order], polygons[order], xs[order]
+        return rows[::2], polygons[::2], xs[::2], xs[1::2]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[tuple[tuple[float, float], ...]]:
+        yield from self.to_polygons()
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return PolygonBatch.from_polygons(self[k] for k in range(start, stop, step))
+            stop = max(start, stop)
+            a, b = self.offsets[start], self.offsets[stop]
+            return PolygonBatch(self.coords[a:b], self.offsets[start:stop + 1] - a)
+
+        k = range(len(self))[item]
+        return tuple(map(tuple, self.vertices(k).tolist()))
+
+    def __repr__(self) -> str:
+        return f'PolygonBatch(n_polygons={len(self)}, n_vertices={self.n_vertices})'
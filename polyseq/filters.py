@@ -2,6 +2,13 @@ import itertools
 import functools
 import math
 
+import numpy as np
+
+from polyseq.batch import PolygonBatch
+from polyseq.instrumentation import instrumented
+from polyseq.polygon import Polygon
+
+
 def _pseudo_scalar_prod(vec1, vec2) -> float:
     """Псевдоскалярное произведение двух векторов в ортонормированном базисе (2-d dot product)."""
     x1, y1 = vec1
@@ -10,17 +17,17 @@ def _pseudo_scalar_prod(vec1, vec2) -> float:
 
 def _area(poly: tuple[tuple[float, float], ...]) -> float:
     """Формула площади Гаусса (алгоритм шнурования)."""
+    if isinstance(poly, Polygon):
+        return poly.area
     n = len(poly)
     return 0.5*abs(sum(
         (poly[i][0]*poly[(i+1) % n][1] - poly[(i+1) % n][0]*poly[i][1])
         for i in range(n)))
 
 
-def flt_convex_polygon(poly: tuple[tuple[float, float], ...]) -> bool:
+def _is_convex(poly: tuple[tuple[float, float], ...]) -> bool:
     """
-    Проверка многоугольника на выпуклость.
-
-    Алгоритм: для каждой пары соседних рёбер вычисляем знак
+    Алгоритм проверки на выпуклость: для каждой пары соседних рёбер вычисляем знак
     псевдоскалярного произведения. Если знаки меняются — есть перегиб,
     значит многоугольник невыпуклый.
     """
@@ -38,20 +45,42 @@ def flt_convex_polygon(poly: tuple[tuple[float, float], ...]) -> bool:
     return True
 
 
+def _convex(poly: tuple[tuple[float, float], ...]) -> bool:
+    """Выпуклость без записи в статистику инструментации; для Polygon – закешированный результат."""
+    if isinstance(poly, Polygon):
+        return poly.is_convex
+    return _is_convex(poly)
+
+
+@instrumented('poly')
+def flt_convex_polygon(poly: tuple[tuple[float, float], ...]) -> bool:
+    """
+    Проверка многоугольника на выпуклость.
+    Для Polygon используется закешированный результат.
+    """
+    return _convex(poly)
+
+
+@instrumented('poly')
 def flt_vertex_point(poly, point):
     """Проверяет совпадение заданной точки с одной из сторон многоугольника."""
     return point in poly
 
+@instrumented('poly')
 def flt_area_lt(poly: tuple[tuple[float, float], ...],
                 area: int | float) -> bool:
     """Проверяет, является ли площадь многоугольника меньше заданного значения."""
     return _area(poly) < area
 
+@instrumented('poly')
 def flt_shortest_side_lt(poly: tuple[tuple[float, float], ...],
                          shortest_side: int | float) -> bool:
     """Проверяет, является ли кратчайшая сторона многоугольника меньше заданного значения."""
+    if isinstance(poly, Polygon):
+        return min(poly.sides) < shortest_side
     return min(map(lambda i: math.dist(poly[i], poly[(i+1) % len(poly)]), range(len(poly)))) < shortest_side
 
+@instrumented('poly')
 def flt_point_inside(poly: tuple[tuple[float, float], ...],
                      point: tuple[float, float]) -> bool:
     """
@@ -61,9 +90,10 @@ def flt_point_inside(poly: tuple[tuple[float, float], ...],
     произведения (2-d cross-product) вектора ребра и вектора «вершина → точка».
     Если знаки совпадают (или ноль — точка на ребре) для всех рёбер,
     точка лежит внутри или на границе.
+    Для невыпуклых многоугольников возвращает False; общий случай – flt_point_inside_simple.
     """
 
-    if not flt_convex_polygon(poly):
+    if not _convex(poly):
         return False
 
     n = len(poly)
@@ -83,7 +113,184 @@ def flt_point_inside(poly: tuple[tuple[float, float], ...],
     return True
 
 
+@instrumented('poly')
 def flt_polygon_vertices(poly: tuple[tuple[float, float], ...],
                               base) -> bool:
     """Проверяет, совпадение хотя бы одной вершины многоугольника с данной фигурой."""
-    return bool(set(base) & set(poly))
\ No newline at end of file
+    return bool(set(base) & set(poly))
+
+def _winding(px, py, x1, y1, x2, y2):
+    """
+    Число оборотов рёбер (x1, y1) -> (x2, y2) вокруг точек (px, py) и признак того,
+    что точка лежит на одном из рёбер. px, py – столбцы (k, 1), рёбра – строки (e,);
+    суммирование идет по рёбрам. Используется только знак псевдоскалярного произведения, без деления.
+    """
+    is_left = (x2 - x1)*(py - y1) - (px - x1)*(y2 - y1)
+    below_1, below_2 = y1 <= py, y2 <= py
+    winding = (below_1 & ~below_2 & (is_left > 0)).sum(axis=1) \
+        - (below_2 & ~below_1 & (is_left < 0)).sum(axis=1)
+
+    on_edge = np.zeros(len(winding), dtype=bool)
+    rows, cols = np.nonzero(is_left == 0)  # точки на прямых, содержащих рёбра, – редкий случай
+    if len(rows):
+        qx, qy = px[rows, 0], py[rows, 0]
+        ax, ay, bx, by = x1[cols], y1[cols], x2[cols], y2[cols]
+        on_segment = (np.minimum(ax, bx) <= qx) & (qx <= np.maximum(ax, bx)) \
+            & (np.minimum(ay, by) <= qy) & (qy <= np.maximum(ay, by))
+        on_edge[rows[on_segment]] = True
+    return winding, on_edge
+
+
+@instrumented('poly')
+def flt_point_inside_simple(poly: tuple[tuple[float, float], ...],
+                            point: tuple[float, float]) -> bool:
+    """
+    Проверяет, принадлежит ли точка многоугольнику – любому простому, в том числе невыпуклому.
+    Точка на границе считается принадлежащей многоугольнику, как и в flt_point_inside.
+
+    Алгоритм: число оборотов (winding number) границы вокруг точки; для каждого ребра,
+    пересекающего горизонталь через точку, по знаку псевдоскалярного произведения
+    определяется, слева или справа от ребра лежит точка. Точка внутри, если число оборотов ненулевое.
+    Для выпуклых многоугольников быстрее flt_point_inside.
+    """
+    px, py = point
+    n = len(poly)
+    winding = 0
+    for k in range(n):
+        (x1, y1), (x2, y2) = poly[k], poly[(k + 1) % n]
+        is_left = (x2 - x1)*(py - y1) - (px - x1)*(y2 - y1)
+        if is_left == 0 and min(x1, x2) <= px <= max(x1, x2) and min(y1, y2) <= py <= max(y1, y2):
+            return True
+        if y1 <= py < y2 and is_left > 0:
+            winding += 1
+        elif y2 <= py < y1 and is_left < 0:
+            winding -= 1
+    return winding != 0
+
+
+_PIP_BLOCK = 1 << 22  # максимальный размер промежуточных массивов (точки x рёбра) в flt_points_inside_*
+
+
+def flt_points_inside_hits(batch, points) -> np.ndarray:
+    """
+    Векторизованная проверка принадлежности множества точек множеству многоугольников
+    (любых простых, в том числе невыпуклых; точки на границе считаются принадлежащими).
+
+    Для каждого многоугольника отбираются только точки внутри его ограничивающего прямоугольника
+    (бинарным поиском по точкам, отсортированным по x), и для них одной операцией numpy вычисляется
+    число оборотов по всем рёбрам многоугольника. Поэтому память не зависит от произведения
+    количества точек и многоугольников.
+
+    Аргументы:
+        batch: PolygonBatch или любая конечная последовательность многоугольников.
+        points: Массив (или последовательность) точек размера (n_points, 2).
+
+    Возвращает:
+        Массив пар (номер точки, номер многоугольника) размера (n_hits, 2),
+        упорядоченный по номеру точки, затем по номеру многоугольника.
+    """
+    batch = PolygonBatch.from_polygons(batch)
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    order = np.argsort(points[:, 0], kind='stable')
+    xs_sorted, ys_sorted = points[order, 0], points[order, 1]
+    following = batch.next_vertex()
+
+    hits_points, hits_polys = [], []
+    for k, (xmin, ymin, xmax, ymax) in enumerate(batch.bboxes()):
+        lo = np.searchsorted(xs_sorted, xmin, side='left')
+        hi = np.searchsorted(xs_sorted, xmax, side='right')
+        ys = ys_sorted[lo:hi]
+        candidates = np.flatnonzero((ys >= ymin) & (ys <= ymax)) + lo
+        if not len(candidates):
+            continue
+
+        a, b = batch.offsets[k], batch.offsets[k + 1]
+        x1, y1 = batch.coords[a:b, 0], batch.coords[a:b, 1]
+        x2, y2 = batch.coords[following[a:b], 0], batch.coords[following[a:b], 1]
+        step = max(1, _PIP_BLOCK // (b - a))
+        for start in range(0, len(candidates), step):
+            chunk = candidates[start:start + step]
+            winding, on_edge = _winding(xs_sorted[chunk, None], ys_sorted[chunk, None], x1, y1, x2, y2)
+            inside = (winding != 0) | on_edge
+            hits_points.append(order[chunk[inside]])
+            hits_polys.append(np.full(inside.sum(), k, dtype=np.int64))
+
+    if not hits_points:
+        return np.empty((0, 2), dtype=np.int64)
+    hits = np.column_stack((np.concatenate(hits_points), np.concatenate(hits_polys)))
+    return hits[np.lexsort((hits[:, 1], hits[:, 0]))]
+
+
+def flt_points_inside_batch(batch, points) -> np.ndarray:
+    """
+    Матрица принадлежности точек многоугольникам (любым простым). См. flt_points_inside_hits.
+
+    Возвращает:
+        Булев массив размера (n_points, n_polygons): [i, k] – лежит ли i-я точка в k-м многоугольнике.
+    """
+    batch = PolygonBatch.from_polygons(batch)
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    matrix = np.zeros((len(points), len(batch)), dtype=bool)
+    hits = flt_points_inside_hits(batch, points)
+    matrix[hits[:, 0], hits[:, 1]] = True
+    return matrix
+
+
+def _orientation(a, b, c) -> int:
+    """Знак псевдоскалярного произведения (b - a) x (c - a): 1, -1 или 0 (точки на одной прямой)."""
+    p = _pseudo_scalar_prod((b[0] - a[0], b[1] - a[1]), (c[0] - a[0], c[1] - a[1]))
+    return (p > 0) - (p < 0)
+
+
+def _on_segment(a, b, c) -> bool:
+    """Лежит ли точка c, коллинеарная отрезку ab, на этом отрезке."""
+    return min(a[0], b[0]) <= c[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= c[1] <= max(a[1], b[1])
+
+
+def _segments_intersect(a, b, c, d) -> bool:
+    """Пересекаются ли (или касаются) отрезки ab и cd."""
+    o1, o2, o3, o4 = _orientation(a, b, c), _orientation(a, b, d), _orientation(c, d, a), _orientation(c, d, b)
+    if o1 != o2 and o3 != o4:
+        return True
+    return (o1 == 0 and _on_segment(a, b, c)) or (o2 == 0 and _on_segment(a, b, d)) \
+        or (o3 == 0 and _on_segment(c, d, a)) or (o4 == 0 and _on_segment(c, d, b))
+
+
+def _separated_by_axes(poly, other) -> bool:
+    """Теорема о разделяющей оси: есть ли среди нормалей рёбер poly ось, на которой проекции не перекрываются."""
+    n = len(poly)
+    for k in range(n):
+        (x1, y1), (x2, y2) = poly[k], poly[(k + 1) % n]
+        nx, ny = y1 - y2, x2 - x1
+        if not (nx or ny):
+            continue
+        proj = [nx*x + ny*y for x, y in poly]
+        proj_other = [nx*x + ny*y for x, y in other]
+        if max(proj) < min(proj_other) or max(proj_other) < min(proj):
+            return True
+    return False
+
+
+@instrumented('poly')
+def flt_polygons_intersect(poly: tuple[tuple[float, float], ...],
+                           other: tuple[tuple[float, float], ...]) -> bool:
+    """
+    Проверяет, пересекаются ли два многоугольника (имеют ли общую точку; касание считается пересечением).
+
+    Если оба многоугольника выпуклые и невырожденные, используется теорема о разделяющей оси
+    (проекции на нормали рёбер). В общем случае проверяется попарное пересечение рёбер,
+    а если рёбра не пересекаются – вложенность одного многоугольника в другой (flt_point_inside_simple).
+    """
+    if not len(poly) or not len(other):
+        return False
+
+    if _convex(poly) and _convex(other) and _area(poly) and _area(other):
+        return not (_separated_by_axes(poly, other) or _separated_by_axes(other, poly))
+
+    n, m = len(poly), len(other)
+    for i in range(n):
+        a, b = poly[i], poly[(i + 1) % n]
+        for j in range(m):
+            if _segments_intersect(a, b, other[j], other[(j + 1) % m]):
+                return True
+    return flt_point_inside_simple(poly, other[0]) or flt_point_inside_simple(other, poly[0])
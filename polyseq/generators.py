@@ -1,10 +1,12 @@
 import itertools
 import math
+import operator
 from typing import Iterator
 from polyseq.transformers import tr_translate, tr_rotate
+from polyseq.batch import PolygonBatch
+from polyseq.instrumentation import instrumented
 import random
-from polyseq.visualization import visualize
-import matplotlib.pyplot as plt
+import numpy as np
 
 def _regular_polygon(n_sides, l: int = 1) -> tuple[tuple[float, float], ...]:
     """
@@ -49,8 +51,87 @@ def _random_polygon(n_sides: int | float | None = None) -> tuple[tuple[float, fl
     return tuple(vertices)
 
 
+class RegPolygonSeq:
+    """
+    Ленивая "лента" правильных многоугольников, которую возвращает gen_reg_polygon_seq.
+
+    k-й многоугольник ленты – базовый многоугольник base_poly с центром в (0,0),
+    смещенный по оси абсцисс на x_offset + k*x_shift. Объект хранит параметры ленты
+    (n_sides, step, n_figs, l), поэтому агрегаты из polyseq.aggregates вычисляются для него
+    по замкнутым формулам, без обхода многоугольников.
+    Как и range, объект можно обходить сколько угодно раз, а также получать
+    k-й многоугольник (seq[k]) и срезы (seq[a:b:c]) за O(1), не перебирая предыдущие фигуры;
+    срез ленты – снова лента. len() определен только для конечной ленты.
+    """
+    __slots__ = ('n_sides', 'step', 'n_figs', 'l', 'base_poly', 'x_offset', 'x_shift')
+
+    def __init__(self, n_sides: int, step: int | float = 1, n_figs: int | float = math.inf,
+                 l: int | float = 1):
+        self.n_sides = n_sides
+        self.step = step
+        self.n_figs = n_figs if math.isinf(n_figs) else int(n_figs)
+        self.l = l
+
+        self.base_poly = tr_rotate(_regular_polygon(n_sides, l=l), 90) if n_sides != 4 \
+            else tr_rotate(_regular_polygon(n_sides, l=l), 45)
+        x_cords = tuple(map(lambda p: p[0], self.base_poly))
+        self.x_offset = 0
+        self.x_shift = max(x_cords) - min(x_cords) + step
+
+    @instrumented('gen', name='gen_reg_polygon_seq')
+    def __iter__(self) -> Iterator[tuple[tuple[float, float], ...]]:
+        indices = itertools.count() if math.isinf(self.n_figs) else range(self.n_figs)
+        return map(lambda k: tr_translate(self.base_poly, self.x_offset + k*self.x_shift, 0), indices)
+
+    @property
+    def n_vertices(self) -> int | float:
+        """Общее количество вершин всех многоугольников ленты (math.inf для бесконечной)."""
+        return self.n_figs * self.n_sides
+
+    def __len__(self) -> int:
+        if math.isinf(self.n_figs):
+            raise TypeError('infinite RegPolygonSeq has no len()')
+        return self.n_figs
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self._slice(item)
+
+        k = operator.index(item)
+        if math.isinf(self.n_figs):
+            if k < 0:
+                raise IndexError('negative indices are not supported for an infinite sequence')
+        else:
+            k = range(self.n_figs)[k]
+        return tr_translate(self.base_poly, self.x_offset + k*self.x_shift, 0)
+
+    def _slice(self, item: slice) -> 'RegPolygonSeq':
+        """Срез ленты – лента с тем же базовым многоугольником, другим смещением и шагом."""
+        if not math.isinf(self.n_figs):
+            indices = range(self.n_figs)[item]
+            first, stride, n_figs = indices.start, indices.step, len(indices)
+        else:
+            first = 0 if item.start is None else operator.index(item.start)
+            stride = 1 if item.step is None else operator.index(item.step)
+            if first < 0 or stride <= 0 or (item.stop is not None and operator.index(item.stop) < 0):
+                raise ValueError('negative slice bounds and steps are not supported for an infinite sequence')
+            n_figs = math.inf if item.stop is None else len(range(first, operator.index(item.stop), stride))
+
+        strip = object.__new__(type(self))
+        strip.n_sides, strip.l, strip.base_poly = self.n_sides, self.l, self.base_poly
+        strip.n_figs = n_figs
+        strip.x_offset = self.x_offset + first*self.x_shift
+        strip.x_shift = stride*self.x_shift
+        strip.step = self.step + strip.x_shift - self.x_shift
+        return strip
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}(n_sides={self.n_sides}, step={self.step}, '
+                f'n_figs={self.n_figs}, l={self.l})')
+
+
 def gen_reg_polygon_seq(n_sides: int, step: int | float = 1, n_figs: int | float = math.inf,
-                 l: int | float = 1) -> Iterator[tuple[tuple[float, float], ...]]:
+                 l: int | float = 1) -> RegPolygonSeq:
     """
     Генерирует конечную или бесконечную последовательность правильных
     многоугольников с заданным количеством сторон.
@@ -61,11 +142,11 @@ def gen_reg_polygon_seq(n_sides: int, step: int | float = 1, n_figs: int | float
         n_sides: Количество сторон правильного многоугольника. Должно быть не меньше 3.
         step: Расстояние между многоугольниками по оси X. По умолчанию 1.
         n_figs: Количество многоугольников для генерации.
-            Если math.inf — генератор бесконечен. По умолчанию бесконечность.
+            Если math.inf — последовательность бесконечна. По умолчанию бесконечность.
         l: Длина стороны каждого многоугольника. По умолчанию 1.
 
     Возвращает:
-        Итератор, генерирующий кортежи из вершин размера (n_sides, 2);
+        Ленивую последовательность RegPolygonSeq, генерирующую кортежи из вершин размера (n_sides, 2);
         каждая вершина – кортеж координат (float, float)
 
     Исключения:
@@ -88,20 +169,13 @@ def gen_reg_polygon_seq(n_sides: int, step: int | float = 1, n_figs: int | float
     if n_sides < 3:
         raise ValueError('n_sides must be greater or equal to 3')
 
-    if not n_figs.is_integer() and not math.isinf(n_figs):
+    if not float(n_figs).is_integer() and not math.isinf(n_figs):
         raise ValueError('n_figs cannot be a fraction')
 
-    base_poly = tr_rotate(_regular_polygon(n_sides, l=l), 90) if n_sides != 4 \
-        else tr_rotate(_regular_polygon(n_sides, l=l), 45)
-    x_cords = tuple(map(lambda p: p[0], base_poly))
-    x_shift = max(x_cords) - min(x_cords) + step
-    stream = map(lambda shift: tr_translate(base_poly, shift, 0), itertools.count(0, x_shift))
-    if math.isinf(n_figs):
-        yield from stream
-    else:
-        yield from itertools.islice(stream, n_figs)
+    return RegPolygonSeq(n_sides, step=step, n_figs=n_figs, l=l)
 
 
+@instrumented('gen')
 def gen_random_polygon_seq(n_figs: int | float,
                            n_sides: int | float | None = None) -> Iterator[tuple[tuple[float], float, ...]]:
     """
@@ -128,11 +202,90 @@ def gen_random_polygon_seq(n_figs: int | float,
     if n_sides is not None and n_sides < 3:
         raise ValueError('n_sides must be greater or equal to 3')
 
-    if n_figs is not None and not n_figs.is_integer():
+    if n_figs is not None and not float(n_figs).is_integer():
         raise ValueError('n_figs cannot be a fraction')
 
-    if n_sides is not None and not n_sides.is_integer():
+    if n_sides is not None and not float(n_sides).is_integer():
         raise ValueError('n_sides cannot be a fraction')
 
-    yield from (_random_polygon(n_sides) for _ in range(n_figs))
+    yield from (_random_polygon(n_sides) for _ in range(int(n_figs)))
+
+
+def random_substreams(seed: int | np.random.SeedSequence | None, n_streams: int) -> list[np.random.Generator]:
+    """
+    Создает независимые воспроизводимые генераторы случайных чисел для параллельных воркеров.
+    Подпотоки порождаются через numpy.random.SeedSequence.spawn, поэтому их последовательности
+    статистически независимы и не пересекаются, а при одинаковом seed – совпадают от запуска к запуску.
+
+    Аргументы:
+        seed: Начальное значение (int или SeedSequence). Если None – берется энтропия ОС.
+        n_streams: Количество подпотоков.
+
+    Возвращает:
+        Список из n_streams объектов numpy.random.Generator – по одному на воркер;
+        каждый передается в gen_random_polygon_batch(rng=...).
+    """
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed_seq.spawn(n_streams)]
+
+
+@instrumented('batch')
+def gen_random_polygon_batch(n_figs: int | float,
+                             n_sides: int | float | None = None,
+                             rng: int | np.random.Generator | np.random.SeedSequence | None = None,
+                             packed: bool = True) -> PolygonBatch | tuple[tuple[tuple[float, float], ...], ...]:
+    """
+    Генерирует n_figs случайных многоугольников за одну векторизованную операцию numpy.
+    Распределения те же, что у gen_random_polygon_seq: центр равномерно распределен в квадрате
+    [0, 50] x [0, 50], количество сторон (если не задано) – целое от 3 до 13, углы вершин равномерны
+    на [0, 2*pi) и упорядочены по возрастанию, радиусы равномерны на [0.1, 10].
+    В отличие от gen_random_polygon_seq, используется явный генератор случайных чисел,
+    а не глобальное состояние модуля random.
+
+    Аргументы:
+        n_figs: Количество многоугольников для генерации.
+        n_sides: Количество сторон каждого многоугольника. Если None, выбирается случайно для каждого.
+            По умолчанию None.
+        rng: Источник случайности: seed (int), SeedSequence или numpy.random.Generator
+            (например, один из random_substreams). По умолчанию None – энтропия ОС.
+        packed: Вернуть PolygonBatch (True) или кортеж многоугольников-кортежей (False). По умолчанию True.
+
+    Возвращает:
+        PolygonBatch или кортеж многоугольников; каждая вершина – координаты (float, float).
+
+    Исключения:
+        TypeError: Если типы аргументов не соответствуют ожидаемым.
+        ValueError: Если n_sides меньше 3 или n_figs/n_sides – дробные числа.
+    """
+    if not isinstance(n_figs, (int, float)):
+        raise TypeError('n_figs must be a whole numerical value (int or float)')
+
+    if n_sides is not None and not isinstance(n_sides, (int, float)):
+        raise TypeError('n_sides must be a whole numerical value (int or float)')
+
+    if n_sides is not None and n_sides < 3:
+        raise ValueError('n_sides must be greater or equal to 3')
+
+    if not float(n_figs).is_integer():
+        raise ValueError('n_figs cannot be a fraction')
+
+    if n_sides is not None and not float(n_sides).is_integer():
+        raise ValueError('n_sides cannot be a fraction')
+
+    rng = np.random.default_rng(rng)
+    n_figs = int(n_figs)
+    centers = rng.uniform(0, 50, size=(n_figs, 2))
+    counts = np.full(n_figs, int(n_sides)) if n_sides is not None \
+        else rng.integers(3, 13, endpoint=True, size=n_figs)
+    offsets = np.zeros(n_figs + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    poly_ids = np.repeat(np.arange(n_figs), counts)
+    angles = rng.uniform(0, 2*math.pi, size=offsets[-1])
+    angles = angles[np.lexsort((angles, poly_ids))]  # сортировка углов внутри каждого многоугольника
+    radiuses = rng.uniform(0.1, 10, size=offsets[-1])
+
+    coords = np.column_stack((radiuses*np.cos(angles), radiuses*np.sin(angles))) + centers[poly_ids]
+    batch = PolygonBatch(coords, offsets)
+    return batch if packed else batch.to_polygons()
 
@@ -0,0 +1,311 @@
+"""
+Пространственный индекс последовательности многоугольников.
+
+Равномерная сетка по ограничивающим прямоугольникам: каждый многоугольник регистрируется
+во всех ячейках, которые пересекает его ограничивающий прямоугольник. Запрос просматривает
+только ячейки рядом с точкой или окном и передает найденных кандидатов точным предикатам
+polyseq.filters, поэтому при равномерно распределенных многоугольниках время запроса
+не зависит от их общего количества. Многоугольники, покрывающие больше _MAX_CELLS ячеек,
+в сетку не заносятся: они хранятся отдельным списком и проверяются каждым запросом.
+"""
+import bisect
+import heapq
+import itertools
+import math
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from polyseq.batch import PolygonBatch
+from polyseq.filters import _convex, flt_point_inside, flt_point_inside_simple
+from polyseq.polygon import Polygon
+
+_MAX_CELLS = 256  # сколько ячеек может покрывать многоугольник, хранимый в сетке
+
+
+def _point_segment_distance(point, a, b) -> float:
+    """Расстояние от точки до отрезка ab."""
+    px, py = point
+    (ax, ay), (bx, by) = a, b
+    dx, dy = bx - ax, by - ay
+    length = dx*dx + dy*dy
+    t = 0.0 if not length else max(0.0, min(1.0, ((px - ax)*dx + (py - ay)*dy) / length))
+    return math.hypot(px - ax - t*dx, py - ay - t*dy)
+
+
+def _contains(poly: Polygon, point) -> bool:
+    """Точная проверка принадлежности точки: быстрый путь для выпуклых многоугольников, общий – для остальных."""
+    if _convex(poly):
+        return flt_point_inside(poly, point)
+    return flt_point_inside_simple(poly, point)
+
+
+def _point_polygon_distance(poly: Polygon, point) -> float:
+    """Расстояние от точки до многоугольника (0, если точка внутри или на границе)."""
+    if _contains(poly, point):
+        return 0.0
+    n = len(poly)
+    return min(_point_segment_distance(point, poly[i], poly[(i + 1) % n]) for i in range(n))
+
+
+class SpatialIndex:
+    """
+    Пространственный индекс многоугольников на равномерной сетке.
+
+    Многоугольники хранятся как polyseq.polygon.Polygon (с кешированными ограничивающим
+    прямоугольником и выпуклостью) и нумеруются в порядке добавления; запросы возвращают эти номера,
+    сам многоугольник – index[k]. Индекс строится целиком через from_polygons (размер ячейки
+    подбирается по данным) или пополняется по одному многоугольнику через insert.
+
+        index = SpatialIndex.from_polygons(gen_random_polygon_seq(10**5, n_sides=8))
+        index.query_point((25, 25))           # номера многоугольников, содержащих точку
+        index.query_bbox((0, 0, 10, 10))      # номера многоугольников, задевающих окно
+        index.nearest((60, 60), k=3)          # [(расстояние, номер), ...]
+
+    Аргументы:
+        cell_size: Сторона ячейки сетки. Удачный выбор – порядка типичного размера многоугольника.
+
+    Исключения:
+        ValueError: Если cell_size не положительное конечное число.
+    """
+
+    def __init__(self, cell_size: float):
+        if not (cell_size > 0 and math.isfinite(cell_size)):
+            raise ValueError('cell_size must be a positive finite number')
+        self.cell_size = float(cell_size)
+        self._polygons = []
+        self._bboxes = []
+        self._cells = {}
+        self._oversized = []  # номера многоугольников, покрывающих больше _MAX_CELLS ячеек
+        self._extent = None  # (ix_min, iy_min, ix_max, iy_max) занятых ячеек
+
+    @classmethod
+    def from_polygons(cls, polygon_seq: Iterable[tuple[tuple[float, float], ...]],
+                      cell_size: float | None = None) -> 'SpatialIndex':
+        """
+        Строит индекс по конечной последовательности многоугольников (любой генератор polyseq,
+        PolygonBatch, PolygonFile). Ограничивающие прямоугольники вычисляются векторизованно по всему пакету.
+
+        Аргументы:
+            polygon_seq: Конечная последовательность многоугольников.
+            cell_size: Сторона ячейки сетки. По умолчанию – медиана наибольшей стороны
+                       ограничивающих прямоугольников.
+        """
+        batch = PolygonBatch.from_polygons(polygon_seq)
+        bboxes = batch.bboxes()
+        if cell_size is None:
+            extents = np.maximum(bboxes[:, 2] - bboxes[:, 0], bboxes[:, 3] - bboxes[:, 1])
+            extents = extents[np.isfinite(extents) & (extents > 0)]
+            cell_size = float(np.median(extents)) if len(extents) else 1.0
+
+        index = cls(cell_size)
+        for poly, bbox in zip(batch.to_polygons(), bboxes.tolist()):
+            index._add(Polygon(poly), tuple(bbox))
+        return index
+
+    def insert(self, poly: tuple[tuple[float, float], ...]) -> int:
+        """
+        Добавляет многоугольник в индекс.
+
+        Возвращает:
+            Номер добавленного многоугольника.
+        """
+        poly = poly if isinstance(poly, Polygon) else Polygon(poly)
+        return self._add(poly, poly.bbox if len(poly) else (math.inf, math.inf, -math.inf, -math.inf))
+
+    def _add(self, poly: Polygon, bbox: tuple[float, float, float, float]) -> int:
+        k = len(self._polygons)
+        self._polygons.append(poly)
+        self._bboxes.append(bbox)
+        if not len(poly):
+            return k
+
+        ix0, iy0, ix1, iy1 = self._cell_range(bbox)
+        # стоимость регистрации растет как квадрат размера многоугольника в ячейках
+        if (ix1 - ix0 + 1)*(iy1 - iy0 + 1) > _MAX_CELLS:
+            self._oversized.append(k)
+            return k
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                self._cells.setdefault((ix, iy), []).append(k)
+
+        if self._extent is None:
+            self._extent = (ix0, iy0, ix1, iy1)
+        else:
+            ex0, ey0, ex1, ey1 = self._extent
+            self._extent = (min(ex0, ix0), min(ey0, iy0), max(ex1, ix1), max(ey1, iy1))
+        return k
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _cell_range(self, bbox) -> tuple[int, int, int, int]:
+        return (*self._cell(bbox[0], bbox[1]), *self._cell(bbox[2], bbox[3]))
+
+    def query_point(self, point: tuple[float, float]) -> list[int]:
+        """
+        Номера многоугольников, содержащих точку (точка на границе считается принадлежащей).
+        Кандидаты из ячейки точки проверяются flt_point_inside для выпуклых многоугольников
+        и flt_point_inside_simple для остальных.
+
+        Возвращает:
+            Список номеров по возрастанию.
+        """
+        px, py = point
+        result = []
+        for k in sorted(itertools.chain(self._cells.get(self._cell(px, py), ()), self._oversized)):
+            xmin, ymin, xmax, ymax = self._bboxes[k]
+            if xmin <= px <= xmax and ymin <= py <= ymax and _contains(self._polygons[k], point):
+                result.append(k)
+        return result
+
+    def query_bbox(self, bbox: tuple[float, float, float, float], inside: bool = False) -> list[int]:
+        """
+        Номера многоугольников, ограничивающий прямоугольник которых пересекает окно.
+
+        Аргументы:
+            bbox: Окно (xmin, ymin, xmax, ymax).
+            inside: Отбирать только многоугольники, целиком лежащие в окне.
+
+        Возвращает:
+            Список номеров по возрастанию.
+
+        Исключения:
+            ValueError: Если xmin > xmax или ymin > ymax.
+        """
+        qx0, qy0, qx1, qy1 = bbox
+        if qx0 > qx1 or qy0 > qy1:
+            raise ValueError('bbox must be (xmin, ymin, xmax, ymax) with xmin <= xmax and ymin <= ymax')
+        found = set(self._oversized)
+        if self._extent is not None:
+            ex0, ey0, ex1, ey1 = self._extent
+            ix0, iy0, ix1, iy1 = self._cell_range(bbox)
+            ix0, iy0, ix1, iy1 = max(ix0, ex0), max(iy0, ey0), min(ix1, ex1), min(iy1, ey1)
+            if max(0, ix1 - ix0 + 1)*max(0, iy1 - iy0 + 1) > len(self._cells):
+                # в окне больше ячеек, чем занято во всей сетке: дешевле перебрать занятые
+                for (ix, iy), cell in self._cells.items():
+                    if ix0 <= ix <= ix1 and iy0 <= iy <= iy1:
+                        found.update(cell)
+            else:
+                for ix in range(ix0, ix1 + 1):
+                    for iy in range(iy0, iy1 + 1):
+                        found.update(self._cells.get((ix, iy), ()))
+
+        result = []
+        for k in sorted(found):
+            xmin, ymin, xmax, ymax = self._bboxes[k]
+            if inside:
+                if qx0 <= xmin and xmax <= qx1 and qy0 <= ymin and ymax <= qy1:
+                    result.append(k)
+            elif xmin <= qx1 and qx0 <= xmax and ymin <= qy1 and qy0 <= ymax:
+                result.append(k)
+        return result
+
+    def nearest(self, point: tuple[float, float], k: int = 1) -> list[tuple[float, int]]:
+        """
+        k ближайших к точке многоугольников по точному расстоянию до многоугольника
+        (0, если точка внутри или на границе).
+
+        Алгоритм: ячейки просматриваются кольцами вокруг ячейки точки; поиск останавливается,
+        когда k-е найденное расстояние не больше расстояния от точки до еще не просмотренных ячеек.
+        В разреженной сетке пустые кольца пропускаются, так что запрос просматривает не больше
+        ячеек, чем их занято.
+
+        Аргументы:
+            point: Точка (x, y).
+            k: Количество многоугольников.
+
+        Возвращает:
+            Список пар (расстояние, номер) по возрастанию расстояния, при равенстве – номера.
+            Если в индексе меньше k многоугольников, возвращаются все.
+
+        Исключения:
+            ValueError: Если k < 1.
+        """
+        if k < 1:
+            raise ValueError('k must be positive')
+
+        best = []  # куча (-расстояние, -номер) из не более чем k лучших
+
+        def consider(j: int):
+            item = (-_point_polygon_distance(self._polygons[j], point), -j)
+            if len(best) < k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+
+        # многоугольники вне сетки проверяются заранее, дальше кольца ячеек только уточняют ответ
+        for j in self._oversized:
+            consider(j)
+        if self._extent is None:
+            return sorted((-d, -j) for d, j in best)
+
+        px, py = point
+        cx, cy = self._cell(px, py)
+        ex0, ey0, ex1, ey1 = self._extent
+        # кольца ближе r_min лежат вне занятой области сетки и пусты
+        r_min = max(0, ex0 - cx, cx - ex1, ey0 - cy, cy - ey1)
+        r_max = max(cx - ex0, ex1 - cx, cy - ey0, ey1 - cy)
+
+        seen = set()
+        rings = None  # занятые ячейки по возрастанию номера кольца, когда перебор колец дороже
+        r, pos = r_min, 0
+        while r <= r_max:
+            if rings is None and (2*r + 1)**2 > len(self._cells):
+                # кольца уже покрыли больше ячеек, чем занято в сетке: дальше идем только по занятым,
+                # перескакивая пустые кольца
+                rings = sorted((max(abs(ix - cx), abs(iy - cy)), ix, iy) for ix, iy in self._cells)
+                pos = bisect.bisect_left(rings, (r,))
+            if rings is None:
+                cells = self._ring(cx, cy, r)
+            else:
+                if pos == len(rings):
+                    break
+                r, cells = rings[pos][0], []
+                while pos < len(rings) and rings[pos][0] == r:
+                    cells.append(rings[pos][1:])
+                    pos += 1
+
+            for cell in cells:
+                for j in self._cells.get(cell, ()):
+                    if j not in seen:
+                        seen.add(j)
+                        consider(j)
+
+            if len(best) == k:
+                c = self.cell_size
+                bound = min(px - (cx - r)*c, (cx + r + 1)*c - px, py - (cy - r)*c, (cy + r + 1)*c - py)
+                if -best[0][0] <= bound:
+                    break
+            r += 1
+
+        return sorted((-d, -j) for d, j in best)
+
+    def _ring(self, cx: int, cy: int, r: int) -> Iterator[tuple[int, int]]:
+        """Ячейки на расстоянии Чебышёва r от (cx, cy), лежащие в занятой области сетки."""
+        ex0, ey0, ex1, ey1 = self._extent
+        if r == 0:
+            yield cx, cy
+            return
+        for ix in range(max(cx - r, ex0), min(cx + r, ex1) + 1):
+            if ey0 <= cy - r <= ey1:
+                yield ix, cy - r
+            if ey0 <= cy + r <= ey1:
+                yield ix, cy + r
+        for iy in range(max(cy - r + 1, ey0), min(cy + r - 1, ey1) + 1):
+            if ex0 <= cx - r <= ex1:
+                yield cx - r, iy
+            if ex0 <= cx + r <= ex1:
+                yield cx + r, iy
+
+    def __len__(self) -> int:
+        return len(self._polygons)
+
+    def __getitem__(self, k: int) -> Polygon:
+        return self._polygons[k]
+
+    def __iter__(self) -> Iterator[Polygon]:
+        return iter(self._polygons)
+
+    def __repr__(self) -> str:
+        return f'SpatialIndex(n_polygons={len(self)}, cell_size={self.cell_size!r}, n_cells={len(self._cells)})'
@@ -0,0 +1,277 @@
+"""
+Необязательная инструментация горячих путей polyseq.
+
+По умолчанию выключена: обертка публичной функции лишь проверяет один флаг и вызывает
+исходную функцию. После enable() для каждой функции накапливаются количество вызовов,
+обработанных многоугольников и вершин, собственное время работы и пропускная способность
+(многоугольников в секунду). Время стадии не включает время вышестоящих ленивых стадий:
+например, для agr_area(map(tr_rotate, seq)) время tr_rotate не попадет в agr_area.
+
+Также включается переменной окружения POLYSEQ_INSTRUMENT=1 при импорте.
+"""
+import functools
+import os
+import sys
+import threading
+import time
+from typing import Callable
+
+_enabled = os.environ.get('POLYSEQ_INSTRUMENT', '') not in ('', '0')
+_lock = threading.Lock()
+_stats = {}
+
+_STAGES = {'gen': 'generate', 'tr': 'transform', 'flt': 'filter', 'agr': 'aggregate'}
+
+
+def enable():
+    """Включает сбор статистики."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Выключает сбор статистики (накопленные значения сохраняются)."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Обнуляет накопленную статистику."""
+    with _lock:
+        _stats.clear()
+
+
+def _record(name: str, calls: int, polygons: int, vertices: int, seconds: float):
+    with _lock:
+        stat = _stats.get(name)
+        if stat is None:
+            stat = _stats[name] = [0, 0, 0, 0.0]
+        stat[0] += calls
+        stat[1] += polygons
+        stat[2] += vertices
+        stat[3] += seconds
+
+
+def snapshot() -> dict[str, dict]:
+    """
+    Снимок накопленной статистики.
+
+    Возвращает:
+        Словарь {имя функции: {'stage', 'calls', 'polygons', 'vertices', 'seconds', 'polygons_per_sec'}};
+        stage – одна из стадий 'generate', 'transform', 'filter', 'aggregate'.
+    """
+    with _lock:
+        items = [(name, tuple(stat)) for name, stat in _stats.items()]
+    return {
+        name: {
+            'stage': _STAGES.get(name.split('_', 1)[0], 'transform'),
+            'calls': calls,
+            'polygons': polygons,
+            'vertices': vertices,
+            'seconds': seconds,
+            'polygons_per_sec': polygons / seconds if seconds else 0.0,
+        }
+        for name, (calls, polygons, vertices, seconds) in items
+    }
+
+
+def _size(seq) -> tuple[int, int]:
+    """Количество многоугольников и вершин в последовательности с произвольным доступом."""
+    try:
+        polygons = len(seq)
+    except TypeError:  # бесконечная лента
+        return 0, 0
+    vertices = getattr(seq, 'n_vertices', None)
+    if vertices is None:
+        vertices = sum(map(len, seq))
+    return polygons, vertices
+
+
+class _CountingIterator:
+    """Итератор-обертка: считает выданные многоугольники, вершины и время, проведенное в next()."""
+    __slots__ = ('_it', 'polygons', 'vertices', 'seconds')
+
+    def __init__(self, iterable):
+        self._it = iter(iterable)
+        self.polygons = self.vertices = 0
+        self.seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            poly = next(self._it)
+        finally:
+            self.seconds += time.perf_counter() - start
+        self.polygons += 1
+        self.vertices += len(poly)
+        return poly
+
+
+def _generated(name: str, iterable):
+    """Ленивая обертка результата генератора: статистика записывается по мере выдачи многоугольников."""
+    counter = _CountingIterator(iterable)
+    _record(name, 1, 0, 0, 0.0)
+    while True:
+        polygons, vertices, seconds = counter.polygons, counter.vertices, counter.seconds
+        try:
+            poly = next(counter)
+        except StopIteration:
+            return
+        finally:
+            _record(name, 0, counter.polygons - polygons, counter.vertices - vertices, counter.seconds - seconds)
+        yield poly
+
+
+def instrumented(kind: str, name: str | None = None, method: bool = False) -> Callable[[Callable], Callable]:
+    """
+    Декоратор публичных функций polyseq.
+
+    Аргументы:
+        kind: Что обрабатывает функция:
+              'poly' – первый аргумент – многоугольник (tr_*, flt_*);
+              'batch' – первый аргумент или результат – PolygonBatch (tr_*_batch, gen_random_polygon_batch);
+              'seq' – первый аргумент – последовательность, которую функция поглощает (agr_*);
+              'gen' – результат – ленивая последовательность многоугольников (gen_*).
+        name: Имя в статистике. По умолчанию – имя функции.
+        method: Декорируется метод: первым аргументом идет self, а многоугольник – вторым.
+    """
+    index = 1 if method else 0
+
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__name__
+
+        if kind == 'poly':
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                result = func(*args, **kwargs)
+                seconds = time.perf_counter() - start
+                poly = args[index] if len(args) > index else kwargs['poly']
+                _record(label, 1, 1, len(poly), seconds)
+                return result
+
+        elif kind == 'batch':
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                result = func(*args, **kwargs)
+                seconds = time.perf_counter() - start
+                source = args[0] if args and hasattr(args[0], 'n_vertices') else result
+                _record(label, 1, *_size(source), seconds)
+                return result
+
+        elif kind == 'seq':
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                args = list(args)
+                polygon_seq = args[index] if len(args) > index else kwargs['polygon_seq']
+                counter = None
+                if iter(polygon_seq) is polygon_seq:
+                    counter = polygon_seq = _CountingIterator(polygon_seq)
+                    if len(args) > index:
+                        args[index] = polygon_seq
+                    else:
+                        kwargs['polygon_seq'] = polygon_seq
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    seconds = time.perf_counter() - start
+                    if counter is not None:
+                        # собственное время: без времени вышестоящих ленивых стадий
+                        _record(label, 1, counter.polygons, counter.vertices, seconds - counter.seconds)
+                    else:
+                        _record(label, 1, *_size(polygon_seq), seconds)
+
+        elif kind == 'gen':
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                return _generated(label, func(*args, **kwargs))
+
+        else:
+            raise ValueError(f'unknown instrumentation kind: {kind!r}')
+
+        return wrapper
+    return decorator
+
+
+class Reporter:
+    """
+    Периодический отчет о пропускной способности стадий в фоновом потоке.
+    Каждые interval секунд вызывает callback со словарем
+    {имя функции: {'polygons', 'seconds', 'polygons_per_sec', 'total_polygons'}}, где
+    polygons_per_sec посчитан по приросту за последний интервал (по настенным часам).
+    Используется как контекстный менеджер:
+
+        with Reporter(interval=10):
+            agr_area(itertools.islice(map(tr_rotate_60, gen_reg_polygon_seq(4)), 10**8))
+
+    Аргументы:
+        interval: Период отчета в секундах. По умолчанию 5.
+        callback: Получатель отчета. По умолчанию – печать таблицы в sys.stderr.
+    """
+
+    def __init__(self, interval: float = 5.0, callback: Callable[[dict], None] | None = None):
+        self.interval = interval
+        self.callback = callback or _print_report
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        previous, previous_time = snapshot(), time.perf_counter()
+        while not self._stop.wait(self.interval):
+            current, current_time = snapshot(), time.perf_counter()
+            elapsed = current_time - previous_time
+            report = {}
+            for name, stat in current.items():
+                polygons = stat['polygons'] - previous.get(name, {}).get('polygons', 0)
+                report[name] = {
+                    'polygons': polygons,
+                    'seconds': stat['seconds'] - previous.get(name, {}).get('seconds', 0.0),
+                    'polygons_per_sec': polygons / elapsed if elapsed else 0.0,
+                    'total_polygons': stat['polygons'],
+                }
+            self.callback(report)
+            previous, previous_time = current, current_time
+
+    def start(self) -> 'Reporter':
+        """Включает инструментацию и запускает фоновый поток отчетов."""
+        enable()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='polyseq-reporter', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Останавливает поток отчетов (инструментация остается включенной)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'Reporter':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _print_report(report: dict):
+    for name, stat in sorted(report.items()):
+        print(f'[polyseq] {name:<28}{stat["polygons_per_sec"]:>14,.0f} poly/s'
+              f'{stat["total_polygons"]:>16,} total', file=sys.stderr)
@@ -0,0 +1,504 @@
+"""
+Поиск ближайших вершин, рёбер и многоугольников для множества точек-запросов.
+
+NearestIndex – статическое дерево ограничивающих прямоугольников (BVH; для вершин это KD-дерево)
+над элементами последовательности. Дерево неявное и сбалансированное: на каждом уровне элементы
+каждого узла упорядочиваются по центрам вдоль более протяженной оси и делятся пополам, поэтому
+узел – это непрерывный диапазон элементов, а прямоугольники узлов хранятся массивами по уровням.
+
+Запросы обрабатываются сразу для всех точек блока обходом в глубину блоками пар (точка, узел):
+пары, у которых расстояние до прямоугольника узла больше текущей границы, отбрасываются, а
+расстояния до элементов в листьях считаются одной операцией numpy. Для k ближайших граница каждой
+точки сначала берется из ее собственного поддерева (спуск к ближайшему узлу), а ближний потомок
+обходится раньше дальнего, поэтому обход затрагивает лишь несколько листьев на точку.
+"""
+import math
+from typing import Iterator
+
+import numpy as np
+
+from polyseq.aggregates import _PAIR_BLOCK, _ranges
+from polyseq.batch import PolygonBatch
+
+_QUERY_BLOCK = 4096  # сколько точек-запросов обрабатывается за один проход по дереву
+KINDS = ('vertex', 'edge', 'polygon')
+
+
+def _box_distances(points: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """Расстояния от точек до прямоугольников (xmin, ymin, xmax, ymax) попарно (0 для точки внутри)."""
+    dx = np.maximum(np.maximum(boxes[:, 0] - points[:, 0], points[:, 0] - boxes[:, 2]), 0)
+    dy = np.maximum(np.maximum(boxes[:, 1] - points[:, 1], points[:, 1] - boxes[:, 3]), 0)
+    return np.hypot(dx, dy)
+
+
+def _box_pair_distances(boxes: np.ndarray, other: np.ndarray) -> np.ndarray:
+    """Расстояния между прямоугольниками boxes и other попарно (0 для перекрывающихся)."""
+    dx = np.maximum(np.maximum(boxes[:, 0] - other[:, 2], other[:, 0] - boxes[:, 2]), 0)
+    dy = np.maximum(np.maximum(boxes[:, 1] - other[:, 3], other[:, 1] - boxes[:, 3]), 0)
+    return np.hypot(dx, dy)
+
+
+def _segment_distances(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Расстояния от точек до отрезков [start, end] попарно."""
+    d = end - start
+    length = np.einsum('ij,ij->i', d, d)
+    t = np.einsum('ij,ij->i', points - start, d) / np.where(length > 0, length, 1)
+    t = np.clip(t, 0, 1)
+    return np.hypot(*(points - start - t[:, None]*d).T)
+
+
+def _segment_pair_distances(a0: np.ndarray, a1: np.ndarray, b0: np.ndarray, b1: np.ndarray) -> np.ndarray:
+    """
+    Расстояния между отрезками [a0, a1] и [b0, b1] попарно: 0 для пересекающихся, иначе
+    наименьшее из расстояний от концов одного отрезка до другого.
+    """
+    def orientation(p, q, r):
+        return np.sign((q[:, 0] - p[:, 0])*(r[:, 1] - p[:, 1]) - (q[:, 1] - p[:, 1])*(r[:, 0] - p[:, 0]))
+
+    distances = np.minimum(np.minimum(_segment_distances(a0, b0, b1), _segment_distances(a1, b0, b1)),
+                           np.minimum(_segment_distances(b0, a0, a1), _segment_distances(b1, a0, a1)))
+    # касания и коллинеарные перекрытия уже дают 0 через концы; остается собственное пересечение
+    crossing = (orientation(a0, a1, b0)*orientation(a0, a1, b1) < 0) \
+        & (orientation(b0, b1, a0)*orientation(b0, b1, a1) < 0)
+    distances[crossing] = 0.0
+    return distances
+
+
+class NearestIndex:
+    """
+    Индекс ближайших элементов последовательности многоугольников: вершин (kind='vertex'),
+    рёбер (kind='edge') или многоугольников целиком (kind='polygon', расстояние 0 для точки внутри
+    или на границе). Для многих точек-запросов обобщает agr_nearest_vertex и agr_origin_nearest.
+
+        index = NearestIndex.from_polygons(gen_random_polygon_batch(10**5), kind='edge')
+        distances, polygons, edges = index.query(points, k=3)
+        queries, distances, polygons, edges = index.query_radius(points, 0.5)
+
+    Элементы нумеруются как в PolygonBatch: вершина i – coords[i], ребро i – от вершины i
+    к следующей вершине того же многоугольника, многоугольник – его номер в последовательности.
+
+    Аргументы:
+        batch: Многоугольники в виде PolygonBatch.
+        kind: Тип элементов: 'vertex', 'edge' или 'polygon'.
+        leaf_size: Количество элементов в листе дерева (от leaf_size до 2*leaf_size).
+        split_edges: Для kind='edge' – разбивать длинные рёбра на куски. Ускоряет запросы точек,
+                     но увеличивает индекс; для closest_pair выгоднее рёбра целиком.
+
+    Исключения:
+        ValueError: Если kind неизвестен или leaf_size < 1.
+    """
+
+    def __init__(self, batch: PolygonBatch, kind: str = 'vertex', leaf_size: int = 16, split_edges: bool = True):
+        if kind not in KINDS:
+            raise ValueError(f'unknown kind: {kind!r} (expected one of {", ".join(KINDS)})')
+        if leaf_size < 1:
+            raise ValueError('leaf_size must be a positive integer')
+        self.batch = batch
+        self.kind = kind
+        self.leaf_size = leaf_size
+        self._following = batch.next_vertex()
+
+        if kind == 'vertex':
+            boxes = np.hstack((batch.coords, batch.coords))
+            polygons = batch.polygon_ids()
+        elif kind == 'edge' and split_edges:
+            items, boxes = self._edge_pieces(batch)
+            polygons = batch.polygon_ids()
+        elif kind == 'edge':
+            end = batch.coords[self._following]
+            items = np.arange(batch.n_vertices)
+            boxes = np.hstack((np.minimum(batch.coords, end), np.maximum(batch.coords, end)))
+            polygons = batch.polygon_ids()
+        else:
+            boxes = batch.bboxes()
+            polygons = np.arange(len(batch))
+        if kind != 'edge':
+            # пустые многоугольники не участвуют в поиске
+            items = np.flatnonzero(np.isfinite(boxes[:, 0]))
+            boxes = boxes[items]
+        self._build(items, boxes)
+        self._polygon_of = polygons
+        # пар (точка, лист) за раз – так, чтобы пар (точка, ребро) в листьях было не больше _PAIR_BLOCK
+        edges_per_item = batch.n_vertices / max(len(batch), 1) if kind == 'polygon' else 1
+        self._pair_limit = max(1, int(_PAIR_BLOCK / (2*leaf_size*max(edges_per_item, 1))))
+
+    @classmethod
+    def from_polygons(cls, polygon_seq, kind: str = 'vertex', leaf_size: int = 16,
+                      split_edges: bool = True) -> 'NearestIndex':
+        """
+        Строит индекс по конечной последовательности многоугольников (любой генератор polyseq,
+        PolygonBatch, PolygonFile). Остальные аргументы – как у конструктора.
+        """
+        return cls(PolygonBatch.from_polygons(polygon_seq), kind=kind, leaf_size=leaf_size, split_edges=split_edges)
+
+    def _edge_pieces(self, batch: PolygonBatch) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Рёбра, разбитые на куски не длиннее четверти медианной длины ребра, и прямоугольники кусков.
+        Прямоугольник длинного ребра покрывает много пустого места, и листья из таких рёбер перекрываются;
+        кусок ссылается на свое ребро, а расстояние всегда считается до ребра целиком.
+        """
+        start, end = batch.coords, batch.coords[self._following]
+        lengths = np.hypot(*(end - start).T)
+        piece = 0.25*np.median(lengths) if len(lengths) else 0.0
+        n_pieces = np.ceil(lengths / piece).astype(np.int64) if piece > 0 else np.ones(len(lengths), dtype=np.int64)
+        edges, part = _ranges(np.zeros(len(lengths), dtype=np.int64), np.maximum(n_pieces, 1))
+        fractions = np.column_stack((part, part + 1)) / np.maximum(n_pieces, 1)[edges, None]
+        a = start[edges] + fractions[:, :1]*(end[edges] - start[edges])
+        b = start[edges] + fractions[:, 1:]*(end[edges] - start[edges])
+        return edges, np.hstack((np.minimum(a, b), np.maximum(a, b)))
+
+    def _build(self, items: np.ndarray, boxes: np.ndarray):
+        """Упорядочивает элементы по уровням дерева и вычисляет прямоугольники узлов."""
+        n = self._n = len(items)
+        # листья содержат от leaf_size до 2*leaf_size элементов (меньше – только если элементов мало)
+        self._depth = max(0, math.floor(math.log2(n / self.leaf_size))) if n else 0
+        # центры хранятся в текущем порядке элементов: перестановка уровня почти локальна (внутри узлов)
+        xs, ys = 0.5*(boxes[:, 0] + boxes[:, 2]), 0.5*(boxes[:, 1] + boxes[:, 3])
+        order = np.arange(n)
+        for depth in range(self._depth):
+            bounds = self._bounds(depth)
+            nodes = np.repeat(np.arange(len(bounds) - 1), np.diff(bounds))
+            x_low, y_low = np.minimum.reduceat(xs, bounds[:-1]), np.minimum.reduceat(ys, bounds[:-1])
+            x_width = np.maximum.reduceat(xs, bounds[:-1]) - x_low
+            y_width = np.maximum.reduceat(ys, bounds[:-1]) - y_low
+            along_x = x_width >= y_width
+            low, width = np.where(along_x, x_low, y_low), np.where(along_x, x_width, y_width)
+            # номер узла плюс координата, нормированная внутри узла в [0, 0.5], – один ключ сортировки
+            keys = np.where(along_x[nodes], xs, ys) - low[nodes]
+            permutation = np.argsort(nodes + 0.5*keys / np.where(width > 0, width, 1)[nodes])
+            order, xs, ys = order[permutation], xs[permutation], ys[permutation]
+
+        self._items = items[order]
+        # прямоугольники самих элементов нужны для отсечения внутри листа (у вершин он совпадает с точкой)
+        boxes = boxes[order]
+        self._item_boxes = boxes if self.kind != 'vertex' else None
+        leaf_bounds = self._bounds(self._depth)
+        level = np.column_stack((np.minimum.reduceat(boxes[:, 0], leaf_bounds[:-1]),
+                                 np.minimum.reduceat(boxes[:, 1], leaf_bounds[:-1]),
+                                 np.maximum.reduceat(boxes[:, 2], leaf_bounds[:-1]),
+                                 np.maximum.reduceat(boxes[:, 3], leaf_bounds[:-1]))) if n else np.empty((1, 4))
+        self._boxes = [level]
+        for _ in range(self._depth):
+            children = self._boxes[0]
+            self._boxes.insert(0, np.column_stack((np.minimum(children[0::2, :2], children[1::2, :2]),
+                                                   np.maximum(children[0::2, 2:], children[1::2, 2:]))))
+
+    def _bounds(self, depth: int) -> np.ndarray:
+        """Границы диапазонов элементов узлов уровня depth: узел j – элементы [bounds[j], bounds[j+1])."""
+        return np.arange(2**depth + 1)*self._n // 2**depth
+
+    def _distances(self, points: np.ndarray, items: np.ndarray) -> np.ndarray:
+        """Точные расстояния от точек до элементов попарно."""
+        coords = self.batch.coords
+        if self.kind == 'vertex':
+            return np.hypot(*(points - coords[items]).T)
+        if self.kind == 'edge':
+            return _segment_distances(points, coords[items], coords[self._following[items]])
+
+        # многоугольник: минимум по рёбрам, 0 для точки внутри (правило чет-нечет по лучу вправо)
+        pairs, edges = _ranges(self.batch.offsets[items], self.batch.offsets[items + 1])
+        p, start, end = points[pairs], coords[edges], coords[self._following[edges]]
+        # у каждого элемента-многоугольника есть рёбра (пустые исключены), и пары идут подряд
+        first_edge = np.searchsorted(pairs, np.arange(len(items)))
+        distances = np.minimum.reduceat(_segment_distances(p, start, end), first_edge) if len(items) else np.empty(0)
+        crosses = (start[:, 1] > p[:, 1]) != (end[:, 1] > p[:, 1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = start[:, 0] + (p[:, 1] - start[:, 1])*(end[:, 0] - start[:, 0])/(end[:, 1] - start[:, 1])
+        inside = np.bincount(pairs[crosses & (p[:, 0] < x)], minlength=len(items)) % 2 == 1
+        distances[inside] = 0.0
+        return distances
+
+    def _candidates(self, points: np.ndarray, queries: np.ndarray, nodes: np.ndarray, depth: int,
+                    bound: np.ndarray):
+        """
+        Расстояния от точек queries до элементов узлов nodes уровня depth (пары выровнены). Элементы,
+        прямоугольник которых дальше bound точки, отбрасываются до вычисления точного расстояния.
+        """
+        bounds = self._bounds(depth)
+        rows, positions = _ranges(bounds[nodes], bounds[nodes + 1])
+        if self._item_boxes is not None:
+            keep = _box_distances(points[queries[rows]], self._item_boxes[positions]) <= bound[queries[rows]]
+            rows, positions = rows[keep], positions[keep]
+        return queries[rows], positions, self._distances(points[queries[rows]], self._items[positions])
+
+    def _traverse(self, points: np.ndarray, queries: np.ndarray, bound: np.ndarray,
+                  skip: np.ndarray | None = None, skip_depth: int = 0) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """
+        Обход дерева в глубину блоками пар (точка, узел): остаются пары, у которых расстояние до
+        прямоугольника узла не больше bound точки. bound читается заново на каждом шаге, поэтому
+        границы, уточненные по уже выданным листьям, сразу отсекают оставшиеся узлы. Пары с узлом
+        skip[точка] уровня skip_depth отбрасываются вместе с поддеревом (его элементы уже учтены).
+
+        Возвращает:
+            Итератор по блокам пар (номера точек, номера листьев) не длиннее self._pair_limit.
+        """
+        stack = [(0, queries, np.zeros(len(queries), dtype=np.int64))]
+        while stack:
+            depth, queries, nodes = stack.pop()
+            # соседние записи того же уровня объединяются, чтобы блоки не дробились
+            while stack and stack[-1][0] == depth and len(queries) + len(stack[-1][1]) <= self._pair_limit:
+                _, more_queries, more_nodes = stack.pop()
+                queries, nodes = np.concatenate((queries, more_queries)), np.concatenate((nodes, more_nodes))
+            keep = _box_distances(points[queries], self._boxes[depth][nodes]) <= bound[queries]
+            if skip is not None and depth == skip_depth:
+                keep &= nodes != skip[queries]
+            queries, nodes = queries[keep], nodes[keep]
+            if not len(queries):
+                continue
+            if depth == self._depth:
+                for start in range(0, len(queries), self._pair_limit):
+                    yield queries[start:start + self._pair_limit], nodes[start:start + self._pair_limit]
+                continue
+            # дальний потомок кладется в стек раньше ближнего: ближние листья уточняют границу первыми
+            boxes, left, right = self._boxes[depth + 1], 2*nodes, 2*nodes + 1
+            right_first = _box_distances(points[queries], boxes[right]) < _box_distances(points[queries], boxes[left])
+            for children in (np.where(right_first, left, right), np.where(right_first, right, left)):
+                for start in range(0, len(queries), self._pair_limit):
+                    stack.append((depth + 1, queries[start:start + self._pair_limit], children[start:start + self._pair_limit]))
+
+    def query(self, points, k: int = 1) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        k ближайших элементов к каждой точке.
+
+        Аргументы:
+            points: Точка (x, y) или массив точек размера (n_points, 2).
+            k: Количество ближайших элементов.
+
+        Возвращает:
+            Массивы (расстояния, номера многоугольников, номера элементов) размера (n_points, k),
+            по возрастанию расстояния, при равенстве – номера элемента. Если элементов меньше k,
+            недостающие позиции заполняются расстоянием inf и номером -1.
+
+        Исключения:
+            ValueError: Если k < 1.
+        """
+        if k < 1:
+            raise ValueError('k must be positive')
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        distances = np.full((len(points), k), np.inf)
+        items = np.full((len(points), k), -1, dtype=np.int64)
+        if len(self._items):
+            for start in range(0, len(points), _QUERY_BLOCK):
+                block = slice(start, start + _QUERY_BLOCK)
+                distances[block], items[block] = self._query_block(points[block], k)
+        # номер -1 указывает на добавленный в конец -1
+        return distances, np.append(self._polygon_of, -1)[items], items
+
+    def _query_block(self, points: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        n = len(points)
+        queries = np.arange(n)
+        # уровень, узлы которого содержат не меньше k элементов (если элементов вообще не меньше k)
+        first = self._depth
+        while first and self._n // 2**first < k:
+            first -= 1
+
+        # жадный спуск к ближайшему узлу уровня first – его k-е расстояние служит начальной границей
+        nodes = np.zeros(n, dtype=np.int64)
+        for depth in range(1, first + 1):
+            left, right = 2*nodes, 2*nodes + 1
+            boxes = self._boxes[depth]
+            nodes = np.where(_box_distances(points, boxes[right]) < _box_distances(points, boxes[left]), right, left)
+        best_d, best_i = self._seed(points, nodes, first, k)
+
+        # полный обход без уже учтенного узла; граница – представление best_d и уточняется по ходу
+        for queries, leaves in self._traverse(points, queries, best_d[:, -1], skip=nodes, skip_depth=first):
+            self._merge(best_d, best_i, *self._candidates(points, queries, leaves, self._depth, best_d[:, -1]))
+        return best_d, best_i
+
+    def _seed(self, points: np.ndarray, nodes: np.ndarray, depth: int, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Начальные k лучших каждой точки среди элементов ее узла nodes[точка] уровня depth. Узлы одного
+        уровня почти равны по размеру, поэтому кандидаты укладываются в матрицу (точка, элемент узла),
+        и выбор идет сортировкой строк, а не общей сортировкой всех пар, как в _merge.
+        """
+        bounds = self._bounds(depth)
+        starts, counts = bounds[nodes], bounds[nodes + 1] - bounds[nodes]
+        width = int(counts.max())
+        columns = np.arange(width)
+        valid = columns < counts[:, None]
+        items = self._items[np.minimum(starts[:, None] + columns, self._n - 1)]
+        distances = self._distances(np.repeat(points, width, axis=0), items.ravel()).reshape(items.shape)
+        items[~valid] = np.iinfo(np.int64).max
+
+        # сначала по номеру элемента, затем устойчиво по расстоянию – равные расстояния упорядочены по номеру
+        order = np.argsort(items, axis=1)
+        items, distances = np.take_along_axis(items, order, 1), np.take_along_axis(distances, order, 1)
+        # ребро, разбитое на куски, может встретиться в узле несколько раз
+        distances[:, 1:][items[:, 1:] == items[:, :-1]] = np.inf
+        distances[~np.take_along_axis(valid, order, 1)] = np.inf
+        order = np.argsort(distances, axis=1, kind='stable')[:, :k]
+        best_d, best_i = np.take_along_axis(distances, order, 1), np.take_along_axis(items, order, 1)
+        best_i[np.isinf(best_d)] = -1
+        if width < k:
+            best_d = np.pad(best_d, ((0, 0), (0, k - width)), constant_values=np.inf)
+            best_i = np.pad(best_i, ((0, 0), (0, k - width)), constant_values=-1)
+        return best_d, best_i
+
+    def _merge(self, best_d: np.ndarray, best_i: np.ndarray, queries: np.ndarray, positions: np.ndarray,
+               distances: np.ndarray):
+        """Объединяет текущие k лучших каждой точки с кандидатами (queries, positions, distances)."""
+        # кандидаты дальше текущего k-го расстояния точки заведомо не войдут в ответ
+        keep = distances <= best_d[queries, -1]
+        queries, positions, distances = queries[keep], positions[keep], distances[keep]
+        if not len(queries):
+            return
+        k = best_d.shape[1]
+        touched = np.unique(queries)
+        found = best_i[touched].ravel() >= 0
+        q = np.concatenate((np.repeat(touched, k)[found], queries))
+        d = np.concatenate((best_d[touched].ravel()[found], distances))
+        i = np.concatenate((best_i[touched].ravel()[found], self._items[positions]))
+        order = np.lexsort((i, d, q))
+        q, d, i = q[order], d[order], i[order]
+        # ребро, разбитое на куски, может встретиться несколько раз – с одним и тем же расстоянием
+        unique = np.concatenate(([True], (q[1:] != q[:-1]) | (i[1:] != i[:-1])))
+        q, d, i = q[unique], d[unique], i[unique]
+        best_d[touched], best_i[touched] = np.inf, -1
+        group_start = np.searchsorted(q, q, side='left')
+        rank = np.arange(len(q)) - group_start
+        keep = rank < k
+        best_d[q[keep], rank[keep]] = d[keep]
+        best_i[q[keep], rank[keep]] = i[keep]
+
+    def query_radius(self, points, radius: float) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Все элементы на расстоянии не больше radius от каждой точки.
+
+        Аргументы:
+            points: Точка (x, y) или массив точек размера (n_points, 2).
+            radius: Радиус поиска.
+
+        Возвращает:
+            Массивы одинаковой длины (номер точки, расстояние, номер многоугольника, номер элемента),
+            упорядоченные по номеру точки, затем по расстоянию и номеру элемента.
+
+        Исключения:
+            ValueError: Если radius отрицателен.
+        """
+        if not radius >= 0:
+            raise ValueError('radius must be non-negative')
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        parts = []
+        if len(self._items):
+            for start in range(0, len(points), _QUERY_BLOCK):
+                block = points[start:start + _QUERY_BLOCK]
+                bound = np.full(len(block), float(radius))
+                for queries, leaves in self._traverse(block, np.arange(len(block)), bound):
+                    queries, positions, distances = self._candidates(block, queries, leaves, self._depth, bound)
+                    keep = distances <= radius
+                    parts.append((queries[keep] + start, distances[keep], self._items[positions[keep]]))
+
+        queries, distances, items = (np.concatenate(column) for column in zip(*parts)) if parts else \
+            (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=np.int64))
+        order = np.lexsort((items, distances, queries))
+        queries, distances, items = queries[order], distances[order], items[order]
+        unique = np.concatenate(([True], (queries[1:] != queries[:-1]) | (items[1:] != items[:-1])))[:len(items)]
+        queries, distances, items = queries[unique], distances[unique], items[unique]
+        return queries, distances, self._polygon_of[items], items
+
+    def closest_pair(self) -> tuple[float, int, int, int, int]:
+        """
+        Ближайшая пара элементов разных многоугольников (самосоединение индекса).
+
+        Обход пар узлов дерева в глубину: пара отбрасывается, если расстояние между прямоугольниками
+        узлов не меньше лучшего найденного расстояния или все элементы обоих узлов принадлежат
+        одному многоугольнику. Начальная граница – пары соседних листьев, поэтому до листьев доходят
+        лишь пары узлов, лежащие ближе найденной пары, – O(N log N) для данных без сильных перекрытий.
+
+        Возвращает:
+            Кортеж (расстояние, номер многоугольника i, номер многоугольника j, элемент i, элемент j), i < j;
+            при равных расстояниях – одна из ближайших пар. Если элементы есть меньше чем у двух
+            многоугольников – (inf, -1, -1, -1, -1).
+
+        Исключения:
+            ValueError: Для индекса многоугольников (kind='polygon').
+        """
+        if self.kind == 'polygon':
+            raise ValueError("closest_pair is defined for 'vertex' and 'edge' indexes")
+        best = (math.inf, -1, -1, -1, -1)
+        if not self._n:
+            return best
+
+        # наименьший и наибольший номер многоугольника в каждом узле каждого уровня
+        polygons = self._polygon_of[self._items]
+        leaf_bounds = self._bounds(self._depth)
+        low, high = [np.minimum.reduceat(polygons, leaf_bounds[:-1])], [np.maximum.reduceat(polygons, leaf_bounds[:-1])]
+        for _ in range(self._depth):
+            low.insert(0, np.minimum(low[0][0::2], low[0][1::2]))
+            high.insert(0, np.maximum(high[0][0::2], high[0][1::2]))
+
+        # пар листьев за раз – так, чтобы пар элементов было не больше _PAIR_BLOCK
+        limit = max(1, _PAIR_BLOCK // (2*self.leaf_size)**2)
+        leaves = np.arange(2**self._depth)
+        first, second = np.concatenate((leaves, leaves[:-1])), np.concatenate((leaves, leaves[1:]))
+        for start in range(0, len(first), limit):
+            best = self._leaf_pairs(first[start:start + limit], second[start:start + limit], polygons, best)
+
+        # пары узлов (a, b) с a <= b: узел с самим собой дает три пары потомков, разные узлы – четыре
+        stack = [(0, np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64))]
+        while stack:
+            depth, a, b = stack.pop()
+            while stack and stack[-1][0] == depth and len(a) + len(stack[-1][1]) <= limit:
+                _, more_a, more_b = stack.pop()
+                a, b = np.concatenate((a, more_a)), np.concatenate((b, more_b))
+            boxes = self._boxes[depth]
+            gaps = _box_pair_distances(boxes[a], boxes[b])
+            keep = (gaps < best[0]) & ~((low[depth][a] == high[depth][b]) & (high[depth][a] == low[depth][b]))
+            if depth == self._depth:
+                # пары соседних листьев уже учтены начальной границей
+                keep &= b - a > 1
+            a, b, gaps = a[keep], b[keep], gaps[keep]
+            if not len(a):
+                continue
+            if depth == self._depth:
+                order = np.argsort(gaps, kind='stable')
+                for start in range(0, len(a), limit):
+                    chunk = order[start:start + limit]
+                    chunk = chunk[gaps[chunk] < best[0]]
+                    best = self._leaf_pairs(a[chunk], b[chunk], polygons, best)
+                continue
+            same = a == b
+            a_same, a_other, b_other = 2*a[same], 2*a[~same], 2*b[~same]
+            a = np.concatenate((a_same, a_same + 1, a_same, a_other, a_other, a_other + 1, a_other + 1))
+            b = np.concatenate((a_same, a_same + 1, a_same + 1, b_other, b_other + 1, b_other, b_other + 1))
+            # ближние пары кладутся в стек последними и обходятся первыми
+            children = self._boxes[depth + 1]
+            order = np.argsort(-_box_pair_distances(children[a], children[b]), kind='stable')
+            for start in range(0, len(order), limit):
+                stack.append((depth + 1, a[order[start:start + limit]], b[order[start:start + limit]]))
+        return best
+
+    def _leaf_pairs(self, a: np.ndarray, b: np.ndarray, polygons: np.ndarray,
+                    best: tuple[float, int, int, int, int]) -> tuple[float, int, int, int, int]:
+        """Уточняет best по всем парам элементов разных многоугольников в парах листьев (a, b), a <= b."""
+        bounds = self._bounds(self._depth)
+        rows, first = _ranges(bounds[a], bounds[a + 1])
+        pairs, second = _ranges(bounds[b[rows]], bounds[b[rows] + 1])
+        rows, first = rows[pairs], first[pairs]
+        # в листе с самим собой каждая пара берется один раз
+        keep = ((second > first) | (a[rows] != b[rows])) & (polygons[first] != polygons[second])
+        if self._item_boxes is not None:
+            keep[keep] = _box_pair_distances(self._item_boxes[first[keep]], self._item_boxes[second[keep]]) < best[0]
+        first, second = self._items[first[keep]], self._items[second[keep]]
+        if not len(first):
+            return best
+
+        coords = self.batch.coords
+        if self.kind == 'vertex':
+            distances = np.hypot(*(coords[first] - coords[second]).T)
+        else:
+            distances = _segment_pair_distances(coords[first], coords[self._following[first]],
+                                                coords[second], coords[self._following[second]])
+        m = int(np.argmin(distances))
+        if distances[m] >= best[0]:
+            return best
+        (i, x), (j, y) = sorted(((int(self._polygon_of[first[m]]), int(first[m])),
+                                 (int(self._polygon_of[second[m]]), int(second[m]))))
+        return float(distances[m]), i, j, x, y
+
+    def __len__(self) -> int:
+        """Количество элементов в индексе."""
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f'NearestIndex(kind={self.kind!r}, n_items={len(self)}, leaf_size={self.leaf_size})'
@@ -0,0 +1,123 @@
+import collections
+import concurrent.futures
+import functools
+import itertools
+import os
+from typing import Callable, Iterable, Iterator
+
+from polyseq.aggregates import (agr_area, agr_perimeter, agr_max_side, agr_min_area, agr_origin_nearest,
+                                agr_convex_hull, AreaAccumulator, PerimeterAccumulator, MaxSideAccumulator,
+                                MinAreaAccumulator, OriginNearestAccumulator, ConvexHullAccumulator, _Accumulator)
+
+# Частичные состояния, которыми воркеры обмениваются вместо итоговых значений агрегатов.
+_ACCUMULATOR_OF = {
+    agr_area: AreaAccumulator,
+    agr_perimeter: PerimeterAccumulator,
+    agr_max_side: MaxSideAccumulator,
+    agr_min_area: MinAreaAccumulator,
+    agr_origin_nearest: OriginNearestAccumulator,
+    agr_convex_hull: ConvexHullAccumulator,
+}
+
+_STAGES = {'map': map, 'filter': filter}
+
+
+def _run_chunk(chunk, stages, aggregate):
+    """Выполняется в процессе-воркере: прогоняет блок многоугольников через стадии и агрегирует его."""
+    polys = chunk
+    for kind, func in stages:
+        polys = _STAGES[kind](func, polys)
+    if aggregate is None:
+        return tuple(polys)
+    if isinstance(aggregate, type) and issubclass(aggregate, _Accumulator):
+        return aggregate().update_batch(polys)
+    polys = tuple(polys)
+    # пустой блок (например, всё отфильтровано) не участвует в объединении
+    return aggregate(polys) if polys else None
+
+
+def _chunk_results(polygon_seq, stages, aggregate, n_workers, chunk_size, ordered) -> Iterator:
+    """Раздает блоки пулу процессов, держа в работе не более 2*n_workers блоков одновременно."""
+    it = iter(polygon_seq)
+    chunks = iter(lambda: tuple(itertools.islice(it, chunk_size)), ())
+    max_pending = 2*n_workers
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+        submit = lambda chunk: executor.submit(_run_chunk, chunk, stages, aggregate)
+        if ordered:
+            pending = collections.deque(map(submit, itertools.islice(chunks, max_pending)))
+            while pending:
+                result = pending.popleft().result()
+                pending.extend(map(submit, itertools.islice(chunks, 1)))
+                yield result
+        else:
+            pending = set(map(submit, itertools.islice(chunks, max_pending)))
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                pending |= set(map(submit, itertools.islice(chunks, len(done))))
+                yield from (future.result() for future in done)
+
+
+def par_pipeline(polygon_seq: Iterable[tuple[tuple[float, float], ...]],
+                 stages: Iterable[tuple[str, Callable]] = (),
+                 aggregate: Callable | tuple[Callable, Callable] | None = None,
+                 n_workers: int | None = None,
+                 chunk_size: int = 1000,
+                 ordered: bool = True):
+    """
+    Параллельное выполнение цепочки map/filter над последовательностью многоугольников
+    в пуле процессов с необязательной финальной агрегацией.
+
+    Последовательность режется на блоки по chunk_size многоугольников; каждый блок проходит
+    все стадии в отдельном процессе. Одновременно в работе находится не более 2*n_workers блоков,
+    поэтому источник читается лениво и может быть сколь угодно длинным.
+    Функции стадий и агрегата передаются в другие процессы, поэтому должны сериализоваться pickle:
+    функции уровня модуля, functools.partial, объекты Transform (но не lambda).
+
+    Аргументы:
+        polygon_seq: Итерируемая последовательность многоугольников.
+        stages: Стадии вида ('map', func) или ('filter', predicate), применяемые по порядку, например
+                [('map', partial(tr_rotate, angle=60)), ('filter', flt_convex_polygon)].
+        aggregate: Финальный агрегат: одна из функций agr_area, agr_perimeter, agr_max_side,
+                   agr_min_area, agr_origin_nearest, класс накопителя из polyseq.aggregates
+                   (например, AreaAccumulator) или пара (агрегат блока, функция объединения списка
+                   частичных результатов). Для функций agr_* воркеры возвращают частичные состояния
+                   (накопители), которые объединяются через merge. По умолчанию None – без агрегации.
+        n_workers: Количество процессов. По умолчанию os.cpu_count().
+        chunk_size: Количество многоугольников в блоке. По умолчанию 1000.
+        ordered: Сохранять ли исходный порядок многоугольников на выходе. По умолчанию True.
+
+    Возвращает:
+        Если aggregate is None – ленивый итератор по многоугольникам после всех стадий;
+        иначе – значение агрегата по всей последовательности.
+
+    Исключения:
+        ValueError: Если стадия имеет неизвестный тип, агрегат не поддерживает объединение
+                    или chunk_size/n_workers не положительны.
+    """
+    stages = tuple(stages)
+    for kind, _ in stages:
+        if kind not in _STAGES:
+            raise ValueError(f'unknown stage kind: {kind!r} (expected "map" or "filter")')
+
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer')
+
+    n_workers = (os.cpu_count() or 1) if n_workers is None else n_workers
+    if n_workers < 1:
+        raise ValueError('n_workers must be a positive integer')
+
+    merge = None
+    if isinstance(aggregate, tuple):
+        aggregate, merge = aggregate
+    elif aggregate is not None:
+        aggregate = _ACCUMULATOR_OF.get(aggregate, aggregate)
+        if not (isinstance(aggregate, type) and issubclass(aggregate, _Accumulator)):
+            raise ValueError('aggregate must be one of the polyseq.aggregates functions or accumulators '
+                             'or an (aggregate, merge) pair')
+        merge = lambda states: functools.reduce(lambda acc, state: acc.merge(state), states, aggregate()).result()
+
+    results = _chunk_results(polygon_seq, stages, aggregate, n_workers, chunk_size, ordered)
+    if aggregate is None:
+        return itertools.chain.from_iterable(results)
+    return merge([result for result in results if result is not None])
@@ -0,0 +1,102 @@
+import math
+from typing import Iterable, Iterator
+
+
+class Polygon:
+    """
+    Неизменяемый многоугольник с лениво вычисляемыми и кешируемыми характеристиками.
+
+    Ведет себя как привычный кортеж вершин: поддерживает индексацию, итерацию, len() и in,
+    равен кортежу с теми же вершинами. Площадь, периметр, длины сторон, ограничивающий
+    прямоугольник и выпуклость вычисляются при первом обращении и затем переиспользуются;
+    функции polyseq.filters и polyseq.aggregates, получив Polygon, берут эти значения из кеша.
+
+    Аргументы:
+        vertices: Вершины многоугольника – последовательность пар координат (float, float).
+    """
+    __slots__ = ('_vertices', '_area', '_sides', '_perimeter', '_bbox', '_is_convex')
+
+    def __init__(self, vertices: Iterable[tuple[float, float]]):
+        object.__setattr__(self, '_vertices', tuple(map(tuple, vertices)))
+        for name in self.__slots__[1:]:
+            object.__setattr__(self, name, None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Polygon is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Polygon is immutable')
+
+    def __reduce__(self):
+        return Polygon, (self._vertices,)
+
+    @property
+    def vertices(self) -> tuple[tuple[float, float], ...]:
+        """Вершины многоугольника в виде кортежа."""
+        return self._vertices
+
+    @property
+    def area(self) -> float:
+        """Площадь по формуле Гаусса (алгоритм шнурования)."""
+        if self._area is None:
+            poly, n = self._vertices, len(self._vertices)
+            object.__setattr__(self, '_area', 0.5*abs(sum(
+                (poly[i][0]*poly[(i+1) % n][1] - poly[(i+1) % n][0]*poly[i][1])
+                for i in range(n))))
+        return self._area
+
+    @property
+    def sides(self) -> tuple[float, ...]:
+        """Длины рёбер; i-е ребро соединяет вершины i и i+1."""
+        if self._sides is None:
+            poly, n = self._vertices, len(self._vertices)
+            object.__setattr__(self, '_sides', tuple(math.dist(poly[i], poly[(i + 1) % n]) for i in range(n)))
+        return self._sides
+
+    @property
+    def perimeter(self) -> float:
+        """Периметр."""
+        if self._perimeter is None:
+            object.__setattr__(self, '_perimeter', sum(self.sides))
+        return self._perimeter
+
+    @property
+    def bbox(self) -> tuple[float, float, float, float]:
+        """Ограничивающий прямоугольник (xmin, ymin, xmax, ymax)."""
+        if self._bbox is None:
+            xs, ys = zip(*self._vertices)
+            object.__setattr__(self, '_bbox', (min(xs), min(ys), max(xs), max(ys)))
+        return self._bbox
+
+    @property
+    def is_convex(self) -> bool:
+        """Выпуклость (см. polyseq.filters.flt_convex_polygon)."""
+        if self._is_convex is None:
+            from polyseq.filters import _is_convex
+            object.__setattr__(self, '_is_convex', _is_convex(self._vertices))
+        return self._is_convex
+
+    def __len__(self) -> int:
+        return len(self._vertices)
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        return iter(self._vertices)
+
+    def __getitem__(self, item):
+        return self._vertices[item]
+
+    def __contains__(self, point) -> bool:
+        return point in self._vertices
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Polygon):
+            return self._vertices == other._vertices
+        if isinstance(other, tuple):
+            return self._vertices == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._vertices)
+
+    def __repr__(self) -> str:
+        return f'Polygon({self._vertices})'
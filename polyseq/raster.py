@@ -0,0 +1,264 @@
+"""
+Растеризация последовательностей многоугольников прямо в массив numpy – без артистов matplotlib.
+
+Пиксель считается покрытым многоугольником, если его центр лежит внутри многоугольника.
+Многоугольники заливаются построчно (scanline, см. PolygonBatch.scanline_spans): для каждой
+строки пикселей находятся отрезки пересечения с многоугольниками, и их вклад добавляется
+в строку разностным массивом, поэтому стоимость не зависит от площади многоугольников.
+Изображение делится на горизонтальные полосы (тайлы), которые можно заливать в пуле процессов.
+
+Модуль не зависит от matplotlib: она нужна только для цветовой карты в write_png.
+"""
+import concurrent.futures
+import itertools
+import math
+import os
+import struct
+import zlib
+from typing import Iterable
+
+import numpy as np
+
+from polyseq.batch import PolygonBatch
+
+_SPAN_BLOCK = 1 << 20  # максимальное количество отрезков строк, обрабатываемых за раз
+_STREAM_CHUNK = 1 << 17  # по сколько многоугольников упаковывается поток при заданном extent
+
+AGGREGATIONS = ('count', 'sum', 'mean')
+
+
+def _fill(batch: PolygonBatch, values: np.ndarray | None, extent: tuple[float, float, float, float],
+          width: int, height: int, row0: int, row1: int) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Заливает строки [row0, row1) изображения (строка 0 – верхняя).
+
+    Возвращает:
+        Количество покрывающих многоугольников и (если заданы values) сумму их значений
+        для каждого пикселя полосы – массивы размера (row1 - row0, width).
+    """
+    xmin, ymin, xmax, ymax = extent
+    dx, dy = (xmax - xmin) / width, (ymax - ymin) / height
+    n_rows = row1 - row0
+    counts = np.zeros((n_rows, width + 1), dtype=np.int64)
+    sums = None if values is None else np.zeros((n_rows, width + 1), dtype=np.float64)
+    if not len(batch) or not n_rows:
+        return counts[:, :-1], None if sums is None else sums[:, :-1]
+
+    # ординаты центров строк по возрастанию: снизу вверх
+    image_rows = np.arange(row1 - 1, row0 - 1, -1)
+    ys = ymax - (image_rows + 0.5)*dy
+    bboxes = batch.bboxes()
+    # учитывается только часть высоты многоугольника внутри полосы: за ее пределами отрезков нет
+    heights = np.minimum(bboxes[:, 3], ys[-1] + 0.5*dy) - np.maximum(bboxes[:, 1], ys[0] - 0.5*dy)
+    heights = np.maximum(heights[np.isfinite(heights)], 0)  # пустые многоугольники
+    n_blocks = min(n_rows, max(1, math.ceil(2*(heights.sum() / dy + len(batch)) / _SPAN_BLOCK)))
+
+    for block in np.array_split(np.arange(n_rows), n_blocks):
+        if not len(block):
+            continue
+        # в блок строк передаются только задевающие его многоугольники
+        ids = np.flatnonzero((bboxes[:, 3] >= ys[block[0]]) & (bboxes[:, 1] <= ys[block[-1]]))
+        rows, polygons, left, right = batch.take(ids).scanline_spans(ys[block])
+        polygons = ids[polygons]
+        k0 = np.maximum(np.ceil((left - xmin) / dx - 0.5), 0).astype(np.int64)
+        k1 = np.minimum(np.floor((right - xmin) / dx - 0.5), width - 1).astype(np.int64)
+        valid = k1 >= k0
+        rows, polygons, k0, k1 = image_rows[block][rows[valid]] - row0, polygons[valid], k0[valid], k1[valid]
+        # разностный массив: +1 в первом покрытом пикселе отрезка, -1 – после последнего
+        index = np.concatenate((rows*(width + 1) + k0, rows*(width + 1) + k1 + 1))
+        sign = np.concatenate((np.ones(len(k0)), -np.ones(len(k1))))
+        counts += np.bincount(index, weights=sign, minlength=counts.size).astype(np.int64).reshape(counts.shape)
+        if sums is not None:
+            weights = sign*np.concatenate((values[polygons], values[polygons]))
+            sums += np.bincount(index, weights=weights, minlength=sums.size).reshape(sums.shape)
+
+    counts = np.cumsum(counts, axis=1)[:, :-1]
+    return counts, None if sums is None else np.cumsum(sums, axis=1)[:, :-1]
+
+
+def _fill_tile(args):
+    """Выполняется в процессе-воркере: заливает одну полосу только многоугольниками, задевающими ее."""
+    batch, values, extent, width, height, row0, row1 = args
+    return row0, row1, _fill(batch, values, extent, width, height, row0, row1)
+
+
+def _tiles(batch: PolygonBatch, values, extent, width: int, height: int, n_tiles: int):
+    """Аргументы _fill_tile для полос изображения; каждой полосе передаются только ее многоугольники."""
+    xmin, ymin, xmax, ymax = extent
+    dy = (ymax - ymin) / height
+    bboxes = batch.bboxes()
+    bounds = np.linspace(0, height, n_tiles + 1).astype(np.int64)
+    for row0, row1 in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        if row0 == row1:
+            continue
+        top, bottom = ymax - row0*dy, ymax - row1*dy
+        ids = np.flatnonzero((bboxes[:, 3] >= bottom) & (bboxes[:, 1] <= top)
+                             & (bboxes[:, 2] >= xmin) & (bboxes[:, 0] <= xmax))
+        yield batch.take(ids), None if values is None else values[ids], extent, width, height, row0, row1
+
+
+def rasterize(polygon_seq: Iterable[tuple[tuple[float, float], ...]], width: int, height: int,
+              extent: tuple[float, float, float, float] | None = None, agg: str = 'count',
+              values=None, n_workers: int | None = 1, n_tiles: int | None = None) -> np.ndarray:
+    """
+    Растеризует конечную последовательность многоугольников в изображение width x height.
+
+    Аргументы:
+        polygon_seq: Конечная последовательность многоугольников (любой генератор polyseq,
+                     PolygonBatch, PolygonFile). Если задан extent, последовательность упаковывается
+                     и заливается блоками, поэтому память не зависит от ее длины.
+        width: Ширина изображения в пикселях.
+        height: Высота изображения в пикселях.
+        extent: Область плоскости (xmin, ymin, xmax, ymax), отображаемая в изображение.
+                По умолчанию – общий ограничивающий прямоугольник (последовательность упаковывается целиком).
+        agg: Значение пикселя: 'count' – количество покрывающих многоугольников,
+             'sum' – сумма их значений values, 'mean' – среднее (NaN для непокрытых пикселей).
+        values: Значения многоугольников – последовательность той же длины, что и polygon_seq;
+                обязательны для 'sum' и 'mean'.
+        n_workers: Количество процессов для заливки полос. 1 – в текущем процессе,
+                   None – по количеству процессоров.
+        n_tiles: Количество горизонтальных полос. По умолчанию – 4 на процесс.
+
+    Возвращает:
+        Массив размера (height, width); строка 0 – верх изображения (наибольший y).
+        Для 'count' – int64, иначе float64.
+
+    Исключения:
+        ValueError: Если размеры или extent некорректны, agg неизвестен
+                    или values не заданы для 'sum'/'mean'.
+    """
+    if width < 1 or height < 1:
+        raise ValueError('width and height must be positive')
+    if agg not in AGGREGATIONS:
+        raise ValueError(f'unknown aggregation: {agg!r}, expected one of {", ".join(AGGREGATIONS)}')
+    if agg != 'count' and values is None:
+        raise ValueError(f'values are required for {agg!r} aggregation')
+    n_workers = n_workers or os.cpu_count() or 1
+    n_tiles = n_tiles or (1 if n_workers == 1 else 4*n_workers)
+
+    if extent is None:
+        batch = PolygonBatch.from_polygons(polygon_seq)
+        bboxes = batch.bboxes()
+        bboxes = bboxes[np.isfinite(bboxes[:, 0])]
+        extent = (bboxes[:, 0].min(), bboxes[:, 1].min(), bboxes[:, 2].max(), bboxes[:, 3].max()) \
+            if len(bboxes) else (0.0, 0.0, 1.0, 1.0)
+        chunks = [batch]
+    elif isinstance(polygon_seq, PolygonBatch):
+        chunks = [polygon_seq]
+    else:
+        it = iter(polygon_seq)
+        chunks = iter(lambda: PolygonBatch.from_polygons(itertools.islice(it, _STREAM_CHUNK)), None)
+        chunks = itertools.takewhile(len, chunks)
+
+    xmin, ymin, xmax, ymax = map(float, extent)
+    if xmin == xmax:
+        xmin, xmax = xmin - 0.5, xmax + 0.5
+    if ymin == ymax:
+        ymin, ymax = ymin - 0.5, ymax + 0.5
+    if not (xmin < xmax and ymin < ymax):
+        raise ValueError('extent must be (xmin, ymin, xmax, ymax) with xmin < xmax and ymin < ymax')
+    extent = (xmin, ymin, xmax, ymax)
+
+    values_it = None if values is None else iter(np.asarray(values, dtype=np.float64).reshape(-1))
+    counts = np.zeros((height, width), dtype=np.int64)
+    sums = None if values is None else np.zeros((height, width), dtype=np.float64)
+
+    executor = concurrent.futures.ProcessPoolExecutor(n_workers) if n_workers > 1 else None
+    try:
+        for batch in chunks:
+            chunk_values = None if values_it is None else np.fromiter(values_it, np.float64, count=len(batch))
+            tiles = _tiles(batch, chunk_values, extent, width, height, n_tiles)
+            results = executor.map(_fill_tile, tiles) if executor else map(_fill_tile, tiles)
+            for row0, row1, (tile_counts, tile_sums) in results:
+                counts[row0:row1] += tile_counts
+                if sums is not None:
+                    sums[row0:row1] += tile_sums
+    finally:
+        if executor:
+            executor.shutdown()
+
+    if agg == 'count':
+        return counts
+    if agg == 'sum':
+        return sums
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def to_rgba(image: np.ndarray, cmap: str | None = 'viridis', vmin: float | None = None,
+            vmax: float | None = None, log: bool = False) -> np.ndarray:
+    """
+    Переводит скалярное изображение в 8-битное RGBA.
+
+    Аргументы:
+        image: Массив размера (height, width), например результат rasterize.
+        cmap: Название или объект цветовой карты matplotlib; None – оттенки серого без matplotlib.
+        vmin, vmax: Границы шкалы. По умолчанию – минимум и максимум конечных значений.
+        log: Логарифмическая шкала log(1 + v) – удобна для карт плотности.
+
+    Возвращает:
+        Массив uint8 размера (height, width, 4). Пиксели со значением NaN и нулевые пиксели
+        карты 'count' (значение 0 при log=True) прозрачны.
+    """
+    image = np.asarray(image, dtype=np.float64)
+    transparent = ~np.isfinite(image)
+    if log:
+        transparent |= image <= 0
+        image = np.log1p(np.maximum(image, 0))
+    finite = image[~transparent]
+    lo = (finite.min() if len(finite) else 0.0) if vmin is None else (np.log1p(vmin) if log else vmin)
+    hi = (finite.max() if len(finite) else 1.0) if vmax is None else (np.log1p(vmax) if log else vmax)
+    scaled = np.clip((np.where(transparent, lo, image) - lo) / ((hi - lo) or 1.0), 0.0, 1.0)
+
+    if cmap is None:
+        gray = np.round(scaled*255).astype(np.uint8)
+        rgba = np.stack((gray, gray, gray, np.full_like(gray, 255)), axis=-1)
+    else:
+        import matplotlib.pyplot as plt
+        rgba = np.asarray(plt.get_cmap(cmap)(scaled, bytes=True), dtype=np.uint8)
+    rgba[transparent, 3] = 0
+    return rgba
+
+
+def write_png(path: str | os.PathLike, image: np.ndarray, **kwargs) -> None:
+    """
+    Записывает изображение в файл PNG (8 бит на канал, без внешних зависимостей).
+
+    Аргументы:
+        path: Путь к файлу.
+        image: Либо скалярный массив (height, width) – он переводится в цвет функцией to_rgba
+               с параметрами kwargs, – либо готовый массив uint8 размера (height, width, 3) или (height, width, 4).
+    """
+    image = np.asarray(image)
+    if image.ndim == 2:
+        image = to_rgba(image, **kwargs)
+    if image.ndim != 3 or image.shape[2] not in (3, 4) or image.dtype != np.uint8:
+        raise ValueError('image must be 2-dimensional or an uint8 array of shape (height, width, 3 or 4)')
+
+    height, width, channels = image.shape
+    # каждая строка предваряется байтом фильтра 0 (без фильтрации)
+    raw = np.concatenate((np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)), axis=1)
+    header = struct.pack('>IIBBBBB', width, height, 8, 6 if channels == 4 else 2, 0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_png_chunk(b'IHDR', header))
+        f.write(_png_chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)))
+        f.write(_png_chunk(b'IEND', b''))
+
+
+def render_png(path: str | os.PathLike, polygon_seq: Iterable[tuple[tuple[float, float], ...]],
+               width: int, height: int, log: bool = True, cmap: str | None = 'viridis', **kwargs) -> np.ndarray:
+    """
+    Растеризует последовательность (см. rasterize, параметры kwargs) и записывает карту в PNG.
+    По умолчанию – карта плотности (количество покрывающих многоугольников) в логарифмической шкале.
+
+    Возвращает:
+        Растеризованный массив.
+    """
+    image = rasterize(polygon_seq, width, height, **kwargs)
+    write_png(path, image, cmap=cmap, log=log)
+    return image
@@ -0,0 +1,370 @@
+"""
+Скетчи распределений метрик многоугольников: квантили (KLL) и гистограммы с фиксированными корзинами.
+
+Скетч – накопитель с ограниченной памятью: он не хранит все значения, а дает приближенные
+квантили или распределение с известной погрешностью. Как и накопители из polyseq.aggregates,
+скетч пополняется по одному многоугольнику (update) или пакетом (update_batch – для PolygonBatch
+метрики считаются векторизованно по массиву координат), объединяется со скетчем по другой части
+данных (merge) и сериализуется pickle и в словарь JSON-совместимых значений (to_dict / from_dict).
+
+    sketch = QuantileSketch('side').update_batch(gen_random_polygon_batch(10**6))
+    sketch.quantile(0.99)                       # 99-й перцентиль длины стороны
+    hist = HistogramSketch(np.linspace(0, 300, 31), metric='area').update_batch(batch)
+    hist.counts                                 # количество многоугольников в каждой корзине
+
+Метрики: 'area' и 'perimeter' – одно значение на многоугольник, 'side' – по значению на каждую сторону.
+"""
+import math
+
+import numpy as np
+
+from polyseq.aggregates import _Accumulator, _area, _sides
+from polyseq.batch import PolygonBatch
+from polyseq.generators import RegPolygonSeq
+from polyseq.polygon import Polygon
+
+# Метрика одного многоугольника (кортеж значений) и векторизованная метрика пакета.
+_METRICS = {
+    'area': (lambda poly: (_area(poly),), PolygonBatch.areas),
+    'perimeter': (lambda poly: (poly.perimeter if isinstance(poly, Polygon) else sum(_sides(poly)),),
+                  PolygonBatch.perimeters),
+    'side': (_sides, PolygonBatch.side_lengths),
+}
+
+
+def _plain(value):
+    """Состояние генератора numpy (bit_generator.state) в JSON-совместимом виде: массивы – списки."""
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class _Sketch(_Accumulator):
+    """
+    Общая часть скетчей: метрика, точные минимум и максимум и пополнение лентой RegPolygonSeq –
+    все фигуры ленты одинаковы, поэтому значения базового многоугольника добавляются с весом n_figs.
+    """
+    __slots__ = ('metric', 'min', 'max')
+
+    def __init__(self, metric: str = 'area'):
+        if metric not in _METRICS:
+            raise ValueError(f'unknown metric: {metric!r} (expected one of {", ".join(_METRICS)})')
+        super().__init__()
+        self.metric = metric
+        self.min, self.max = math.inf, -math.inf
+
+    def _metric(self, poly):
+        return _METRICS[self.metric][0](poly)
+
+    def _batch_metric(self, batch: PolygonBatch) -> np.ndarray:
+        return _METRICS[self.metric][1](batch)
+
+    def update_batch(self, polygon_seq) -> '_Sketch':
+        """
+        Учитывает последовательность многоугольников. Для PolygonBatch метрики считаются векторизованно,
+        для конечной ленты RegPolygonSeq – по одному базовому многоугольнику.
+
+        Исключения:
+            ValueError: Если лента бесконечна.
+        """
+        if not isinstance(polygon_seq, RegPolygonSeq):
+            return super().update_batch(polygon_seq)
+        if math.isinf(polygon_seq.n_figs):
+            raise ValueError('an infinite strip cannot be added to a sketch')
+        if polygon_seq.n_figs:
+            self.count += polygon_seq.n_figs
+            self._add_weighted(np.asarray(self._metric(polygon_seq.base_poly), dtype=np.float64),
+                               polygon_seq.n_figs)
+        return self
+
+    def _add(self, values):
+        self._add_values(np.asarray(values, dtype=np.float64))
+
+    def _add_values(self, values: np.ndarray):
+        self._add_weighted(values, 1)
+
+    def _add_weighted(self, values: np.ndarray, weight: int):
+        if len(values):
+            self.min, self.max = min(self.min, float(values.min())), max(self.max, float(values.max()))
+
+    def _flush(self):
+        """Переносит в состояние значения, отложенные в буфере (если скетч буферизует update)."""
+
+    def _merge_state(self, other):
+        self._flush()
+        other._flush()
+        if other.metric != self.metric:
+            raise ValueError(f'cannot merge a {other.metric!r} sketch into a {self.metric!r} sketch')
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+
+    def to_dict(self) -> dict:
+        """Состояние в виде словаря JSON-совместимых значений."""
+        self._flush()
+        return {'aggregate': self.name, 'count': self.count, 'metric': self.metric,
+                'min': self.min if self.count else None, 'max': self.max if self.count else None,
+                'state': self._state()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> '_Sketch':
+        """Восстанавливает состояние, сохраненное to_dict."""
+        if data.get('aggregate') != cls.name:
+            raise ValueError(f'expected a {cls.name!r} state, got {data.get("aggregate")!r}')
+        sketch = cls.__new__(cls)
+        _Sketch.__init__(sketch, data['metric'])
+        sketch.count = data['count']
+        if data['min'] is not None:
+            sketch.min, sketch.max = data['min'], data['max']
+        sketch._set_state(data['state'])
+        return sketch
+
+    def _check_quantile(self, q: float):
+        self._flush()
+        if not 0 <= q <= 1:
+            raise ValueError('q must be between 0 and 1')
+        if self.max < self.min:
+            raise ValueError('quantiles of an empty sketch are undefined')
+
+    def quantiles(self, qs) -> list[float]:
+        """Значения quantile(q) для каждого q из qs."""
+        return [self.quantile(q) for q in qs]
+
+    def result(self) -> dict[float, float]:
+        """Минимум, квартили, 90-й и 99-й перцентили и максимум: {q: значение}."""
+        qs = (0, 0.25, 0.5, 0.75, 0.9, 0.99, 1)
+        return dict(zip(qs, self.quantiles(qs)))
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(metric={self.metric!r}, count={self.count})'
+
+
+class QuantileSketch(_Sketch):
+    """
+    Скетч квантилей KLL (Karnin, Lang, Liberty, 2016) для метрики многоугольников.
+
+    Значения хранятся в ярусах-компакторах: значение яруса h представляет 2**h исходных значений.
+    Переполненный ярус сортируется, и каждое второе значение (четные или нечетные позиции – случайно)
+    переходит на ярус выше, остальные отбрасываются. Емкость яруса h равна ceil(k * (2/3)**(H-1-h)),
+    где H – количество ярусов, поэтому память – O(k) значений при любой длине потока.
+
+    Погрешность – ранговая: для возвращаемого quantile(q) значения x доля значений потока, не
+    превосходящих x, отличается от q не более чем на ε с высокой вероятностью; ε убывает как 1/k.
+    При k = 200 (по умолчанию) на миллионах значений ε на практике не превышает 0.5–1%;
+    rank_error() = 3/k – оценка с запасом. Минимум и максимум (q = 0 и q = 1) точны.
+    Скетчи с разными k объединять можно, погрешность результата определяется меньшим k.
+
+    Аргументы:
+        metric: Метрика: 'area', 'perimeter' или 'side'.
+        k: Параметр точности (емкость верхнего яруса).
+        rng: Источник случайности для выбора позиций при сжатии (seed или numpy.random.Generator).
+             Скетчи с одинаковым seed по одинаковым данным совпадают.
+
+    Исключения:
+        ValueError: Если метрика неизвестна или k < 8.
+    """
+    __slots__ = ('k', '_levels', '_rng', '_buffer')
+    name = 'quantile_sketch'
+
+    def __init__(self, metric: str = 'area', k: int = 200, rng: int | np.random.Generator | None = None):
+        if k < 8:
+            raise ValueError('k must be at least 8')
+        super().__init__(metric)
+        self.k = int(k)
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(rng)
+        self._buffer = []  # значения из update до переноса на нижний ярус
+
+    def _add(self, values):
+        self._buffer.extend(values)
+        if len(self._buffer) >= self.k:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            values, self._buffer = np.array(self._buffer, dtype=np.float64), []
+            self._add_values(values)
+
+    def _capacity(self, h: int) -> int:
+        return max(2, math.ceil(self.k * (2/3)**(len(self._levels) - 1 - h)))
+
+    def _size(self) -> int:
+        return sum(map(len, self._levels))
+
+    def _max_size(self) -> int:
+        return sum(map(self._capacity, range(len(self._levels))))
+
+    def _add_weighted(self, values: np.ndarray, weight: int):
+        super()._add_weighted(values, weight)
+        if not len(values):
+            return
+        # вес раскладывается по двоичным разрядам: значение на ярусе h весит 2**h
+        for h in range(weight.bit_length()):
+            if weight >> h & 1:
+                self._place(h, values)
+        self._compress()
+
+    def _place(self, h: int, values: np.ndarray):
+        while len(self._levels) <= h:
+            self._levels.append(np.empty(0))
+        self._levels[h] = np.concatenate((self._levels[h], values))
+
+    def _compress(self):
+        """Сжимает нижние переполненные ярусы, пока общий размер не уложится в емкость."""
+        while self._size() > self._max_size():
+            for h, level in enumerate(self._levels):
+                if len(level) >= self._capacity(h):
+                    break
+            level = np.sort(level)
+            kept = level[len(level) - len(level) % 2:]  # при нечетной длине наибольшее значение остается
+            promoted = level[self._rng.integers(2):len(level) - len(kept):2]
+            self._levels[h] = kept
+            self._place(h + 1, promoted)
+
+    def _merge_state(self, other):
+        super()._merge_state(other)
+        self.k = min(self.k, other.k)
+        for h, level in enumerate(other._levels):
+            self._place(h, level)
+        self._compress()
+
+    def _state(self):
+        self._flush()
+        return {'k': self.k, 'levels': [level.tolist() for level in self._levels],
+                'rng': _plain(self._rng.bit_generator.state)}
+
+    def _set_state(self, state):
+        self.k = state['k']
+        self._levels = [np.asarray(level, dtype=np.float64) for level in state['levels']] or [np.empty(0)]
+        # генератор продолжает с сохраненного места: восстановленный скетч сжимается так же, как исходный
+        bit_generator = getattr(np.random, state['rng']['bit_generator'])()
+        bit_generator.state = state['rng']
+        self._rng = np.random.Generator(bit_generator)
+        self._buffer = []
+
+    def _weighted(self) -> tuple[np.ndarray, np.ndarray]:
+        """Все хранимые значения по возрастанию и накопленные веса."""
+        self._flush()
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level), 2.0**h) for h, level in enumerate(self._levels)])
+        order = np.argsort(values, kind='stable')
+        return values[order], np.cumsum(weights[order])
+
+    def quantile(self, q: float) -> float:
+        """
+        Приближенный q-квантиль: наименьшее хранимое значение, накопленный вес которого не меньше q
+        от общего. quantile(0) и quantile(1) – точные минимум и максимум.
+
+        Исключения:
+            ValueError: Если q вне [0, 1] или скетч пуст.
+        """
+        self._check_quantile(q)
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        values, cumulative = self._weighted()
+        return float(values[min(np.searchsorted(cumulative, q*cumulative[-1]), len(values) - 1)])
+
+    def rank(self, value: float) -> float:
+        """Приближенная доля значений потока, не превосходящих value."""
+        self._flush()
+        if self.max < self.min:
+            raise ValueError('ranks of an empty sketch are undefined')
+        values, cumulative = self._weighted()
+        position = np.searchsorted(values, value, side='right')
+        return float(cumulative[position - 1] / cumulative[-1]) if position else 0.0
+
+    def rank_error(self) -> float:
+        """Оценка сверху ранговой погрешности ε для текущего k (с вероятностью не менее 99%)."""
+        return 3.0 / self.k
+
+    def __len__(self) -> int:
+        """Количество хранимых значений (ограничено величиной порядка 3k)."""
+        self._flush()
+        return self._size()
+
+
+class HistogramSketch(_Sketch):
+    """
+    Гистограмма метрики многоугольников с фиксированными корзинами [edges[i], edges[i+1]).
+    Значения меньше edges[0] и не меньше edges[-1] учитываются в underflow и overflow.
+
+    Счетчики точные, а память определяется только количеством корзин. Объединять можно
+    гистограммы с одинаковыми границами. Квантиль оценивается линейной интерполяцией внутри корзины,
+    в которую он попадает, поэтому погрешность quantile не больше ширины этой корзины
+    (для underflow и overflow корзина ограничена точными минимумом и максимумом).
+
+    Аргументы:
+        edges: Возрастающие границы корзин, например np.linspace(0, 300, 31) или np.geomspace(...)
+               для метрик с тяжелым хвостом.
+        metric: Метрика: 'area', 'perimeter' или 'side'.
+
+    Исключения:
+        ValueError: Если метрика неизвестна или границы не строго возрастают (нужно хотя бы две).
+    """
+    __slots__ = ('edges', '_counts')
+    name = 'histogram_sketch'
+
+    def __init__(self, edges, metric: str = 'area'):
+        super().__init__(metric)
+        self._set_state({'edges': edges, 'counts': None})
+
+    def _add_weighted(self, values: np.ndarray, weight: int):
+        super()._add_weighted(values, weight)
+        buckets = np.searchsorted(self.edges, values, side='right')
+        self._counts += weight*np.bincount(buckets, minlength=len(self._counts))
+
+    def _merge_state(self, other):
+        super()._merge_state(other)
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError('cannot merge histograms with different edges')
+        self._counts += other._counts
+
+    def _state(self):
+        return {'edges': self.edges.tolist(), 'counts': self._counts.tolist()}
+
+    def _set_state(self, state):
+        edges = np.asarray(state['edges'], dtype=np.float64)
+        if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) <= 0):
+            raise ValueError('edges must be a strictly increasing array of at least two values')
+        self.edges = edges
+        self._counts = np.zeros(len(edges) + 1, dtype=np.int64) if state['counts'] is None \
+            else np.asarray(state['counts'], dtype=np.int64)
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Количество значений в каждой корзине."""
+        return self._counts[1:-1].copy()
+
+    @property
+    def underflow(self) -> int:
+        """Количество значений меньше edges[0]."""
+        return int(self._counts[0])
+
+    @property
+    def overflow(self) -> int:
+        """Количество значений не меньше edges[-1]."""
+        return int(self._counts[-1])
+
+    def quantile(self, q: float) -> float:
+        """
+        Приближенный q-квантиль: линейная интерполяция внутри корзины, содержащей его.
+
+        Исключения:
+            ValueError: Если q вне [0, 1] или гистограмма пуста.
+        """
+        self._check_quantile(q)
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        cumulative = np.cumsum(self._counts)
+        target = q*cumulative[-1]
+        bucket = int(np.searchsorted(cumulative, target))
+        bounds = np.concatenate(([min(self.min, self.edges[0])], self.edges, [max(self.max, self.edges[-1])]))
+        lo, hi = max(bounds[bucket], self.min), min(bounds[bucket + 1], self.max)
+        below = cumulative[bucket - 1] if bucket else 0
+        return float(lo + (hi - lo)*(target - below)/self._counts[bucket])
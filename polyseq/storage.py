@@ -0,0 +1,198 @@
+"""
+Компактный бинарный формат хранения последовательностей многоугольников.
+
+Структура файла (все числа little-endian):
+    заголовок (64 байта): сигнатура b'PSEQPOLY', версия формата (uint32), зарезервировано (uint32),
+                          количество многоугольников n (uint64), количество вершин m (uint64),
+                          позиция блока координат (uint64), позиция индекса смещений (uint64);
+    блок координат: m пар float64 (x, y);
+    индекс смещений: n + 1 чисел int64 – вершины k-го многоугольника занимают
+                     записи [offsets[k], offsets[k + 1]) блока координат.
+"""
+import itertools
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from polyseq.batch import PolygonBatch
+
+MAGIC = b'PSEQPOLY'
+VERSION = 1
+_HEADER = struct.Struct('<8sIIQQQQ')
+_HEADER_SIZE = 64
+
+_FLUSH_FLOATS = 1 << 16  # размер буфера координат писателя (в числах float64)
+_ITER_CHUNK = 4096  # по сколько многоугольников читатель распаковывает за раз при итерации
+
+
+class PolygonWriter:
+    """
+    Потоковая запись последовательности многоугольников в файл формата polyseq.storage.
+
+    Координаты сразу пишутся в файл, а индекс смещений – во временный файл, который
+    дописывается в конец при закрытии, поэтому объем памяти не зависит от длины последовательности.
+    Используется как контекстный менеджер:
+
+        with PolygonWriter('strip.pseq') as writer:
+            writer.write_many(gen_reg_polygon_seq(4, n_figs=10**6))
+
+    Аргументы:
+        path: Путь к создаваемому файлу.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        self.n_polygons = 0
+        self.n_vertices = 0
+        self._file = open(path, 'wb')
+        self._file.write(bytes(_HEADER_SIZE))
+        self._offsets = tempfile.SpooledTemporaryFile(max_size=1 << 26)
+        self._offsets.write(struct.pack('<q', 0))
+        self._coords = array('d')
+        self._ends = array('q')
+
+    def write(self, poly: tuple[tuple[float, float], ...]):
+        """Записывает один многоугольник."""
+        self._coords.extend(itertools.chain.from_iterable(poly))
+        self.n_vertices += len(poly)
+        self.n_polygons += 1
+        self._ends.append(self.n_vertices)
+        if len(self._coords) >= _FLUSH_FLOATS:
+            self._flush()
+
+    def write_many(self, polygon_seq: Iterable[tuple[tuple[float, float], ...]]) -> int:
+        """
+        Записывает последовательность многоугольников (любой генератор polyseq или PolygonBatch).
+        PolygonBatch записывается целиком, без распаковки в кортежи.
+
+        Возвращает:
+            Количество записанных многоугольников.
+        """
+        if isinstance(polygon_seq, PolygonBatch):
+            self._flush()
+            self._file.write(polygon_seq.coords.astype('<f8', copy=False).tobytes())
+            self._offsets.write((polygon_seq.offsets[1:] + self.n_vertices).astype('<i8', copy=False).tobytes())
+            self.n_vertices += polygon_seq.n_vertices
+            self.n_polygons += len(polygon_seq)
+            return len(polygon_seq)
+
+        written = self.n_polygons
+        for poly in polygon_seq:
+            self.write(poly)
+        return self.n_polygons - written
+
+    def _flush(self):
+        self._file.write(np.frombuffer(self._coords, dtype=np.float64).astype('<f8', copy=False).tobytes())
+        self._offsets.write(np.frombuffer(self._ends, dtype=np.int64).astype('<i8', copy=False).tobytes())
+        self._coords = array('d')
+        self._ends = array('q')
+
+    def close(self):
+        """Дописывает индекс смещений и заголовок. Повторный вызов ничего не делает."""
+        if self._file.closed:
+            return
+        self._flush()
+        offsets_pos = self._file.tell()
+        self._offsets.seek(0)
+        shutil.copyfileobj(self._offsets, self._file)
+        self._offsets.close()
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, 0, self.n_polygons, self.n_vertices,
+                                      _HEADER_SIZE, offsets_pos))
+        self._file.close()
+
+    def __enter__(self) -> 'PolygonWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PolygonFile:
+    """
+    Чтение файла формата polyseq.storage через отображение в память (mmap).
+
+    Файл не загружается в память целиком: k-й многоугольник читается по индексу за O(1),
+    vertices(k) и срезы возвращают представления (view) отображенного файла без копирования координат,
+    а итерация лениво выдает многоугольники в привычном виде – кортежах вершин (float, float),
+    поэтому объект можно передавать напрямую в map/filter и функции polyseq.filters и polyseq.aggregates.
+
+    Аргументы:
+        path: Путь к файлу.
+
+    Исключения:
+        ValueError: Если файл не является файлом формата polyseq.storage или его версия не поддерживается.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE:
+            raise ValueError('file is too short to be a polyseq storage file')
+
+        magic, version, _, n_polygons, n_vertices, coords_pos, offsets_pos = _HEADER.unpack_from(header)
+        if magic != MAGIC:
+            raise ValueError('not a polyseq storage file')
+        if version != VERSION:
+            raise ValueError(f'unsupported polyseq storage version: {version}')
+
+        self.offsets = np.memmap(path, dtype='<i8', mode='r', offset=offsets_pos, shape=(n_polygons + 1,))
+        self.coords = np.memmap(path, dtype='<f8', mode='r', offset=coords_pos, shape=(n_vertices, 2)) \
+            if n_vertices else np.empty((0, 2))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def n_vertices(self) -> int:
+        """Общее количество вершин в файле."""
+        return len(self.coords)
+
+    def vertices(self, k: int) -> np.ndarray:
+        """Вершины k-го многоугольника – представление отображенного файла без копирования."""
+        k = range(len(self))[k]
+        return self.coords[self.offsets[k]:self.offsets[k + 1]]
+
+    def to_batch(self) -> PolygonBatch:
+        """Все многоугольники файла в виде PolygonBatch поверх отображенной памяти (без копирования координат)."""
+        return PolygonBatch(self.coords, self.offsets)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return PolygonBatch.from_polygons(self[k] for k in range(start, stop, step))
+            stop = max(start, stop)
+            a, b = self.offsets[start], self.offsets[stop]
+            return PolygonBatch(self.coords[a:b], self.offsets[start:stop + 1] - a)
+        return tuple(map(tuple, self.vertices(item).tolist()))
+
+    def __iter__(self) -> Iterator[tuple[tuple[float, float], ...]]:
+        for start in range(0, len(self), _ITER_CHUNK):
+            yield from self[start:start + _ITER_CHUNK].to_polygons()
+
+    def __repr__(self) -> str:
+        return f'PolygonFile({self.path!r}, n_polygons={len(self)}, n_vertices={self.n_vertices})'
+
+
+def save_polygons(path: str | os.PathLike, polygon_seq: Iterable[tuple[tuple[float, float], ...]]) -> int:
+    """
+    Сохраняет конечную последовательность многоугольников в файл формата polyseq.storage.
+    Последовательность проходится один раз и не накапливается в памяти.
+
+    Возвращает:
+        Количество записанных многоугольников.
+    """
+    with PolygonWriter(path) as writer:
+        return writer.write_many(polygon_seq)
+
+
+def load_polygons(path: str | os.PathLike) -> PolygonFile:
+    """Открывает файл формата polyseq.storage для чтения через mmap. См. PolygonFile."""
+    return PolygonFile(path)
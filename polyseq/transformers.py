@@ -1,6 +1,12 @@
 import itertools
 import math
 
+import numpy as np
+
+from polyseq.batch import PolygonBatch
+from polyseq.instrumentation import instrumented
+
+@instrumented('poly')
 def tr_translate(poly: tuple[tuple[float, float], ...],
                  dx: int |float, dy: int |float) -> tuple[tuple[float, float], ...]:
     """
@@ -19,6 +25,7 @@ def tr_translate(poly: tuple[tuple[float, float], ...],
 
     return tuple(map(lambda vertex: (vertex[0] + dx, vertex[1] + dy), poly))
 
+@instrumented('poly')
 def tr_rotate(poly: tuple[tuple[float, float], ...],
               angle: int | float) -> tuple[tuple[float, float], ...]:
     """
@@ -37,8 +44,9 @@ def tr_rotate(poly: tuple[tuple[float, float], ...],
         raise TypeError('angle must be a numerical value (int or float)')
 
     angle = math.radians(angle)
-    return tuple(map(lambda vertex: (vertex[0]*math.cos(angle) - vertex[1]*math.sin(angle),
-                                      vertex[0]*math.sin(angle) + vertex[1]*math.cos(angle)), poly))
+    cos, sin = math.cos(angle), math.sin(angle)
+    return tuple(map(lambda vertex: (vertex[0]*cos - vertex[1]*sin,
+                                      vertex[0]*sin + vertex[1]*cos), poly))
 
 
 _SYMMETRY = {
@@ -46,6 +54,7 @@ _SYMMETRY = {
     'y': lambda vertex: (-vertex[0], vertex[1]), 1: lambda vertex: (-vertex[0], vertex[1])
 }
 
+@instrumented('poly')
 def tr_symmetry(poly: tuple[tuple[float, float], ...],
                 axis: int | str) -> tuple[tuple[float, float], ...]:
     """
@@ -65,6 +74,7 @@ def tr_symmetry(poly: tuple[tuple[float, float], ...],
 
     return tuple(map(flip, poly))
 
+@instrumented('poly')
 def tr_homothety(poly: tuple[tuple[float, float], ...],
                  center: tuple[int | int] | tuple[float, float],
                  k: int | float) -> tuple[tuple[float, float], ...]:
@@ -93,10 +103,197 @@ def tr_homothety(poly: tuple[tuple[float, float], ...],
     a, b = center
     return tuple(map(lambda v: (k*(v[0] - a) + a, k*(v[1] - b) + b), poly))
 
+@instrumented('poly')
 def tr_stretch_plane(poly: tuple[tuple[float, float], ...],
                      cx=1, cy=1):
     """
     Расстягивает фигуру (плоскость) вдоль одной из осей.
     Предназначена прежде всего для получения прямоугольника из квадрата.
     """
-    return tuple(map(lambda v: (cx * v[0], cy*v[1]), poly))
\ No newline at end of file
+    return tuple(map(lambda v: (cx * v[0], cy*v[1]), poly))
+
+
+# ───────────── векторизованные версии для PolygonBatch ─────────────
+# Каждая функция выполняет одну операцию numpy над всеми вершинами пакета сразу
+# и возвращает новый PolygonBatch с той же структурой многоугольников.
+# Вместо PolygonBatch можно передать любую конечную последовательность многоугольников –
+# она будет упакована через PolygonBatch.from_polygons.
+
+@instrumented('batch')
+def tr_translate_batch(batch: PolygonBatch, dx: int | float, dy: int | float) -> PolygonBatch:
+    """Параллельный перенос всех многоугольников пакета на (dx, dy). См. tr_translate."""
+    if not isinstance(dx, (int, float)) or not isinstance(dy, (int, float)):
+        raise TypeError('dx and dy must be numerical values (int or float)')
+
+    batch = PolygonBatch.from_polygons(batch)
+    return batch.with_coords(batch.coords + (dx, dy))
+
+@instrumented('batch')
+def tr_rotate_batch(batch: PolygonBatch, angle: int | float) -> PolygonBatch:
+    """Поворот всех многоугольников пакета на заданный угол (в градусах). См. tr_rotate."""
+    if not isinstance(angle, (int, float)):
+        raise TypeError('angle must be a numerical value (int or float)')
+
+    batch = PolygonBatch.from_polygons(batch)
+    angle = math.radians(angle)
+    cos, sin = math.cos(angle), math.sin(angle)
+    rotation = np.array(((cos, sin), (-sin, cos)))  # строки-вершины умножаются справа
+    return batch.with_coords(batch.coords @ rotation)
+
+
+_SYMMETRY_BATCH = {'x': (1, -1), 0: (1, -1), 'y': (-1, 1), 1: (-1, 1)}
+
+@instrumented('batch')
+def tr_symmetry_batch(batch: PolygonBatch, axis: int | str) -> PolygonBatch:
+    """Симметричное отражение всех многоугольников пакета относительно одной из осей. См. tr_symmetry."""
+    try:
+        flip = _SYMMETRY_BATCH[axis]
+    except KeyError as e:
+        raise ValueError('incorrect axis indicator') from e
+
+    batch = PolygonBatch.from_polygons(batch)
+    return batch.with_coords(batch.coords * flip)
+
+@instrumented('batch')
+def tr_homothety_batch(batch: PolygonBatch,
+                       center: tuple[int | int] | tuple[float, float],
+                       k: int | float) -> PolygonBatch:
+    """Гомотетия всех многоугольников пакета с заданным центром и коэффициентом. См. tr_homothety."""
+    if not isinstance(center[0], (int, float)) or not isinstance(center[1], (int, float)):
+        raise TypeError('center must be a 1-dimensional tuple of 2 numerical values (int or float)')
+
+    if not isinstance(k, (int, float)):
+        raise TypeError('k must be a numerical value (int or float)')
+
+    if k == 0:
+        raise ValueError
+
+    batch = PolygonBatch.from_polygons(batch)
+    center = np.asarray(center, dtype=np.float64)
+    return batch.with_coords(k*(batch.coords - center) + center)
+
+@instrumented('batch')
+def tr_stretch_plane_batch(batch: PolygonBatch, cx=1, cy=1) -> PolygonBatch:
+    """Растяжение всех многоугольников пакета вдоль осей. См. tr_stretch_plane."""
+    batch = PolygonBatch.from_polygons(batch)
+    return batch.with_coords(batch.coords * (cx, cy))
+
+
+
+# ───────────── композиция аффинных преобразований ─────────────
+
+class Transform:
+    """
+    Аффинное преобразование плоскости, заданное однородной матрицей 3x3.
+
+    Экземпляры создаются через конструкторы, повторяющие функции модуля
+    (Transform.translate, Transform.rotate, Transform.symmetry, Transform.homothety,
+    Transform.stretch_plane), и комбинируются методом then() или оператором @.
+    Композиция сразу перемножает матрицы, поэтому цепочка любой длины применяется
+    к многоугольнику за один проход по вершинам. Экземпляр вызываем и может
+    передаваться напрямую в map():
+
+        map(Transform.translate(0, 3).then(Transform.rotate(60)), seq)
+
+    Аргументы:
+        matrix: Матрица 3x3 (последняя строка – (0, 0, 1)). По умолчанию – тождественное преобразование.
+
+    Исключения:
+        ValueError: Если матрица не является аффинной матрицей 3x3.
+    """
+    __slots__ = ('_coefs',)
+
+    def __init__(self, matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1))):
+        (a, b, c), (d, e, f), last = matrix
+        if tuple(last) != (0, 0, 1):
+            raise ValueError('the last row of an affine matrix must be (0, 0, 1)')
+        self._coefs = tuple(map(float, (a, b, c, d, e, f)))
+
+    @classmethod
+    def translate(cls, dx: int | float, dy: int | float) -> 'Transform':
+        """Параллельный перенос на (dx, dy). См. tr_translate."""
+        if not isinstance(dx, (int, float)) or not isinstance(dy, (int, float)):
+            raise TypeError('dx and dy must be numerical values (int or float)')
+        return cls(((1, 0, dx), (0, 1, dy), (0, 0, 1)))
+
+    @classmethod
+    def rotate(cls, angle: int | float) -> 'Transform':
+        """Поворот вокруг начала координат на угол в градусах. См. tr_rotate."""
+        if not isinstance(angle, (int, float)):
+            raise TypeError('angle must be a numerical value (int or float)')
+        angle = math.radians(angle)
+        cos, sin = math.cos(angle), math.sin(angle)
+        return cls(((cos, -sin, 0), (sin, cos, 0), (0, 0, 1)))
+
+    @classmethod
+    def symmetry(cls, axis: int | str) -> 'Transform':
+        """Симметрия относительно оси абсцисс (0 или 'x') или ординат (1 или 'y'). См. tr_symmetry."""
+        try:
+            fx, fy = _SYMMETRY_BATCH[axis]
+        except KeyError as e:
+            raise ValueError('incorrect axis indicator') from e
+        return cls(((fx, 0, 0), (0, fy, 0), (0, 0, 1)))
+
+    @classmethod
+    def homothety(cls, center: tuple[int | int] | tuple[float, float],
+                  k: int | float) -> 'Transform':
+        """Гомотетия с центром center и коэффициентом k. См. tr_homothety."""
+        if not isinstance(center[0], (int, float)) or not isinstance(center[1], (int, float)):
+            raise TypeError('center must be a 1-dimensional tuple of 2 numerical values (int or float)')
+
+        if not isinstance(k, (int, float)):
+            raise TypeError('k must be a numerical value (int or float)')
+
+        if k == 0:
+            raise ValueError
+
+        a, b = center
+        return cls(((k, 0, a - k*a), (0, k, b - k*b), (0, 0, 1)))
+
+    @classmethod
+    def stretch_plane(cls, cx=1, cy=1) -> 'Transform':
+        """Растяжение плоскости вдоль осей. См. tr_stretch_plane."""
+        return cls(((cx, 0, 0), (0, cy, 0), (0, 0, 1)))
+
+    @property
+    def matrix(self) -> tuple[tuple[float, float, float], ...]:
+        """Однородная матрица преобразования 3x3."""
+        a, b, c, d, e, f = self._coefs
+        return (a, b, c), (d, e, f), (0.0, 0.0, 1.0)
+
+    def then(self, other: 'Transform') -> 'Transform':
+        """Композиция: сначала применяется self, затем other."""
+        return other @ self
+
+    def __matmul__(self, other: 'Transform') -> 'Transform':
+        """Произведение матриц self @ other: сначала применяется other, затем self."""
+        if not isinstance(other, Transform):
+            return NotImplemented
+        a1, b1, c1, d1, e1, f1 = self._coefs
+        a2, b2, c2, d2, e2, f2 = other._coefs
+        return Transform(((a1*a2 + b1*d2, a1*b2 + b1*e2, a1*c2 + b1*f2 + c1),
+                          (d1*a2 + e1*d2, d1*b2 + e1*e2, d1*c2 + e1*f2 + f1),
+                          (0, 0, 1)))
+
+    @instrumented('poly', name='Transform', method=True)
+    def __call__(self, poly: tuple[tuple[float, float], ...]) -> tuple[tuple[float, float], ...]:
+        """Применяет преобразование к многоугольнику за один проход по вершинам."""
+        a, b, c, d, e, f = self._coefs
+        return tuple([(a*x + b*y + c, d*x + e*y + f) for x, y in poly])
+
+    def apply_batch(self, batch: PolygonBatch) -> PolygonBatch:
+        """Применяет преобразование ко всем вершинам пакета одной операцией numpy."""
+        batch = PolygonBatch.from_polygons(batch)
+        a, b, c, d, e, f = self._coefs
+        return batch.with_coords(batch.coords @ np.array(((a, d), (b, e))) + (c, f))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Transform):
+            return NotImplemented
+        return self._coefs == other._coefs
+
+    def __hash__(self) -> int:
+        return hash(self._coefs)
+
+    def __repr__(self) -> str:
+        return f'Transform({self.matrix})'
@@ -1,14 +1,53 @@
 import itertools
-from typing import Iterator
+import math
+from typing import Iterable, Iterator
 
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
+import numpy as np
+from matplotlib.collections import PolyCollection
 from matplotlib.patches import Polygon
 
+from polyseq.batch import PolygonBatch
+from polyseq.generators import RegPolygonSeq
+from polyseq.index import SpatialIndex
+
+
+def _colors(n: int, kwargs: dict) -> np.ndarray | None:
+    """
+    Цвета n фигур, равномерно распределенные по заданной цветовой карте, – одним векторизованным вызовом.
+    Если явно переданы edgecolor или facecolor, возвращает None.
+    """
+    if kwargs.get('edgecolor') is not None or kwargs.get('facecolor') is not None or not n:
+        return None
+    cmap = plt.get_cmap(kwargs.get('cmap', 'plasma'), n)
+    return cmap(np.arange(n) / n)  # нормализация для равномерного распределения цветов
+
+
+def _add_collection(ax: plt.Axes, polygons, colors: np.ndarray | None, kwargs: dict):
+    """Добавляет все многоугольники одной коллекцией PolyCollection с теми же цветами, что и у патчей."""
+    fill = kwargs.get('fill', True)
+    if colors is not None:
+        facecolors, edgecolors = colors, colors
+    else:
+        facecolor, edgecolor = kwargs.get('facecolor'), kwargs.get('edgecolor')
+        facecolors = mpl.rcParams['patch.facecolor'] if facecolor is None else facecolor
+        # как у matplotlib.patches.Polygon: контур без явного цвета рисуется только у незаполненных фигур
+        if edgecolor is None:
+            edgecolor = mpl.rcParams['patch.edgecolor'] if not fill or mpl.rcParams['patch.force_edgecolor'] \
+                else 'none'
+        edgecolors = edgecolor
+    ax.add_collection(PolyCollection(polygons,
+                                     facecolors=facecolors if fill else 'none',
+                                     edgecolors=edgecolors,
+                                     alpha=kwargs.get('alpha', 0.8)),
+                      autolim=True)
+
 
 def visualize(polygon_seq: Iterator[tuple[tuple[float], float, ...]],
               start: int, stop: int, step: int = 1,
-              ax: plt.Axes | None = None, **kwargs) -> plt.Axes:
+              ax: plt.Axes | None = None, batched: bool = False, **kwargs) -> plt.Axes:
     """
     Инструмент для визуализации указанного диапазона последовательности
     многоугольников на основе matplotlib.
@@ -16,11 +55,14 @@ def visualize(polygon_seq: Iterator[tuple[tuple[float], float, ...]],
 
     Аргументы:
         polygon_seq: Итератор, генерирующий кортежи из вершин размера (n_sides, 2);
-                     каждая вершина – кортеж координат (float, float)
+                     каждая вершина – кортеж координат (float, float).
+                     Последовательности с произвольным доступом (например, RegPolygonSeq) режутся без перебора.
         start: Индекс первой фигуры (включительно), которую нужно отобразить
         stop: Индекс последней фигуры (исключительно), которую нужно отобразить
         step: Шаг счетчика
         ax: Ось matplotlib для рисования. По умолчанию None – создается новая фигура.
+        batched: Рисовать все фигуры одним артистом PolyCollection вместо отдельного патча на фигуру.
+                 Цвета те же, но отрисовка десятков тысяч фигур быстрее на порядки.
         **kwargs: Необязательные параметры визуализации
                     * figsize (tuple[float, float]) — размер создаваемой фигуры, если ax is None.
                     * cmap (str | Colormap) — название или объект colormap; по умолчанию 'plasma'.
@@ -32,35 +74,124 @@ def visualize(polygon_seq: Iterator[tuple[tuple[float], float, ...]],
         Возвращает:
             Ось, на которой были нарисованы многоугольники
     """
-    polygons = tuple(itertools.islice(polygon_seq, start, stop, step))
+    if hasattr(polygon_seq, '__getitem__'):
+        # последовательности с произвольным доступом (кортежи, RegPolygonSeq, PolygonBatch)
+        # режем напрямую, не перебирая фигуры до start
+        polygons = polygon_seq[start:stop:step]
+    else:
+        polygons = tuple(itertools.islice(polygon_seq, start, stop, step))
+    if isinstance(polygons, PolygonBatch) and batched:
+        # представления массива координат без распаковки в кортежи
+        polygons = np.split(polygons.coords, polygons.offsets[1:-1]) if len(polygons) else []
+    elif not isinstance(polygons, tuple):
+        polygons = tuple(polygons)
 
-
-    def _get_color(idx: int) -> tuple[float, float, float, float] | None:
-        """
-        Равномерно распределяет цвета заданной цветовой карты по количеству фигур в последовательности.
-        Если явно переданы edgecolor и facecolor – используем их, `_get_color()` возвращает None
-        """
-        if kwargs.get('edgecolor') is not None or kwargs.get('facecolor') is not None:
-            return None
-        else:
-            cmap = plt.get_cmap(kwargs.get('cmap', 'plasma'), len(polygons))
-            return cmap(idx / len(polygons))  # нормализация для равномерного распределения цветов
+    colors = _colors(len(polygons), kwargs)
 
     # создаем новую ось, если не передана
     if ax is None:
         fig, ax = plt.subplots(figsize=kwargs.get('figsize', (7,7)))
 
     # рисуем
-    for i, poly in enumerate(polygons):
-        ax.add_patch(Polygon(poly,
-                             color=_get_color(i),
-                             alpha=kwargs.get('alpha', 0.8),
-                             fill=kwargs.get('fill', True),
-                             edgecolor=kwargs.get('edgecolor'),
-                             facecolor=kwargs.get('facecolor')))
+    if batched:
+        _add_collection(ax, polygons, colors, kwargs)
+    else:
+        for i, poly in enumerate(polygons):
+            ax.add_patch(Polygon(poly,
+                                 color=None if colors is None else colors[i],
+                                 alpha=kwargs.get('alpha', 0.8),
+                                 fill=kwargs.get('fill', True),
+                                 edgecolor=kwargs.get('edgecolor'),
+                                 facecolor=kwargs.get('facecolor')))
 
     ax.autoscale()
     ax.grid(visible=kwargs.get('grid', False))
     ax.set_aspect('equal')
 
-    return ax
\ No newline at end of file
+    return ax
+
+
+def _strip_visible_range(strip: RegPolygonSeq, xlim: tuple[float, float], ylim: tuple[float, float]) -> range:
+    """
+    Номера многоугольников ленты, ограничивающий прямоугольник которых пересекает окно, –
+    по геометрии ленты за O(1): k-й многоугольник занимает по абсциссе
+    [x_offset + k*x_shift + xmin, x_offset + k*x_shift + xmax] базового многоугольника.
+    """
+    xs, ys = [x for x, _ in strip.base_poly], [y for _, y in strip.base_poly]
+    if max(ys) < ylim[0] or min(ys) > ylim[1]:
+        return range(0)
+
+    # k-й многоугольник виден, если lo <= k*x_shift <= hi
+    lo, hi = xlim[0] - strip.x_offset - max(xs), xlim[1] - strip.x_offset - min(xs)
+    shift = strip.x_shift
+    if shift > 0:
+        first, last = math.ceil(lo / shift), math.floor(hi / shift)
+    elif shift < 0:
+        first, last = math.ceil(hi / shift), math.floor(lo / shift)
+    elif lo <= 0 <= hi:
+        if math.isinf(strip.n_figs):
+            raise ValueError('every polygon of an infinite strip with zero shift is visible')
+        first, last = 0, strip.n_figs - 1
+    else:
+        return range(0)
+
+    first = max(first, 0)
+    if not math.isinf(strip.n_figs):
+        last = min(last, strip.n_figs - 1)
+    return range(first, max(first, last + 1))
+
+
+def visualize_viewport(polygon_seq: Iterable[tuple[tuple[float, float], ...]],
+                       xlim: tuple[float, float] | None = None, ylim: tuple[float, float] | None = None,
+                       ax: plt.Axes | None = None, batched: bool = False, **kwargs) -> plt.Axes:
+    """
+    Визуализация только тех многоугольников последовательности, которые попадают в окно просмотра.
+    В отличие от visualize, диапазон фигур задается не номерами, а границами осей, и границы
+    после отрисовки не меняются – удобно для прокрутки бесконечной ленты.
+
+    Отбор зависит от источника:
+        * RegPolygonSeq (gen_reg_polygon_seq) – диапазон видимых номеров вычисляется по геометрии
+          ленты, поэтому время не зависит от положения окна и пропорционально числу видимых фигур,
+          в том числе для бесконечной ленты;
+        * SpatialIndex – кандидаты берутся запросом query_bbox;
+        * PolygonBatch и любая другая конечная последовательность – отбор по ограничивающим
+          прямоугольникам, вычисленным векторизованно по всему пакету.
+
+    Аргументы:
+        polygon_seq: Последовательность многоугольников (см. выше). Произвольный итератор должен быть конечным.
+        xlim: Границы окна по оси абсцисс. По умолчанию – текущие границы ax.
+        ylim: Границы окна по оси ординат. По умолчанию – текущие границы ax.
+        ax: Ось matplotlib для рисования. По умолчанию None – создается новая фигура.
+        batched: Рисовать видимые фигуры одним артистом PolyCollection (см. visualize).
+        **kwargs: Параметры визуализации, как у visualize. Цвета распределяются по видимым фигурам.
+
+    Возвращает:
+        Ось с установленными границами xlim и ylim.
+
+    Исключения:
+        ValueError: Если границы окна не заданы ни явно, ни через ax;
+                    если окно пересекает бесконечно много фигур (бесконечная лента с нулевым сдвигом).
+    """
+    if (xlim is None or ylim is None) and ax is None:
+        raise ValueError('xlim and ylim are required when ax is not given')
+    xlim = ax.get_xlim() if xlim is None else xlim
+    ylim = ax.get_ylim() if ylim is None else ylim
+    # у перевернутых осей левая граница больше правой
+    window = (min(xlim), min(ylim), max(xlim), max(ylim))
+    x0, y0, x1, y1 = window
+
+    if isinstance(polygon_seq, RegPolygonSeq):
+        visible = _strip_visible_range(polygon_seq, (x0, x1), (y0, y1))
+        polygons = polygon_seq[visible.start:visible.stop]
+    elif isinstance(polygon_seq, SpatialIndex):
+        polygons = tuple(polygon_seq[k] for k in polygon_seq.query_bbox(window))
+    else:
+        batch = PolygonBatch.from_polygons(polygon_seq)
+        bboxes = batch.bboxes()
+        polygons = batch.take(np.flatnonzero((bboxes[:, 0] <= x1) & (bboxes[:, 2] >= x0)
+                                             & (bboxes[:, 1] <= y1) & (bboxes[:, 3] >= y0)))
+
+    ax = visualize(polygons, 0, None, ax=ax, batched=batched, **kwargs)
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+    return ax
@@ -9,5 +9,5 @@ setup(
     author='Липатников Никита',
     email='lipatnikov.contact@gmail.com',
     packages=find_packages(),
-    install_requires=['matplotlib'],
+    install_requires=['matplotlib', 'numpy'],
 )
\ No newline at end of file
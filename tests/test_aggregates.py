@@ -1,6 +1,11 @@
 import math
+import itertools
+import json
+import pickle
+import random
 import pytest
 
+import polyseq.aggregates as aggregates
 from polyseq.aggregates import (
     _sides,
     _area,
@@ -9,7 +14,24 @@ from polyseq.aggregates import (
     agr_min_area,
     agr_perimeter,
     agr_area,
+    agr_summary,
+    agr_convex_hull,
+    agr_intersecting_pairs,
+    agr_union_area,
+    agr_nearest_vertex,
+    agr_closest_pair,
+    ACCUMULATORS,
+    AreaAccumulator,
+    PerimeterAccumulator,
+    MaxSideAccumulator,
+    MinAreaAccumulator,
+    OriginNearestAccumulator,
+    _Accumulator,
 )
+from polyseq.batch import PolygonBatch
+from polyseq.filters import flt_polygons_intersect
+from polyseq.generators import gen_reg_polygon_seq, gen_random_polygon_batch
+from polyseq.transformers import tr_translate, tr_stretch_plane
 
 SQUARE = ((0, 0), (1, 0), (1, 1), (0, 1))
 RECTANGLE = ((0, 0), (3, 0), (3, 1), (0, 1))
@@ -72,3 +94,352 @@ def test_agr_area():
     res = agr_area(polys)
     # Площадь квадрата 1 + площадь треугольника 3 = 4
     assert math.isclose(res, 4)
+
+# Тесты для agr_summary
+def test_agr_summary_single_pass():
+    polys = [SQUARE, RECTANGLE, TRIANGLE]
+    res = agr_summary(iter(polys))  # итератор проходится ровно один раз
+    assert math.isclose(res['area'], agr_area(polys))
+    assert math.isclose(res['perimeter'], agr_perimeter(polys))
+    assert math.isclose(res['max_side'], agr_max_side(polys))
+    assert math.isclose(res['min_area'], agr_min_area(polys))
+    assert math.isclose(res['origin_nearest'], agr_origin_nearest(polys))
+
+def test_agr_summary_subset():
+    res = agr_summary([SQUARE, TRIANGLE], stats=('perimeter', 'area'))
+    assert list(res) == ['perimeter', 'area']
+    assert math.isclose(res['area'], 4)
+
+def test_agr_summary_errors():
+    with pytest.raises(ValueError):
+        agr_summary([SQUARE], stats=('volume',))
+    with pytest.raises(ValueError):
+        agr_summary([], stats=('min_area',))
+    assert agr_summary([], stats=('area',)) == {'area': 0}
+
+# Тесты для замкнутых формул по лентам из gen_reg_polygon_seq
+@pytest.mark.parametrize("agr", [agr_area, agr_perimeter, agr_max_side, agr_min_area, agr_origin_nearest])
+@pytest.mark.parametrize("n_sides, step, n_figs, l", [
+    (4, 1, 5, 1),
+    (3, 0.3, 11, 5),
+    (7, 2.7, 3, 5.8),
+    (6, -1, 4, 2),
+])
+def test_strip_closed_form_matches_iteration(agr, n_sides, step, n_figs, l):
+    strip = gen_reg_polygon_seq(n_sides, step=step, n_figs=n_figs, l=l)
+    assert math.isclose(agr(strip), agr(iter(list(strip))), rel_tol=1e-9)
+
+def test_strip_origin_nearest_shifted():
+    # для ленты, сдвинутой в отрицательную полуплоскость, ближайшей окажется не первая фигура
+    strip = gen_reg_polygon_seq(4, step=1, n_figs=20, l=1)
+    strip.x_offset = -7.3
+    expected = min(math.dist(v, (0, 0)) for p in strip for v in p)
+    assert math.isclose(agr_origin_nearest(strip), expected)
+
+def test_strip_huge_and_infinite():
+    strip = gen_reg_polygon_seq(4, n_figs=10**8, l=2)
+    assert math.isclose(agr_area(strip), 4 * 10**8)
+    assert math.isclose(agr_summary(strip)['perimeter'], 8 * 10**8)
+    infinite = gen_reg_polygon_seq(3)
+    assert math.isinf(agr_area(infinite))
+    assert math.isclose(agr_max_side(infinite), 1)
+
+def test_strip_empty():
+    strip = gen_reg_polygon_seq(4, n_figs=0)
+    assert agr_area(strip) == 0
+    with pytest.raises(ValueError):
+        agr_min_area(strip)
+
+@pytest.mark.parametrize("agr", [agr_area, agr_perimeter, agr_max_side, agr_min_area, agr_origin_nearest])
+def test_sliced_strip_closed_form(agr):
+    strip = gen_reg_polygon_seq(5, step=0.5, n_figs=30, l=2)[25:3:-4]
+    assert math.isclose(agr(strip), agr(iter(list(strip))), rel_tol=1e-9)
+
+# Тесты для накопителей частичных состояний
+_AGR_OF = {'area': agr_area, 'perimeter': agr_perimeter, 'max_side': agr_max_side,
+           'min_area': agr_min_area, 'origin_nearest': agr_origin_nearest, 'convex_hull': agr_convex_hull}
+
+@pytest.mark.parametrize("name", sorted(ACCUMULATORS))
+def test_accumulator_shards_merge(name):
+    polys = [SQUARE, RECTANGLE, TRIANGLE, tr_translate(TRIANGLE, 5, -3), tr_translate(SQUARE, -2, 7)]
+    cls = ACCUMULATORS[name]
+    shard_1 = cls()
+    for poly in polys[:2]:
+        shard_1.update(poly)
+    shard_2 = cls().update_batch(PolygonBatch.from_polygons(polys[2:4]))
+    shard_3 = cls().update_batch(iter(polys[4:]))
+    # состояние пересекает границу процесса/машины через pickle или JSON
+    shard_2 = pickle.loads(pickle.dumps(shard_2))
+    shard_3 = _Accumulator.from_dict(json.loads(json.dumps(shard_3.to_dict())))
+    total = shard_1.merge(shard_2).merge(shard_3)
+    assert total.count == 5
+    if name == 'convex_hull':
+        assert total.result() == _AGR_OF[name](polys)
+    else:
+        assert math.isclose(total.result(), _AGR_OF[name](polys))
+
+def test_accumulator_exact_sum():
+    acc = AreaAccumulator()
+    big = ((0, 0), (1e8, 0), (1e8, 1e8), (0, 1e8))
+    acc.update(big)
+    for _ in range(1000):
+        acc.update(SQUARE)
+    acc.merge(AreaAccumulator().update(big))
+    # наивная сумма 1e16 + 1 + 1 + ... теряет единицы; компенсированная – нет
+    assert acc.result() == 2e16 + 1000
+
+def test_accumulator_batch_sum_is_exact():
+    # пакет [1e16, 1] и затем [1]: округление суммы пакета потеряло бы обе единицы
+    big = ((0, 0), (1e8, 0), (1e8, 1e8), (0, 1e8))
+    batched = AreaAccumulator().update_batch(PolygonBatch.from_polygons([big, SQUARE]))
+    batched.update_batch(PolygonBatch.from_polygons([SQUARE]))
+    single = AreaAccumulator()
+    for poly in (big, SQUARE, SQUARE):
+        single.update(poly)
+    assert batched.result() == single.result() == math.fsum([1e16, 1, 1]) == 1.0000000000000002e16
+
+    # результат не зависит от разбиения на пакеты
+    batch = gen_random_polygon_batch(500, rng=2)
+    expected = math.fsum(batch.areas().tolist())
+    for size in (1, 7, 64, 500):
+        acc = AreaAccumulator()
+        for start in range(0, len(batch), size):
+            acc.update_batch(batch[start:start + size])
+        assert acc.result() == expected
+
+def test_accumulator_empty_and_type_errors():
+    assert AreaAccumulator().result() == 0
+    assert MinAreaAccumulator().update_batch(PolygonBatch.from_polygons([])).count == 0
+    with pytest.raises(ValueError):
+        MaxSideAccumulator().result()
+    with pytest.raises(TypeError):
+        AreaAccumulator().merge(PerimeterAccumulator())
+
+
+# ───── agr_intersecting_pairs ─────
+def test_agr_intersecting_pairs_touching():
+    # соседние единичные квадраты касаются сторонами, через один – не пересекаются
+    squares = [tr_translate(SQUARE, k, 0) for k in range(5)]
+    assert agr_intersecting_pairs(squares).tolist() == [[0, 1], [1, 2], [2, 3], [3, 4]]
+    # в ленте с промежутками фигуры не пересекаются
+    assert agr_intersecting_pairs(gen_reg_polygon_seq(4, n_figs=5)).tolist() == []
+
+def test_agr_intersecting_pairs_matches_brute_force():
+    polygons = gen_random_polygon_batch(150, rng=3, packed=False)
+    expected = [[i, j] for i, j in itertools.combinations(range(len(polygons)), 2)
+                if flt_polygons_intersect(polygons[i], polygons[j])]
+    assert agr_intersecting_pairs(iter(polygons)).tolist() == expected
+
+def test_agr_intersecting_pairs_two_sequences():
+    left = gen_random_polygon_batch(60, rng=4, packed=False)
+    right = gen_random_polygon_batch(70, rng=5)
+    expected = [[i, j] for i in range(len(left)) for j in range(len(right))
+                if flt_polygons_intersect(left[i], right[j])]
+    assert agr_intersecting_pairs(left, right).tolist() == expected
+    assert agr_intersecting_pairs(left, []).tolist() == []
+
+def test_agr_intersecting_pairs_nested_and_degenerate():
+    big = ((-5, -5), (5, -5), (5, 5), (-5, 5))
+    notch = ((0, 0), (2, 0), (1, 1), (2, 2), (0, 2))       # невыпуклый
+    segment = ((1, 1), (3, 3))                              # вырожденный, касается notch в вершине (1, 1)
+    inner = ((1.6, 0.9), (1.9, 0.9), (1.9, 1.1), (1.6, 1.1))  # в «выемке» notch
+    far = ((10, 10), (11, 10), (11, 11))
+    polygons = [big, notch, segment, inner, far]
+    expected = [[i, j] for i, j in itertools.combinations(range(len(polygons)), 2)
+                if flt_polygons_intersect(polygons[i], polygons[j])]
+    assert agr_intersecting_pairs(polygons).tolist() == expected == [[0, 1], [0, 2], [0, 3], [1, 2]]
+
+
+# ───── agr_union_area ─────
+def test_agr_union_area_overlaps_counted_once():
+    shifted = tr_translate(SQUARE, 0.5, 0.5)
+    assert math.isclose(agr_union_area([SQUARE, shifted]), 1.75)
+    assert math.isclose(agr_union_area([SQUARE, SQUARE, SQUARE[::-1]]), 1.0)  # совпадающие, разный обход
+    assert math.isclose(agr_union_area([SQUARE, ((-5, -5), (5, -5), (5, 5), (-5, 5))]), 100.0)
+    assert math.isclose(agr_union_area([SQUARE, tr_translate(SQUARE, 1, 0)]), 2.0)  # касание стороной
+    assert agr_union_area([]) == 0.0
+
+def test_agr_union_area_non_convex_and_degenerate():
+    notch = ((0, 0), (2, 0), (1, 1), (2, 2), (0, 2))
+    assert math.isclose(agr_union_area([notch, SQUARE, ((0, 0), (5, 5))]), 3.0)
+    # квадрат в «выемке» добавляет свою площадь целиком
+    in_notch = ((1.6, 0.9), (1.9, 0.9), (1.9, 1.1), (1.6, 1.1))
+    assert math.isclose(agr_union_area([notch, in_notch]), 3.06)
+
+def test_agr_union_area_strip_without_overlaps_equals_agr_area():
+    strip = gen_reg_polygon_seq(6, n_figs=50)
+    assert math.isclose(agr_union_area(strip), agr_area(strip))
+    with pytest.raises(ValueError):
+        agr_union_area(gen_reg_polygon_seq(4))
+
+def test_agr_union_area_overlapping_strips():
+    # две ленты вытянутых прямоугольников, как в tasks/task_6: ширина 1, высота 10, шаг 2
+    strip = [tr_stretch_plane(p, cy=10) for p in gen_reg_polygon_seq(4, n_figs=30, l=1)]
+    crossing = [tr_translate(p, 0.5, 5) for p in strip]
+    # каждая пара перекрывается прямоугольником 0.5 x 5
+    assert math.isclose(agr_union_area(strip + crossing), 2*30*10 - 30*2.5)
+
+def test_agr_union_area_approx_error_bound():
+    polygons = gen_random_polygon_batch(20, rng=2)
+    exact = agr_union_area(polygons)
+    c = 0.05
+    bound = math.sqrt(2)*c*polygons.perimeters().sum() + 2*c*c*polygons.n_vertices
+    assert abs(agr_union_area(polygons, approx=True, cell_size=c) - exact) <= bound
+    assert math.isclose(agr_union_area(polygons, approx=True), exact, rel_tol=1e-3)
+    with pytest.raises(ValueError):
+        agr_union_area(polygons, approx=True, cell_size=0)
+
+
+# ───── agr_convex_hull ─────
+def _brute_force_hull(points):
+    # эталон для точек общего положения: концы отрезков, оставляющих все остальные точки слева
+    points = set(points)
+    return {p for p in points for q in points
+            if p != q and all(_pseudo_turn(p, q, r) > 0 for r in points - {p, q})}
+
+
+def test_agr_convex_hull_simple_cases():
+    notch = ((0, 0), (2, 0), (1, 1), (2, 2), (0, 2))
+    assert agr_convex_hull([notch]) == ((0, 0), (2, 0), (2, 2), (0, 2))
+    assert agr_convex_hull([SQUARE, tr_translate(SQUARE, 3, 0)]) == ((0, 0), (4, 0), (4, 1), (0, 1))
+    assert agr_convex_hull([((1, 1), (1, 1), (1, 1))]) == ((1, 1),)
+    assert agr_convex_hull([((0, 0), (1, 1), (2, 2))]) == ((0, 0), (2, 2))
+    with pytest.raises(ValueError):
+        agr_convex_hull([])
+
+def test_agr_convex_hull_matches_brute_force():
+    rng = random.Random(7)
+    polygons = [tuple((rng.uniform(0, 30), rng.uniform(0, 30)) for _ in range(rng.randint(3, 6)))
+                for _ in range(40)]
+    expected = _brute_force_hull([p for poly in polygons for p in poly])
+    hull = agr_convex_hull(iter(polygons))
+    assert set(hull) == expected
+    assert agr_convex_hull(PolygonBatch.from_polygons(polygons)) == hull
+    # обход против часовой стрелки: все повороты положительные
+    n = len(hull)
+    assert all(_pseudo_turn(hull[i], hull[(i + 1) % n], hull[(i + 2) % n]) > 0 for i in range(n))
+
+def _pseudo_turn(a, b, c):
+    return (b[0] - a[0])*(c[1] - a[1]) - (b[1] - a[1])*(c[0] - a[0])
+
+def test_agr_convex_hull_bounded_buffer(monkeypatch):
+    # маленький буфер: оболочка сливается много раз, результат тот же
+    polygons = gen_random_polygon_batch(500, rng=1, packed=False)
+    expected = agr_convex_hull(polygons)
+    monkeypatch.setattr(aggregates, '_HULL_BUFFER', 16)
+    acc = aggregates.ConvexHullAccumulator()
+    for poly in polygons:
+        acc.update(poly)
+        assert len(acc._buffer) <= 16 + 13
+    assert acc.result() == expected
+
+def test_agr_convex_hull_strip():
+    strip = gen_reg_polygon_seq(6, n_figs=100)
+    assert agr_convex_hull(strip) == agr_convex_hull(iter(list(strip)))
+    with pytest.raises(ValueError):
+        agr_convex_hull(gen_reg_polygon_seq(6))
+
+# ───── agr_nearest_vertex ─────
+def _brute_nearest_vertex(polygons, point):
+    return min((math.dist(v, point), k) for k, poly in enumerate(polygons) for v in poly)
+
+def test_agr_nearest_vertex_matches_brute_force(monkeypatch):
+    polygons = gen_random_polygon_batch(300, rng=4, packed=False)
+    point = (17.5, 31.2)
+    expected = _brute_nearest_vertex(polygons, point)
+    distance, k = agr_nearest_vertex(iter(polygons), point)
+    assert k == expected[1] and math.isclose(distance, expected[0])
+    assert agr_nearest_vertex(PolygonBatch.from_polygons(polygons), point) == (distance, k)
+    # маленькие пакеты: номер многоугольника считается сквозь границы пакетов
+    monkeypatch.setattr(aggregates, '_NEAREST_CHUNK', 7)
+    assert agr_nearest_vertex(iter(polygons), point) == (distance, k)
+
+def test_agr_nearest_vertex_ties_and_empty():
+    # равные расстояния – наименьший номер многоугольника; пустые многоугольники пропускаются
+    assert agr_nearest_vertex([(), SQUARE, SQUARE], (2, 2)) == (math.sqrt(2), 1)
+    with pytest.raises(ValueError):
+        agr_nearest_vertex([])
+    with pytest.raises(ValueError):
+        agr_nearest_vertex([()])
+
+@pytest.mark.parametrize("step, point", [(1, (7.3, 4)), (-2.5, (-11, -1)), (0.7, (-5, 0)), (0, (3, 3))])
+def test_agr_nearest_vertex_strip(step, point):
+    strip = gen_reg_polygon_seq(5, step=step, n_figs=30, l=2)
+    distance, k = agr_nearest_vertex(strip, point)
+    expected = _brute_nearest_vertex(list(strip), point)
+    assert math.isclose(distance, expected[0], rel_tol=1e-9)
+    assert math.isclose(math.dist(min(strip[k], key=lambda v: math.dist(v, point)), point), distance, rel_tol=1e-9)
+    assert math.isclose(agr_origin_nearest(strip), agr_origin_nearest(iter(list(strip))), rel_tol=1e-9)
+
+def test_agr_nearest_vertex_infinite_strip():
+    # ближайшая фигура бесконечной ленты находится рядом с точкой, а не среди первых фигур
+    strip = gen_reg_polygon_seq(4, step=1, l=2)
+    point = (10**6 + 0.5, 1)
+    distance, k = agr_nearest_vertex(strip, point)
+    window = [strip[j] for j in range(k - 5, k + 6)]
+    assert math.isclose(distance, _brute_nearest_vertex(window, point)[0], rel_tol=1e-9)
+    assert abs(strip[k][0][0] - point[0]) < 5
+
+# ───── agr_closest_pair ─────
+def _brute_closest_pair(polygons):
+    def segment(p, a, b):
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        length = dx*dx + dy*dy
+        t = max(0.0, min(1.0, ((p[0] - a[0])*dx + (p[1] - a[1])*dy) / length)) if length else 0.0
+        return math.hypot(p[0] - a[0] - t*dx, p[1] - a[1] - t*dy)
+
+    def gap(a0, a1, b0, b1):
+        # пересекающиеся отрезки – 0, иначе расстояние достигается в конце одного из них
+        if _pseudo_turn(a0, a1, b0)*_pseudo_turn(a0, a1, b1) < 0 and _pseudo_turn(b0, b1, a0)*_pseudo_turn(b0, b1, a1) < 0:
+            return 0.0
+        return min(segment(a0, b0, b1), segment(a1, b0, b1), segment(b0, a0, a1), segment(b1, a0, a1))
+
+    def edges(poly):
+        return [(poly[i], poly[(i + 1) % len(poly)]) for i in range(len(poly))]
+
+    vertex, edge = (math.inf,), (math.inf,)
+    for (i, p), (j, q) in itertools.combinations(enumerate(polygons), 2):
+        vertex = min(vertex, (min(math.dist(a, b) for a in p for b in q), i, j))
+        edge = min(edge, (min(gap(*e, *f) for e in edges(p) for f in edges(q)), i, j))
+    return vertex, edge
+
+def test_agr_closest_pair_matches_brute_force():
+    rng = random.Random(11)
+    polygons = [tuple((cx + r*math.cos(t), cy + r*math.sin(t)) for t in sorted(rng.uniform(0, 2*math.pi) for _ in range(5)))
+                for cx, cy, r in ((rng.uniform(0, 40), rng.uniform(0, 40), rng.uniform(0.2, 2)) for _ in range(60))]
+    vertex, edge = _brute_closest_pair(polygons)
+    result = agr_closest_pair(iter(polygons))
+    assert math.isclose(result['vertex'][0], vertex[0])
+    assert math.isclose(result['edge'][0], edge[0], abs_tol=1e-12)
+    # возвращенная пара действительно находится на найденном расстоянии
+    i, j = result['vertex'][1:]
+    assert i < j and math.isclose(min(math.dist(a, b) for a in polygons[i] for b in polygons[j]), vertex[0])
+    assert agr_closest_pair(PolygonBatch.from_polygons(polygons), kinds=('edge',)) == {'edge': result['edge']}
+
+def test_agr_closest_pair_layout():
+    # сетка квадратов с зазором 0.25 и одним сдвинутым квадратом, ближе всех подходящим к соседу
+    squares = [tr_translate(SQUARE, 1.25*x, 1.25*y) for y in range(20) for x in range(20)]
+    squares[47] = tr_translate(squares[47], 0.2, 0)
+    result = agr_closest_pair(squares)
+    assert result['edge'][1:] == (47, 48) and math.isclose(result['edge'][0], 0.05)
+    assert result['vertex'][1:] == (47, 48) and math.isclose(result['vertex'][0], 0.05)
+    # касание и пересечение дают нулевой зазор по рёбрам, но не по вершинам
+    touching = agr_closest_pair([SQUARE, ((0.5, 0.5), (3, 0.5), (3, 3))])
+    assert touching['edge'] == (0.0, 0, 1) and touching['vertex'][0] > 0
+
+def test_agr_closest_pair_strip():
+    for strip in (gen_reg_polygon_seq(5, step=0.7, n_figs=12, l=2), gen_reg_polygon_seq(4, step=-3.3, n_figs=7, l=2)):
+        expected = agr_closest_pair(list(strip))
+        for kind, (distance, i, j) in agr_closest_pair(strip).items():
+            assert math.isclose(distance, expected[kind][0], abs_tol=1e-9)
+            assert i == 0 and j >= 1
+    infinite = agr_closest_pair(gen_reg_polygon_seq(6, step=0.4, l=2))
+    assert math.isclose(infinite['edge'][0], 0.4) and infinite['edge'][1:] == (0, 1)
+
+def test_agr_closest_pair_errors():
+    with pytest.raises(ValueError):
+        agr_closest_pair([SQUARE, ()])
+    with pytest.raises(ValueError):
+        agr_closest_pair(gen_reg_polygon_seq(4, n_figs=1))
+    with pytest.raises(ValueError):
+        agr_closest_pair([SQUARE, SQUARE], kinds=('face',))
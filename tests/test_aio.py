@@ -0,0 +1,135 @@
+import asyncio
+import concurrent.futures
+import functools
+import math
+import pytest
+
+from polyseq.aio import (agen_reg_polygon_seq, agen_random_polygon_seq, amap, afilter, aagr, aagr_area,
+                         aagr_perimeter, aagr_max_side, aagr_convex_hull)
+from polyseq.aggregates import agr_area, agr_perimeter, agr_max_side, agr_convex_hull, AreaAccumulator
+from polyseq.filters import flt_convex_polygon
+from polyseq.generators import gen_reg_polygon_seq, gen_random_polygon_batch
+from polyseq.transformers import tr_rotate
+
+
+@pytest.fixture(scope='module')
+def polygons():
+    return gen_random_polygon_batch(500, rng=11, packed=False)
+
+
+async def collect(async_seq):
+    return [poly async for poly in async_seq]
+
+
+async def from_queue(polys):
+    # источник, имитирующий очередь: многоугольники приходят по одному с переключением задач
+    for poly in polys:
+        await asyncio.sleep(0)
+        yield poly
+
+
+# ───── генераторы ─────
+def test_agen_reg_polygon_seq_matches_strip():
+    strip = gen_reg_polygon_seq(n_sides=5, step=0.5, n_figs=2500, l=2)
+    assert asyncio.run(collect(agen_reg_polygon_seq(5, step=0.5, n_figs=2500, l=2, chunk_size=300))) == list(strip)
+
+    async def first(n):
+        result = []
+        async for poly in agen_reg_polygon_seq(4):
+            result.append(poly)
+            if len(result) == n:
+                return result
+    assert asyncio.run(first(7)) == list(gen_reg_polygon_seq(4)[:7])
+
+def test_agen_random_polygon_seq_reproducible():
+    first = asyncio.run(collect(agen_random_polygon_seq(250, rng=3, chunk_size=64)))
+    second = asyncio.run(collect(agen_random_polygon_seq(250, n_sides=None, rng=3, chunk_size=64)))
+    assert len(first) == 250 and first == second
+    assert all(len(poly) == 6 for poly in asyncio.run(collect(agen_random_polygon_seq(10, n_sides=6))))
+
+def test_agen_validation_is_eager():
+    with pytest.raises(ValueError):
+        agen_reg_polygon_seq(2)
+    with pytest.raises(ValueError):
+        agen_random_polygon_seq(1.5)
+    with pytest.raises(ValueError):
+        agen_random_polygon_seq(10, n_sides=2)
+    with pytest.raises(ValueError):
+        amap(tr_rotate, [], chunk_size=0)
+
+
+# ───── стадии ─────
+def test_amap_afilter_match_sync(polygons):
+    rotate = functools.partial(tr_rotate, angle=30)
+    expected = list(filter(flt_convex_polygon, map(rotate, polygons)))
+    stages = afilter(flt_convex_polygon, amap(rotate, from_queue(polygons), chunk_size=32), chunk_size=17)
+    assert asyncio.run(collect(stages)) == expected
+    assert asyncio.run(collect(amap(rotate, iter(polygons), chunk_size=64, max_pending=4))) == list(map(rotate, polygons))
+
+def test_process_pool_executor(polygons):
+    rotate = functools.partial(tr_rotate, angle=45)
+
+    async def run(executor):
+        rotated = amap(rotate, polygons, chunk_size=100, executor=executor)
+        return await collect(rotated), await aagr_area(polygons, chunk_size=100, executor=executor)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        rotated, area = asyncio.run(run(executor))
+    assert rotated == list(map(rotate, polygons))
+    assert math.isclose(area, agr_area(polygons))
+
+def test_backpressure_bounds_reads():
+    read = 0
+
+    def source():
+        nonlocal read
+        for poly in gen_reg_polygon_seq(4):
+            read += 1
+            yield poly
+
+    async def consume():
+        seq = amap(functools.partial(tr_rotate, angle=10), source(), chunk_size=10, max_pending=3)
+        async for _ in seq:
+            break
+        await asyncio.sleep(0.05)
+        reads = read
+        await seq.aclose()
+        return reads
+
+    # бесконечный источник читается не дальше max_pending блоков (и одного блока в потоке чтения)
+    assert asyncio.run(consume()) <= 10*(3 + 1)
+
+
+# ───── агрегаты ─────
+@pytest.mark.parametrize('aaggregate, aggregate', [(aagr_area, agr_area), (aagr_perimeter, agr_perimeter),
+                                                   (aagr_max_side, agr_max_side)])
+def test_aggregates_match_sync(polygons, aaggregate, aggregate):
+    assert math.isclose(asyncio.run(aaggregate(from_queue(polygons), chunk_size=64)), aggregate(polygons))
+
+def test_convex_hull_accumulator_and_strip(polygons):
+    assert asyncio.run(aagr_convex_hull(iter(polygons), chunk_size=50)) == agr_convex_hull(polygons)
+    assert math.isclose(asyncio.run(aagr(polygons, AreaAccumulator)), agr_area(polygons))
+    # лента – по замкнутой формуле, в том числе бесконечная
+    assert asyncio.run(aagr_area(gen_reg_polygon_seq(6))) == math.inf
+    with pytest.raises(ValueError):
+        asyncio.run(aagr(polygons, len))
+    with pytest.raises(ValueError):
+        asyncio.run(aagr_max_side([]))
+
+def test_event_loop_stays_responsive():
+    async def run():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(heartbeat())
+        area = await aagr_area(agen_random_polygon_seq(20000, rng=1, chunk_size=2000))
+        task.cancel()
+        return area, ticks
+
+    area, ticks = asyncio.run(run())
+    assert area > 0 and ticks > 10
@@ -0,0 +1,106 @@
+import math
+import pytest
+import numpy as np
+
+from polyseq.batch import PolygonBatch
+from polyseq.aggregates import _area, _sides
+from polyseq.filters import flt_convex_polygon
+
+
+SQUARE = ((0,0), (1,0), (1,1), (0,1))
+TRIANGLE = ((0,0), (3,0), (1.5,2))
+
+
+# ───── упаковка / распаковка ─────
+def test_from_polygons_layout():
+    batch = PolygonBatch.from_polygons([SQUARE, TRIANGLE])
+    assert len(batch) == 2
+    assert batch.n_vertices == 7
+    assert batch.offsets.tolist() == [0, 4, 7]
+    assert batch.counts.tolist() == [4, 3]
+    assert batch.coords.shape == (7, 2)
+
+def test_roundtrip():
+    polys = (SQUARE, TRIANGLE, SQUARE)
+    batch = PolygonBatch.from_polygons(iter(polys))  # достаточно одного прохода итератора
+    assert batch.to_polygons() == polys
+    assert tuple(batch) == polys
+
+def test_empty():
+    batch = PolygonBatch.from_polygons([])
+    assert len(batch) == 0
+    assert batch.to_polygons() == ()
+
+def test_from_batch_returns_same_object():
+    batch = PolygonBatch.from_polygons([SQUARE])
+    assert PolygonBatch.from_polygons(batch) is batch
+
+
+# ───── доступ к элементам ─────
+def test_getitem_int():
+    batch = PolygonBatch.from_polygons([SQUARE, TRIANGLE])
+    assert batch[1] == TRIANGLE
+    assert batch[-1] == TRIANGLE
+    with pytest.raises(IndexError):
+        batch[2]
+
+def test_getitem_slice():
+    batch = PolygonBatch.from_polygons([SQUARE, TRIANGLE, SQUARE])
+    assert batch[1:].to_polygons() == (TRIANGLE, SQUARE)
+    assert batch[::2].to_polygons() == (SQUARE, SQUARE)
+    assert len(batch[2:1]) == 0
+
+def test_vertices_is_view():
+    batch = PolygonBatch.from_polygons([SQUARE, TRIANGLE])
+    view = batch.vertices(1)
+    assert np.shares_memory(view, batch.coords)
+    assert view.tolist() == [list(v) for v in TRIANGLE]
+
+
+# ───── проверка аргументов ─────
+def test_inconsistent_offsets():
+    with pytest.raises(ValueError):
+        PolygonBatch(np.zeros((3, 2)), [0, 2])
+    with pytest.raises(ValueError):
+        PolygonBatch(np.zeros((3, 2)), [0, 2, 1, 3])
+
+
+# ───── метрики многоугольников ─────
+def test_next_vertex_closes_polygons():
+    batch = PolygonBatch.from_polygons([SQUARE, TRIANGLE])
+    assert batch.next_vertex().tolist() == [1, 2, 3, 0, 5, 6, 4]
+    assert batch.polygon_ids().tolist() == [0, 0, 0, 0, 1, 1, 1]
+
+def test_metrics_match_scalar():
+    polys = [SQUARE, TRIANGLE, ((0,0), (2,0), (1,1), (2,2), (0,2))]
+    batch = PolygonBatch.from_polygons(polys)
+    assert np.allclose(batch.areas(), [_area(p) for p in polys])
+    assert np.allclose(batch.perimeters(), [sum(_sides(p)) for p in polys])
+    assert np.allclose(batch.max_sides(), [max(_sides(p)) for p in polys])
+    assert np.allclose(batch.min_sides(), [min(_sides(p)) for p in polys])
+
+def test_metrics_empty_polygon():
+    batch = PolygonBatch(np.array(SQUARE, dtype=float), [0, 0, 4])
+    assert batch.areas().tolist() == [0.0, 1.0]
+    assert batch.max_sides()[0] == -np.inf
+
+def test_signed_areas_and_convexity():
+    polys = [SQUARE, SQUARE[::-1], ((0,0), (2,0), (1,1), (2,2), (0,2))]
+    batch = PolygonBatch.from_polygons(polys)
+    assert batch.signed_areas().tolist() == [1.0, -1.0, 3.0]
+    assert batch.is_convex().tolist() == [flt_convex_polygon(p) for p in polys] == [True, True, False]
+
+def test_scanline_spans():
+    notch = ((0,0), (2,0), (1,1), (2,2), (0,2))
+    batch = PolygonBatch.from_polygons([notch, SQUARE])
+    rows, polygons, left, right = batch.scanline_spans([0.5, 1.5])
+    assert rows.tolist() == [0, 1, 0]
+    assert polygons.tolist() == [0, 0, 1]
+    assert left.tolist() == [0, 0, 0]
+    assert right.tolist() == [1.5, 1.5, 1]
+
+def test_take():
+    polys = [SQUARE, TRIANGLE, ((0,0), (2,0), (1,1), (2,2), (0,2))]
+    batch = PolygonBatch.from_polygons(polys)
+    assert batch.take([2, 0]).to_polygons() == PolygonBatch.from_polygons([polys[2], polys[0]]).to_polygons()
+    assert len(batch.take([])) == 0
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 import pytest
 
 from polyseq.filters import (
@@ -10,7 +11,12 @@ from polyseq.filters import (
     flt_shortest_side_lt,
     flt_point_inside,
     flt_polygon_vertices,
+    flt_polygons_intersect,
+    flt_point_inside_simple,
+    flt_points_inside_batch,
+    flt_points_inside_hits,
 )
+from polyseq.generators import gen_random_polygon_batch
 
 
 # Простые тестовые многоугольники
@@ -101,3 +107,52 @@ def test_flt_polygon_vertices_false():
     base = ((0,0), (1,1))
     poly = ((2,2), (3,3), (4,4))
     assert flt_polygon_vertices(poly, base) is False
+
+
+# ───── flt_point_inside_simple / flt_points_inside_* ─────
+def test_flt_point_inside_simple_nonconvex():
+    # точка в "кармане" невыпуклого многоугольника – снаружи, в основной части – внутри
+    assert flt_point_inside_simple(NON_CONVEX, (1.5, 1)) is False
+    assert flt_point_inside_simple(NON_CONVEX, (0.5, 1)) is True
+    assert flt_point_inside_simple(NON_CONVEX, (1.5, 0.25)) is True
+    assert flt_point_inside_simple(NON_CONVEX, (1, 1)) is True  # вершина
+    assert flt_point_inside_simple(SQUARE, (0.5, 0)) is True    # ребро
+    assert flt_point_inside_simple(SQUARE, (1.5, 0.5)) is False
+
+def test_flt_point_inside_simple_matches_convex_fast_path():
+    rng = np.random.default_rng(0)
+    for x, y in rng.uniform(-0.5, 1.5, size=(200, 2)):
+        assert flt_point_inside_simple(TRIANGLE, (x, y)) == flt_point_inside(TRIANGLE, (x, y))
+
+def test_flt_points_inside_batch_matches_scalar():
+    polys = gen_random_polygon_batch(40, rng=1, packed=False) + (SQUARE, NON_CONVEX)
+    rng = np.random.default_rng(2)
+    points = np.vstack((rng.uniform(-5, 55, size=(500, 2)), [(0.5, 0), (1.5, 1), (1, 1)]))
+    matrix = flt_points_inside_batch(polys, points)
+    assert matrix.shape == (len(points), len(polys))
+    expected = np.array([[flt_point_inside_simple(p, tuple(pt)) for p in polys] for pt in points])
+    assert (matrix == expected).all()
+    assert matrix.any()
+
+def test_flt_points_inside_hits_pairs():
+    hits = flt_points_inside_hits([SQUARE, NON_CONVEX], [(0.5, 0.5), (5, 5), (1.5, 1)])
+    assert hits.tolist() == [[0, 0], [0, 1]]
+    assert flt_points_inside_hits([SQUARE], np.empty((0, 2))).shape == (0, 2)
+
+
+# ───── flt_polygons_intersect ─────
+def test_flt_polygons_intersect_convex():
+    shifted = tuple((x + 0.5, y + 0.5) for x, y in SQUARE)
+    far = tuple((x + 3, y) for x, y in SQUARE)
+    touching = tuple((x + 1, y + 1) for x, y in SQUARE)  # касание в вершине (1, 1)
+    assert flt_polygons_intersect(SQUARE, shifted) is True
+    assert flt_polygons_intersect(SQUARE, far) is False
+    assert flt_polygons_intersect(SQUARE, touching) is True
+
+def test_flt_polygons_intersect_nested_and_non_convex():
+    big = ((-5, -5), (5, -5), (5, 5), (-5, 5))
+    in_notch = ((1.6, 0.9), (1.9, 0.9), (1.9, 1.1), (1.6, 1.1))  # в «выемке» NON_CONVEX
+    assert flt_polygons_intersect(big, SQUARE) is True
+    assert flt_polygons_intersect(SQUARE, big) is True
+    assert flt_polygons_intersect(NON_CONVEX, in_notch) is False
+    assert flt_polygons_intersect(NON_CONVEX, ((0.5, 0.5), (3, 0.5), (3, 0.7))) is True
@@ -1,6 +1,8 @@
 import math
 import itertools
 import random
+import subprocess
+import sys
 import pytest
 
 from polyseq.generators import (
@@ -8,7 +10,11 @@ from polyseq.generators import (
     _random_polygon,
     gen_reg_polygon_seq,
     gen_random_polygon_seq,
+    RegPolygonSeq,
+    gen_random_polygon_batch,
+    random_substreams,
 )
+from polyseq.batch import PolygonBatch
 from polyseq.transformers import tr_translate
 
 
@@ -118,4 +124,108 @@ def test_random_seq_count():
     """
     polys = list(gen_random_polygon_seq(n_figs=5, n_sides=4))
     assert len(polys) == 5
-    assert all(len(p) == 4 for p in polys)
\ No newline at end of file
+    assert all(len(p) == 4 for p in polys)
+
+def test_reg_sequence_is_reiterable_strip():
+    """
+    gen_reg_polygon_seq возвращает RegPolygonSeq с параметрами ленты;
+    как и range, её можно обходить несколько раз.
+    """
+    seq = gen_reg_polygon_seq(5, step=2, n_figs=3.0, l=1.5)
+    assert isinstance(seq, RegPolygonSeq)
+    assert (seq.n_sides, seq.step, seq.n_figs, seq.l) == (5, 2, 3, 1.5)
+    assert list(seq) == list(seq)
+    assert len(list(seq)) == 3
+
+
+def test_reg_sequence_validation_is_eager():
+    with pytest.raises(ValueError):
+        gen_reg_polygon_seq(2)
+    with pytest.raises(ValueError):
+        gen_reg_polygon_seq(4, n_figs=2.5)
+
+
+# ─────────────────────────── произвольный доступ к ленте ─────────
+def test_reg_sequence_random_access():
+    seq = gen_reg_polygon_seq(6, step=0.5, n_figs=10, l=2)
+    polys = list(seq)
+    assert len(seq) == 10
+    assert seq[3] == polys[3]
+    assert seq[-1] == polys[-1]
+    with pytest.raises(IndexError):
+        seq[10]
+
+
+@pytest.mark.parametrize("item", [slice(2, 8), slice(1, None, 3), slice(None, None, -2), slice(7, 2, -1)])
+def test_reg_sequence_slices(item):
+    seq = gen_reg_polygon_seq(3, step=1.5, n_figs=10, l=1)
+    sliced = seq[item]
+    assert isinstance(sliced, RegPolygonSeq)
+    expected = list(seq)[item]
+    assert len(sliced) == len(expected)
+    for p1, p2 in zip(sliced, expected):
+        for v1, v2 in zip(p1, p2):
+            assert math.isclose(v1[0], v2[0], abs_tol=1e-9)
+            assert math.isclose(v1[1], v2[1], abs_tol=1e-9)
+
+
+def test_reg_sequence_infinite_far_window():
+    """Окно 10^9..10^9+20 бесконечной ленты получается без перебора предыдущих фигур."""
+    seq = gen_reg_polygon_seq(4, step=1, l=1)
+    window = seq[10**9:10**9 + 20]
+    assert len(window) == 20
+    assert math.isclose(window[0][0][0], seq[10**9][0][0])
+    assert math.isclose(window[1][0][0] - window[0][0][0], seq.x_shift)
+    with pytest.raises(TypeError):
+        len(seq)
+    with pytest.raises(ValueError):
+        seq[-5:]
+    assert math.isinf(seq[5:].n_figs)
+
+
+# ─────────────────────────── импорт без matplotlib ───────────────
+def test_compute_modules_do_not_import_matplotlib():
+    """Модули генерации, преобразования, фильтрации и агрегации не тянут за собой matplotlib."""
+    code = ('import sys\n'
+            'import polyseq.generators, polyseq.transformers, polyseq.filters, polyseq.aggregates\n'
+            'assert "matplotlib" not in sys.modules, sorted(m for m in sys.modules if "matplotlib" in m)\n')
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+# ─────────────────────────── тесты gen_random_polygon_batch ──────
+def test_random_batch_shape_and_ranges():
+    batch = gen_random_polygon_batch(1000, rng=1)
+    assert isinstance(batch, PolygonBatch)
+    assert len(batch) == 1000
+    assert 3 <= batch.counts.min() and batch.counts.max() <= 13
+    # все вершины лежат не дальше 10 от центра из квадрата [0, 50]^2
+    assert batch.coords.min() >= -10 and batch.coords.max() <= 60
+
+
+def test_random_batch_fixed_sides():
+    batch = gen_random_polygon_batch(100, n_sides=5, rng=7)
+    assert batch.counts.tolist() == [5] * 100
+
+
+def test_random_batch_reproducible():
+    a = gen_random_polygon_batch(50, rng=123)
+    b = gen_random_polygon_batch(50, rng=123)
+    assert a.to_polygons() == b.to_polygons()
+    polys = gen_random_polygon_batch(5, n_sides=6, rng=123, packed=False)
+    assert isinstance(polys, tuple) and all(len(p) == 6 for p in polys)
+
+
+def test_random_substreams_independent_and_deterministic():
+    streams_1 = random_substreams(42, 3)
+    streams_2 = random_substreams(42, 3)
+    batches_1 = [gen_random_polygon_batch(10, rng=r).to_polygons() for r in streams_1]
+    batches_2 = [gen_random_polygon_batch(10, rng=r).to_polygons() for r in streams_2]
+    assert batches_1 == batches_2
+    assert len(set(batches_1)) == 3
+
+
+def test_random_batch_validation():
+    with pytest.raises(ValueError):
+        gen_random_polygon_batch(10, n_sides=2)
+    with pytest.raises(ValueError):
+        gen_random_polygon_batch(2.5)
@@ -0,0 +1,151 @@
+import math
+import random
+import pytest
+
+from polyseq.index import SpatialIndex
+from polyseq.filters import flt_point_inside_simple
+from polyseq.generators import gen_random_polygon_batch, gen_reg_polygon_seq
+
+
+SQUARE = ((0,0), (1,0), (1,1), (0,1))
+NON_CONVEX = ((0,0), (2,0), (1,1), (2,2), (0,2))
+
+
+def _distance(poly, point):
+    # эталон: 0 внутри, иначе минимум расстояний до рёбер
+    if flt_point_inside_simple(poly, point):
+        return 0.0
+    def seg(a, b):
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        t = max(0.0, min(1.0, ((point[0] - a[0])*dx + (point[1] - a[1])*dy) / (dx*dx + dy*dy)))
+        return math.hypot(point[0] - a[0] - t*dx, point[1] - a[1] - t*dy)
+    return min(seg(poly[i], poly[(i + 1) % len(poly)]) for i in range(len(poly)))
+
+
+@pytest.fixture(scope='module')
+def random_index():
+    polygons = gen_random_polygon_batch(300, rng=0, packed=False)
+    return polygons, SpatialIndex.from_polygons(polygons)
+
+
+# ───── построение ─────
+def test_insert_and_bulk_load_agree():
+    polygons = list(gen_reg_polygon_seq(4, n_figs=20))
+    bulk = SpatialIndex.from_polygons(polygons, cell_size=1.5)
+    incremental = SpatialIndex(1.5)
+    for poly in polygons:
+        incremental.insert(poly)
+    assert len(bulk) == len(incremental) == 20
+    assert bulk[3] == polygons[3]
+    assert bulk.query_bbox((5, -1, 9, 1)) == incremental.query_bbox((5, -1, 9, 1))
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        SpatialIndex(0)
+    index = SpatialIndex.from_polygons([SQUARE])
+    with pytest.raises(ValueError):
+        index.query_bbox((1, 0, 0, 1))
+    with pytest.raises(ValueError):
+        index.nearest((0, 0), k=0)
+
+def test_empty_index():
+    index = SpatialIndex(1.0)
+    assert index.query_point((0, 0)) == []
+    assert index.query_bbox((0, 0, 1, 1)) == []
+    assert index.nearest((0, 0)) == []
+
+
+def test_huge_polygon_is_kept_outside_grid():
+    # один огромный многоугольник среди мелких не должен регистрироваться в миллионах ячеек
+    polygons = gen_random_polygon_batch(200, rng=3, packed=False)
+    index = SpatialIndex.from_polygons(polygons)
+    cells = len(index._cells)
+    huge = ((-2e4, -2e4), (2e4, -2e4), (2e4, 2e4), (-2e4, 2e4))
+    k = index.insert(huge)
+    assert len(index._cells) == cells and index._oversized == [k]
+    # огромный многоугольник находят все запросы, в том числе далеко от остальных
+    assert k in index.query_point((25, 25)) and index.query_point((1e4, 1e4)) == [k]
+    assert index.query_bbox((9e3, 9e3, 9.1e3, 9.1e3)) == [k]
+    assert k not in index.query_bbox((0, 0, 50, 50), inside=True)
+    assert index.nearest((1e4, 1e4)) == [(0.0, k)]
+    assert index.nearest((3e4, 0)) == [(1e4, k)]
+    expected = sorted((_distance(poly, (25, 25)), j) for j, poly in enumerate((*polygons, huge)))[:5]
+    assert [j for _, j in index.nearest((25, 25), k=5)] == [j for _, j in expected]
+
+    # индекс только из огромного многоугольника
+    alone = SpatialIndex(1)
+    alone.insert(huge)
+    assert alone.query_point((0, 0)) == [0] and alone.query_bbox((5, 5, 6, 6)) == [0]
+    assert alone.nearest((5e4, 2e4)) == [(3e4, 0)]
+
+def test_sparse_outlier_does_not_blow_up_queries():
+    # один далекий многоугольник растягивает сетку на ~10^8 ячеек, почти все пустые
+    class CountingCells(dict):
+        lookups = 0
+        def get(self, *args):
+            CountingCells.lookups += 1
+            return super().get(*args)
+
+    polygons = gen_random_polygon_batch(1000, rng=3, packed=False)
+    outlier = tuple((x + 1e5, y + 1e5) for x, y in polygons[0])
+    index = SpatialIndex.from_polygons((*polygons, outlier))
+    index._cells = CountingCells(index._cells)
+    bound = 4*len(index._cells)
+
+    point = (5e4, 5e4)
+    expected = sorted((_distance(poly, point), j) for j, poly in enumerate((*polygons, outlier)))[:3]
+    assert [j for _, j in index.nearest(point, k=3)] == [j for _, j in expected]
+    assert CountingCells.lookups <= bound
+
+    CountingCells.lookups = 0
+    assert index.query_bbox((0, 0, 1e5, 1e5)) == list(range(len(polygons)))
+    assert index.query_bbox((-1e6, -1e6, 2e6, 2e6)) == list(range(len(polygons) + 1))
+    assert index.query_bbox((2e4, 2e4, 3e4, 3e4)) == []
+    assert CountingCells.lookups <= bound
+
+
+# ───── query_point ─────
+def test_query_point_non_convex_and_boundary():
+    index = SpatialIndex.from_polygons([SQUARE, NON_CONVEX])
+    assert index.query_point((0.5, 0.5)) == [0, 1]
+    assert index.query_point((1.5, 1.0)) == []   # в «выемке» невыпуклого многоугольника
+    assert index.query_point((1, 1)) == [0, 1]   # на границе обоих
+
+def test_query_point_matches_linear_scan(random_index):
+    polygons, index = random_index
+    rng = random.Random(1)
+    for _ in range(200):
+        point = (rng.uniform(-5, 55), rng.uniform(-5, 55))
+        expected = [k for k, poly in enumerate(polygons) if flt_point_inside_simple(poly, point)]
+        assert index.query_point(point) == expected
+
+
+# ───── query_bbox ─────
+def test_query_bbox_matches_linear_scan(random_index):
+    polygons, index = random_index
+    window = (10, 20, 18, 25)
+    def bbox(poly):
+        xs, ys = zip(*poly)
+        return min(xs), min(ys), max(xs), max(ys)
+    intersecting = [k for k, p in enumerate(polygons)
+                    if bbox(p)[0] <= 18 and bbox(p)[2] >= 10 and bbox(p)[1] <= 25 and bbox(p)[3] >= 20]
+    inside = [k for k, p in enumerate(polygons)
+              if bbox(p)[0] >= 10 and bbox(p)[2] <= 18 and bbox(p)[1] >= 20 and bbox(p)[3] <= 25]
+    assert index.query_bbox(window) == intersecting
+    assert index.query_bbox(window, inside=True) == inside
+
+
+# ───── nearest ─────
+def test_nearest_matches_linear_scan(random_index):
+    polygons, index = random_index
+    for point in ((25, 25), (-40, 10), (100, 100), (0, 60)):
+        expected = sorted((_distance(poly, point), k) for k, poly in enumerate(polygons))[:5]
+        result = index.nearest(point, k=5)
+        assert [k for _, k in result] == [k for _, k in expected]
+        assert all(math.isclose(a, b, abs_tol=1e-12) for (a, _), (b, _) in zip(result, expected))
+
+def test_nearest_returns_all_when_k_exceeds_size():
+    index = SpatialIndex.from_polygons([SQUARE, NON_CONVEX])
+    assert index.nearest((10, 10), k=5) == sorted(index.nearest((10, 10), k=5))
+    assert [k for _, k in index.nearest((10, 10), k=5)] == [1, 0]
+    assert index.nearest((0.5, 0.5), k=1) == [(0.0, 0)]
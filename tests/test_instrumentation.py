@@ -0,0 +1,93 @@
+import math
+import time
+import pytest
+
+from polyseq import instrumentation
+from polyseq.instrumentation import enable, disable, reset, snapshot, Reporter
+from polyseq.generators import gen_reg_polygon_seq, gen_random_polygon_seq, gen_random_polygon_batch
+from polyseq.transformers import tr_rotate, tr_translate_batch, Transform
+from polyseq.filters import flt_convex_polygon, flt_point_inside, flt_polygons_intersect
+from polyseq.aggregates import agr_area, agr_perimeter, agr_convex_hull
+
+
+SQUARE = ((0,0), (1,0), (1,1), (0,1))
+TRIANGLE = ((0,0), (3,0), (1.5,2))
+
+
+@pytest.fixture(autouse=True)
+def clean_stats():
+    reset()
+    yield
+    disable()
+    reset()
+
+
+def test_disabled_by_default_records_nothing():
+    assert not instrumentation.is_enabled()
+    tr_rotate(SQUARE, 30)
+    agr_area([SQUARE])
+    assert snapshot() == {}
+
+
+def test_per_function_counters():
+    enable()
+    polys = [SQUARE, TRIANGLE, SQUARE]
+    list(map(lambda p: tr_rotate(p, 30), polys))
+    list(filter(flt_convex_polygon, polys))
+    list(map(Transform.rotate(10), polys))
+    stats = snapshot()
+    assert stats['tr_rotate']['calls'] == 3
+    assert stats['tr_rotate']['polygons'] == 3
+    assert stats['tr_rotate']['vertices'] == 11
+    assert stats['tr_rotate']['stage'] == 'transform'
+    assert stats['flt_convex_polygon']['stage'] == 'filter'
+    assert stats['Transform']['polygons'] == 3
+
+
+def test_internal_calls_are_not_recorded():
+    # внутренние проверки выпуклости не выдаются за пользовательский фильтр
+    enable()
+    flt_point_inside(SQUARE, (0.5, 0.5))
+    flt_polygons_intersect(SQUARE, TRIANGLE)
+    agr_convex_hull([SQUARE, TRIANGLE])
+    stats = snapshot()
+    assert stats['flt_point_inside']['calls'] == 1
+    assert 'flt_convex_polygon' not in stats
+
+
+def test_lazy_pipeline_stages():
+    enable()
+    seq = map(lambda p: tr_rotate(p, 45), gen_reg_polygon_seq(4, n_figs=50))
+    agr_area(seq)
+    stats = snapshot()
+    for name in ('gen_reg_polygon_seq', 'agr_area'):
+        assert stats[name]['polygons'] == 50
+    assert stats['tr_rotate']['polygons'] == 51  # +1: поворот базового многоугольника ленты
+    assert stats['agr_area']['vertices'] == 200
+    assert stats['agr_area']['stage'] == 'aggregate'
+    assert stats['gen_reg_polygon_seq']['stage'] == 'generate'
+    assert stats['agr_area']['seconds'] >= 0
+
+
+def test_sequences_and_batches():
+    enable()
+    agr_perimeter(gen_reg_polygon_seq(3, n_figs=10**6))  # замкнутая формула: лента не оборачивается
+    batch = gen_random_polygon_batch(100, n_sides=5, rng=0)
+    tr_translate_batch(batch, 1, 1)
+    list(gen_random_polygon_seq(7, n_sides=4))
+    stats = snapshot()
+    assert stats['agr_perimeter']['polygons'] == 10**6
+    assert stats['gen_random_polygon_batch']['vertices'] == 500
+    assert stats['tr_translate_batch']['polygons'] == 100
+    assert stats['gen_random_polygon_seq']['polygons'] == 7
+    assert stats['gen_random_polygon_seq']['calls'] == 1
+
+
+def test_reporter_callback():
+    reports = []
+    with Reporter(interval=0.05, callback=reports.append):
+        for _ in range(100):
+            tr_rotate(SQUARE, 1)
+        time.sleep(0.2)
+    assert reports
+    assert sum(r['tr_rotate']['polygons'] for r in reports if 'tr_rotate' in r) == 100
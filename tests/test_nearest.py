@@ -0,0 +1,154 @@
+import math
+import random
+import numpy as np
+import pytest
+
+from polyseq.nearest import NearestIndex, _segment_pair_distances
+from polyseq.batch import PolygonBatch
+from polyseq.filters import flt_point_inside_simple
+from polyseq.generators import gen_random_polygon_batch, gen_reg_polygon_seq
+
+
+SQUARE = ((0,0), (1,0), (1,1), (0,1))
+
+
+def _segment(point, a, b):
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length = dx*dx + dy*dy
+    t = max(0.0, min(1.0, ((point[0] - a[0])*dx + (point[1] - a[1])*dy) / length)) if length else 0.0
+    return math.hypot(point[0] - a[0] - t*dx, point[1] - a[1] - t*dy)
+
+
+def _brute_force(polygons, point, kind):
+    # эталон: список (расстояние, номер элемента, номер многоугольника) для всех элементов
+    result, vertex = [], 0
+    for k, poly in enumerate(polygons):
+        if kind == 'polygon':
+            if poly:
+                inside = flt_point_inside_simple(poly, point)
+                edges = (_segment(point, poly[i], poly[(i + 1) % len(poly)]) for i in range(len(poly)))
+                result.append((0.0 if inside else min(edges), k, k))
+            continue
+        for i, v in enumerate(poly):
+            d = math.dist(v, point) if kind == 'vertex' else _segment(point, v, poly[(i + 1) % len(poly)])
+            result.append((d, vertex + i, k))
+        vertex += len(poly)
+    return result
+
+
+@pytest.fixture(scope='module')
+def polygons():
+    return gen_random_polygon_batch(400, rng=5, packed=False)
+
+
+@pytest.fixture(scope='module')
+def points():
+    rng = random.Random(2)
+    return [(rng.uniform(-10, 60), rng.uniform(-10, 60)) for _ in range(60)]
+
+
+# ───── k ближайших ─────
+@pytest.mark.parametrize("kind", ['vertex', 'edge', 'polygon'])
+@pytest.mark.parametrize("leaf_size", [1, 16])
+def test_query_matches_brute_force(polygons, points, kind, leaf_size):
+    index = NearestIndex.from_polygons(polygons, kind=kind, leaf_size=leaf_size)
+    distances, polys, items = index.query(points, k=4)
+    assert distances.shape == polys.shape == items.shape == (len(points), 4)
+    for row, point in enumerate(points):
+        expected = sorted(_brute_force(polygons, point, kind), key=lambda item: item[:2])[:4]
+        assert np.allclose(distances[row], [d for d, _, _ in expected])
+        # равные расстояния встречаются редко, поэтому номера сравниваются как множества
+        assert set(items[row].tolist()) == {i for _, i, _ in expected}
+        assert polys[row].tolist() == [index._polygon_of[i] for i in items[row]]
+
+def test_query_ties_and_padding():
+    # сетка из квадратов: у точки (1, 1) четыре вершины на расстоянии 0 – порядок по номеру вершины
+    grid = [tuple((x + dx, y + dy) for dx, dy in SQUARE) for x in range(3) for y in range(3)]
+    index = NearestIndex.from_polygons(grid, leaf_size=2)
+    distances, polys, items = index.query((1, 1), k=4)
+    assert distances.tolist() == [[0, 0, 0, 0]]
+    assert items[0].tolist() == sorted(items[0].tolist())
+    assert polys[0].tolist() == [0, 1, 3, 4]
+
+    # элементов меньше k – хвост заполнен inf и -1
+    distances, polys, items = NearestIndex.from_polygons([SQUARE], kind='polygon').query([(3, 1), (0.5, 0.5)], k=3)
+    assert distances[:, 0].tolist() == [2, 0] and np.isinf(distances[:, 1:]).all()
+    assert (polys[:, 1:] == -1).all() and (items[:, 1:] == -1).all()
+
+def test_query_edge_pieces_are_not_duplicated():
+    # длинное ребро разбивается на куски, но в ответе встречается один раз
+    long_rect = ((0, 0), (100, 0), (100, 1), (0, 1))
+    index = NearestIndex.from_polygons([long_rect] + [SQUARE]*3, kind='edge', leaf_size=1)
+    distances, polys, items = index.query((50, -2), k=3)
+    assert items[0, 0] == 0 and len(set(items[0].tolist())) == 3
+    assert math.isclose(distances[0, 0], 2)
+
+def test_query_strip_and_empty_polygons():
+    strip = gen_reg_polygon_seq(6, n_figs=50, l=1)
+    batch = PolygonBatch.from_polygons([()] + list(strip) + [()])
+    distances, polys, _ = NearestIndex(batch, kind='polygon').query([(30.2, 0), (-5, 0)], k=1)
+    assert distances[0, 0] == 0 and strip[polys[0, 0] - 1] == batch[polys[0, 0]]
+    assert polys[1, 0] == 1
+
+
+# ───── поиск в радиусе ─────
+@pytest.mark.parametrize("kind", ['vertex', 'edge', 'polygon'])
+def test_query_radius_matches_brute_force(polygons, points, kind):
+    index = NearestIndex.from_polygons(polygons, kind=kind, leaf_size=4)
+    queries, distances, polys, items = index.query_radius(points, 2.5)
+    expected = sorted((q, d, i) for q, point in enumerate(points)
+                      for d, i, _ in _brute_force(polygons, point, kind) if d <= 2.5)
+    assert queries.tolist() == [q for q, _, _ in expected]
+    assert np.allclose(distances, [d for _, d, _ in expected])
+    assert set(zip(queries.tolist(), items.tolist())) == {(q, i) for q, _, i in expected}
+    assert polys.tolist() == index._polygon_of[items].tolist()
+
+
+# ───── граничные случаи ─────
+def test_empty_index_and_invalid_arguments():
+    index = NearestIndex.from_polygons([])
+    assert len(index) == 0
+    distances, polys, items = index.query([(0, 0), (1, 1)], k=2)
+    assert np.isinf(distances).all() and (items == -1).all() and (polys == -1).all()
+    assert all(len(column) == 0 for column in index.query_radius((0, 0), 1))
+    with pytest.raises(ValueError):
+        NearestIndex.from_polygons([SQUARE], kind='face')
+    with pytest.raises(ValueError):
+        NearestIndex.from_polygons([SQUARE], leaf_size=0)
+    with pytest.raises(ValueError):
+        NearestIndex.from_polygons([SQUARE]).query((0, 0), k=0)
+    with pytest.raises(ValueError):
+        NearestIndex.from_polygons([SQUARE]).query_radius((0, 0), -1)
+
+
+# ───── ближайшая пара ─────
+@pytest.mark.parametrize("kind", ['vertex', 'edge'])
+@pytest.mark.parametrize("leaf_size, split_edges", [(1, True), (4, False), (16, False)])
+def test_closest_pair_matches_brute_force(kind, leaf_size, split_edges):
+    # мелкие многоугольники, чтобы ближайшая пара не пересекалась и расстояние было положительным
+    rng = random.Random(9)
+    polygons = [tuple((cx + r*math.cos(t), cy + r*math.sin(t)) for t in sorted(rng.uniform(0, 2*math.pi) for _ in range(6)))
+                for cx, cy, r in ((rng.uniform(0, 50), rng.uniform(0, 50), rng.uniform(0.05, 0.4)) for _ in range(150))]
+    batch = PolygonBatch.from_polygons(polygons + [()])
+    index = NearestIndex(batch, kind=kind, leaf_size=leaf_size, split_edges=split_edges)
+    distance, i, j, a, b = index.closest_pair()
+
+    # эталон: все пары элементов разных многоугольников
+    first, second = np.triu_indices(batch.n_vertices, 1)
+    owner, following = batch.polygon_ids(), batch.next_vertex()
+    first, second = first[owner[first] != owner[second]], second[owner[first] != owner[second]]
+    coords = batch.coords
+    if kind == 'vertex':
+        expected = np.hypot(*(coords[first] - coords[second]).T)
+    else:
+        expected = _segment_pair_distances(coords[first], coords[following[first]], coords[second], coords[following[second]])
+    assert expected.min() > 0 and math.isclose(distance, expected.min())
+    assert i < j and (owner[a], owner[b]) == (i, j)
+
+def test_closest_pair_degenerate():
+    assert NearestIndex.from_polygons([SQUARE, ()]).closest_pair() == (math.inf, -1, -1, -1, -1)
+    assert NearestIndex.from_polygons([]).closest_pair() == (math.inf, -1, -1, -1, -1)
+    # одинаковые многоугольники совпадают вершинами
+    assert NearestIndex.from_polygons([SQUARE, SQUARE]).closest_pair()[:3] == (0.0, 0, 1)
+    with pytest.raises(ValueError):
+        NearestIndex.from_polygons([SQUARE], kind='polygon').closest_pair()
@@ -0,0 +1,66 @@
+import math
+import functools
+import pytest
+
+from polyseq.parallel import par_pipeline
+from polyseq.generators import gen_reg_polygon_seq, gen_random_polygon_batch
+from polyseq.transformers import tr_translate, tr_rotate, Transform
+from polyseq.filters import flt_convex_polygon, flt_area_lt
+from polyseq.aggregates import agr_area, agr_max_side, agr_min_area, agr_perimeter, PerimeterAccumulator
+
+
+STAGES = (
+    ('map', functools.partial(tr_rotate, angle=30)),
+    ('filter', flt_convex_polygon),
+    ('map', Transform.translate(1, 2)),
+)
+
+@pytest.fixture(scope='module')
+def polygons():
+    return gen_random_polygon_batch(300, rng=5, packed=False)
+
+
+def sequential(polys, stages):
+    for kind, func in stages:
+        polys = map(func, polys) if kind == 'map' else filter(func, polys)
+    return list(polys)
+
+
+def test_ordered_output_matches_sequential(polygons):
+    result = list(par_pipeline(iter(polygons), STAGES, n_workers=2, chunk_size=16))
+    assert result == sequential(polygons, STAGES)
+
+
+def test_unordered_output_same_multiset(polygons):
+    result = par_pipeline(polygons, STAGES, n_workers=3, chunk_size=7, ordered=False)
+    assert sorted(result) == sorted(sequential(polygons, STAGES))
+
+
+@pytest.mark.parametrize("aggregate", [agr_area, agr_max_side, agr_min_area])
+def test_aggregate_merge(polygons, aggregate):
+    result = par_pipeline(polygons, STAGES, aggregate=aggregate, n_workers=2, chunk_size=32)
+    assert math.isclose(result, aggregate(sequential(polygons, STAGES)))
+
+
+def test_custom_aggregate_and_empty_chunks():
+    # всё, кроме первых двух квадратов, отфильтровывается – пустые блоки не мешают объединению
+    seq = gen_reg_polygon_seq(4, n_figs=100)
+    stages = [('filter', functools.partial(flt_area_lt, area=2)), ('map', functools.partial(tr_translate, dx=0, dy=1))]
+    count = par_pipeline(seq[:2], stages, aggregate=(len, sum), n_workers=2, chunk_size=1)
+    assert count == 2
+    assert par_pipeline(seq, [('filter', functools.partial(flt_area_lt, area=0))],
+                        aggregate=agr_area, n_workers=2, chunk_size=10) == 0
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        par_pipeline([], [('reduce', sum)])
+    with pytest.raises(ValueError):
+        par_pipeline([], aggregate=len)
+    with pytest.raises(ValueError):
+        par_pipeline([], chunk_size=0)
+
+
+def test_accumulator_aggregate(polygons):
+    result = par_pipeline(polygons, aggregate=PerimeterAccumulator, n_workers=2, chunk_size=50, ordered=False)
+    assert math.isclose(result, agr_perimeter(polygons))
@@ -0,0 +1,65 @@
+import math
+import pickle
+import pytest
+
+import polyseq.filters as filters
+from polyseq.polygon import Polygon
+from polyseq.filters import (flt_convex_polygon, flt_vertex_point, flt_area_lt, flt_shortest_side_lt,
+                             flt_point_inside, flt_polygon_vertices)
+from polyseq.aggregates import agr_area, agr_perimeter, agr_max_side, agr_min_area, agr_origin_nearest, agr_summary
+from polyseq.transformers import tr_rotate
+
+
+SQUARE = ((0,0), (1,0), (1,1), (0,1))
+NON_CONVEX = ((0,0), (2,0), (1,1), (2,2), (0,2))
+
+
+# ───── поведение кортежа ─────
+def test_behaves_like_tuple():
+    poly = Polygon(SQUARE)
+    assert len(poly) == 4
+    assert poly[1] == (1, 0)
+    assert poly[-1] == (0, 1)
+    assert tuple(poly) == SQUARE
+    assert (1, 1) in poly
+    assert poly == SQUARE
+    assert hash(poly) == hash(SQUARE)
+    assert tr_rotate(poly, 90) == tr_rotate(SQUARE, 90)
+
+def test_immutable_and_picklable():
+    poly = Polygon(SQUARE)
+    with pytest.raises(AttributeError):
+        poly.area = 5
+    with pytest.raises(AttributeError):
+        poly.extra = 1
+    assert pickle.loads(pickle.dumps(poly)) == poly
+
+
+# ───── кешируемые характеристики ─────
+def test_cached_properties():
+    poly = Polygon(NON_CONVEX)
+    assert math.isclose(poly.area, 3.0)
+    assert poly.sides[0] == 2
+    assert math.isclose(poly.perimeter, sum(poly.sides))
+    assert poly.bbox == (0, 0, 2, 2)
+    assert poly.is_convex is False
+    assert Polygon(SQUARE).is_convex is True
+    assert poly.sides is poly.sides  # вычисляется один раз
+
+def test_filters_use_cache(monkeypatch):
+    poly = Polygon(SQUARE)
+    poly.area, poly.sides, poly.is_convex  # заполняем кеш
+    monkeypatch.setattr(filters, '_is_convex', lambda p: pytest.fail('convexity recomputed'))
+    assert flt_convex_polygon(poly) is True
+    assert flt_point_inside(poly, (0.5, 0.5)) is True
+    assert flt_area_lt(poly, 2) is True
+    assert flt_shortest_side_lt(poly, 1.1) is True
+    assert flt_vertex_point(poly, (1, 0)) is True
+    assert flt_polygon_vertices(poly, ((1, 1),)) is True
+
+def test_aggregates_accept_polygons():
+    polys = [Polygon(SQUARE), Polygon(NON_CONVEX)]
+    tuples = [SQUARE, NON_CONVEX]
+    for agr in (agr_area, agr_perimeter, agr_max_side, agr_min_area, agr_origin_nearest):
+        assert math.isclose(agr(polys), agr(tuples))
+    assert agr_summary(polys) == agr_summary(tuples)
@@ -0,0 +1,112 @@
+import struct
+import zlib
+import numpy as np
+import pytest
+
+import polyseq.raster as raster
+from polyseq.raster import rasterize, to_rgba, write_png, render_png
+from polyseq.batch import PolygonBatch
+from polyseq.generators import gen_random_polygon_batch
+from polyseq.filters import flt_point_inside_simple
+
+
+SQUARE = ((0,0), (4,0), (4,4), (0,4))
+SHIFTED = ((2,2), (6,2), (6,6), (2,6))
+
+
+def _read_png(path):
+    # разбор PNG, записанного write_png: RGBA, 8 бит, без фильтрации строк
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    pos, chunks = 8, {}
+    while pos < len(data):
+        length, = struct.unpack('>I', data[pos:pos + 4])
+        kind = data[pos + 4:pos + 8]
+        body = data[pos + 8:pos + 8 + length]
+        assert struct.unpack('>I', data[pos + 8 + length:pos + 12 + length])[0] == zlib.crc32(kind + body)
+        chunks[kind] = body
+        pos += 12 + length
+    width, height, depth, color_type = struct.unpack('>IIBB', chunks[b'IHDR'][:10])
+    raw = np.frombuffer(zlib.decompress(chunks[b'IDAT']), dtype=np.uint8).reshape(height, -1)
+    assert (raw[:, 0] == 0).all()
+    return raw[:, 1:].reshape(height, width, 4 if color_type == 6 else 3)
+
+
+# ───── rasterize ─────
+def test_rasterize_count():
+    image = rasterize([SQUARE, SHIFTED], 6, 6, extent=(0, 0, 6, 6))
+    expected = np.array([[0, 0, 1, 1, 1, 1],
+                         [0, 0, 1, 1, 1, 1],
+                         [1, 1, 2, 2, 1, 1],
+                         [1, 1, 2, 2, 1, 1],
+                         [1, 1, 1, 1, 0, 0],
+                         [1, 1, 1, 1, 0, 0]])
+    assert (image == expected).all()
+
+def test_rasterize_sum_and_mean():
+    image = rasterize([SQUARE, SHIFTED], 6, 6, extent=(0, 0, 6, 6), agg='mean', values=[1.0, 3.0])
+    assert image[0, 5] == 3.0 and image[5, 0] == 1.0 and image[2, 2] == 2.0
+    assert np.isnan(image[0, 0])
+    image = rasterize([SQUARE, SHIFTED], 6, 6, extent=(0, 0, 6, 6), agg='sum', values=[1.0, 3.0])
+    assert image[2, 2] == 4.0 and image[0, 0] == 0.0
+
+def test_rasterize_matches_point_in_polygon():
+    polygons = gen_random_polygon_batch(20, rng=4, packed=False)
+    image = rasterize(polygons, 40, 30, extent=(0, 0, 50, 50))
+    xs = (np.arange(40) + 0.5)*50/40
+    ys = 50 - (np.arange(30) + 0.5)*50/30
+    for r in range(0, 30, 3):
+        for c in range(0, 40, 3):
+            expected = sum(flt_point_inside_simple(poly, (xs[c], ys[r])) for poly in polygons)
+            assert image[r, c] == expected
+
+def test_rasterize_streaming_and_tiles_agree(monkeypatch):
+    batch = gen_random_polygon_batch(300, rng=5)
+    whole = rasterize(batch, 64, 48)
+    extent = tuple(batch.bboxes()[:, :2].min(axis=0)) + tuple(batch.bboxes()[:, 2:].max(axis=0))
+    monkeypatch.setattr(raster, '_STREAM_CHUNK', 64)
+    monkeypatch.setattr(raster, '_SPAN_BLOCK', 1000)
+    assert (rasterize(iter(batch), 64, 48, extent=extent) == whole).all()
+    assert (rasterize(batch, 64, 48, n_tiles=7) == whole).all()
+    assert (rasterize(batch, 64, 48, n_workers=2) == whole).all()
+
+def test_rasterize_zoomed_in_extent(monkeypatch):
+    # многоугольники намного больше окна: блоки строк считаются по видимой высоте
+    huge = ((-1000, -1000), (1000, -1000), (1000, 1000), (-1000, 1000))
+    image = rasterize([huge]*300, 10, 10, extent=(0, 0, 1, 1))
+    assert (image == 300).all()
+    monkeypatch.setattr(raster, '_SPAN_BLOCK', 8)
+    assert (rasterize([huge]*300 + [SQUARE], 10, 10, extent=(0, 0, 1, 1)) == 301).all()
+
+def test_rasterize_invalid_arguments():
+    with pytest.raises(ValueError):
+        rasterize([SQUARE], 0, 10)
+    with pytest.raises(ValueError):
+        rasterize([SQUARE], 10, 10, agg='median')
+    with pytest.raises(ValueError):
+        rasterize([SQUARE], 10, 10, agg='mean')
+    with pytest.raises(ValueError):
+        rasterize([SQUARE], 10, 10, extent=(1, 0, 0, 1))
+    assert rasterize([], 3, 2).shape == (2, 3)
+
+
+# ───── PNG ─────
+def test_write_png_gray_roundtrip(tmp_path):
+    image = rasterize([SQUARE, SHIFTED], 6, 6, extent=(0, 0, 6, 6))
+    write_png(tmp_path / 'density.png', image, cmap=None)
+    rgba = _read_png(tmp_path / 'density.png')
+    assert rgba.shape == (6, 6, 4)
+    assert rgba[2, 2, 0] == 255 and rgba[0, 0, 0] == 0 and rgba[0, 2, 0] == 128
+    assert (rgba[..., 3] == 255).all()
+
+def test_render_png_log_scale_transparent_background(tmp_path):
+    image = render_png(tmp_path / 'density.png', [SQUARE, SHIFTED], 6, 6, extent=(0, 0, 6, 6))
+    rgba = _read_png(tmp_path / 'density.png')
+    assert image[0, 0] == 0 and rgba[0, 0, 3] == 0
+    assert rgba[2, 2, 3] == 255
+    assert (to_rgba(image, log=True)[..., 3] == 255).sum() == (image > 0).sum()
+
+def test_write_png_rejects_bad_arrays(tmp_path):
+    with pytest.raises(ValueError):
+        write_png(tmp_path / 'bad.png', np.zeros((2, 2, 2), dtype=np.uint8))
@@ -0,0 +1,122 @@
+import json
+import math
+import pickle
+import numpy as np
+import pytest
+
+from polyseq.sketches import QuantileSketch, HistogramSketch
+from polyseq.generators import gen_random_polygon_batch, gen_reg_polygon_seq
+from polyseq.parallel import par_pipeline
+
+
+@pytest.fixture(scope='module')
+def batch():
+    return gen_random_polygon_batch(20000, rng=8)
+
+
+def max_rank_error(sketch, values):
+    values = np.sort(values)
+    qs = np.linspace(0.01, 0.99, 99)
+    return max(abs(np.searchsorted(values, sketch.quantile(q), side='right')/len(values) - q) for q in qs)
+
+
+# ───── QuantileSketch ─────
+@pytest.mark.parametrize('metric, values', [('area', lambda b: b.areas()), ('side', lambda b: b.side_lengths()),
+                                            ('perimeter', lambda b: b.perimeters())])
+def test_quantile_error_within_bound(batch, metric, values):
+    sketch = QuantileSketch(metric, k=100, rng=0)
+    for start in range(0, len(batch), 500):
+        sketch.update_batch(batch[start:start + 500])
+    assert sketch.count == len(batch)
+    assert max_rank_error(sketch, values(batch)) <= sketch.rank_error()
+    assert len(sketch) < 4*sketch.k
+    assert sketch.quantile(0) == values(batch).min() and sketch.quantile(1) == values(batch).max()
+
+def test_quantile_update_matches_batch_distribution(batch):
+    polygons = batch[:3000].to_polygons()
+    one_by_one = QuantileSketch('side', k=64, rng=1)
+    for poly in polygons:
+        one_by_one.update(poly)
+    assert max_rank_error(one_by_one, batch[:3000].side_lengths()) <= one_by_one.rank_error()
+    assert math.isclose(one_by_one.rank(one_by_one.max), 1.0) and one_by_one.rank(-1) == 0.0
+
+def test_quantile_merge_and_serialization(batch):
+    parts = [QuantileSketch('area', rng=i).update_batch(batch[i*4000:(i + 1)*4000]) for i in range(5)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.count == len(batch)
+    assert max_rank_error(merged, batch.areas()) <= merged.rank_error()
+
+    restored = QuantileSketch.from_dict(json.loads(json.dumps(merged.to_dict())))
+    assert restored.quantiles((0, 0.5, 1)) == merged.quantiles((0, 0.5, 1))
+    assert pickle.loads(pickle.dumps(merged)).result() == merged.result()
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch('side'))
+
+def test_quantile_restored_sketch_stays_deterministic(batch):
+    # восстановленный скетч продолжает случайную последовательность исходного
+    sketch = QuantileSketch('side', k=32, rng=3).update_batch(batch[:2000])
+    data = json.loads(json.dumps(sketch.to_dict()))
+    runs = [QuantileSketch.from_dict(data).update_batch(batch[2000:6000]) for _ in range(2)]
+    sketch.update_batch(batch[2000:6000])
+    for restored in runs:
+        assert [level.tolist() for level in restored._levels] == [level.tolist() for level in sketch._levels]
+
+def test_quantile_sketch_strip_weights():
+    # все фигуры ленты одинаковы: квантили совпадают со стороной, а вес – с количеством фигур
+    strip = gen_reg_polygon_seq(n_sides=6, n_figs=10**9, l=2.5)
+    sketch = QuantileSketch('side').update_batch(strip)
+    assert sketch.count == 10**9 and len(sketch) < 4*sketch.k
+    assert all(math.isclose(value, 2.5) for value in sketch.result().values())
+    sketch.update_batch(gen_reg_polygon_seq(n_sides=4, n_figs=3*10**9, l=1))
+    assert math.isclose(sketch.quantile(0.1), 1.0) and math.isclose(sketch.quantile(0.9), 2.5)
+    with pytest.raises(ValueError):
+        sketch.update_batch(gen_reg_polygon_seq(n_sides=3))
+
+def test_quantile_sketch_par_pipeline(batch):
+    result = par_pipeline(batch[:2000].to_polygons(), aggregate=QuantileSketch, n_workers=2, chunk_size=300)
+    assert result[0] == batch[:2000].areas().min() and result[1] == batch[:2000].areas().max()
+
+def test_sketch_validation():
+    with pytest.raises(ValueError):
+        QuantileSketch('volume')
+    with pytest.raises(ValueError):
+        QuantileSketch(k=2)
+    with pytest.raises(ValueError):
+        QuantileSketch().quantile(0.5)
+    with pytest.raises(ValueError):
+        QuantileSketch().update_batch(gen_random_polygon_batch(5, rng=1)).quantile(1.5)
+    with pytest.raises(ValueError):
+        HistogramSketch([1, 1, 2])
+
+
+# ───── HistogramSketch ─────
+def test_histogram_counts_match_numpy(batch):
+    edges = np.linspace(0, 200, 21)
+    hist = HistogramSketch(edges, metric='area')
+    hist.update_batch(batch[:10000]).update_batch(batch[10000:].to_polygons())
+    areas = batch.areas()
+    assert (hist.counts == np.histogram(areas[areas < 200], edges)[0]).all()
+    assert hist.underflow == 0 and hist.overflow == (areas >= 200).sum()
+    assert hist.count == len(batch)
+
+def test_histogram_quantile_error_within_bucket(batch):
+    edges = np.linspace(0, 20, 81)
+    hist = HistogramSketch(edges, metric='side').update_batch(batch)
+    sides = np.sort(batch.side_lengths())
+    for q in (0.05, 0.25, 0.5, 0.75, 0.95):
+        assert abs(hist.quantile(q) - np.quantile(sides, q)) <= edges[1] - edges[0]
+
+def test_histogram_merge_and_serialization(batch):
+    edges = np.geomspace(0.01, 500, 30)
+    left = HistogramSketch(edges).update_batch(batch[:5000])
+    right = HistogramSketch(edges).update_batch(batch[5000:])
+    whole = HistogramSketch(edges).update_batch(batch)
+    assert (left.merge(right).counts == whole.counts).all()
+    restored = HistogramSketch.from_dict(json.loads(json.dumps(whole.to_dict())))
+    assert (restored.counts == whole.counts).all() and restored.result() == whole.result()
+    with pytest.raises(ValueError):
+        whole.merge(HistogramSketch(edges[:-1]))
+    with pytest.raises(ValueError):
+        QuantileSketch.from_dict(whole.to_dict())
@@ -0,0 +1,65 @@
+import math
+import pytest
+import numpy as np
+
+from polyseq.storage import PolygonWriter, PolygonFile, save_polygons, load_polygons
+from polyseq.batch import PolygonBatch
+from polyseq.generators import gen_reg_polygon_seq, gen_random_polygon_batch
+from polyseq.aggregates import agr_area, agr_perimeter
+from polyseq.filters import flt_area_lt
+
+
+SQUARE = ((0,0), (1,0), (1,1), (0,1))
+TRIANGLE = ((0,0), (3,0), (1.5,2))
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / 'polygons.pseq'
+
+
+def test_roundtrip_generator(path):
+    polys = tuple(gen_reg_polygon_seq(5, n_figs=100, l=2)) + (SQUARE, TRIANGLE)
+    assert save_polygons(path, iter(polys)) == 102
+    stored = load_polygons(path)
+    assert len(stored) == 102
+    assert tuple(stored) == polys
+    assert stored[100] == SQUARE
+    assert stored[-1] == TRIANGLE
+
+
+def test_random_access_is_zero_copy(path):
+    save_polygons(path, [SQUARE, TRIANGLE])
+    stored = load_polygons(path)
+    view = stored.vertices(1)
+    assert isinstance(view.base, np.memmap) or isinstance(view, np.memmap)
+    assert view.tolist() == [list(v) for v in TRIANGLE]
+    assert stored[1:].to_polygons() == (TRIANGLE,)
+
+
+def test_filters_and_aggregates_on_file(path):
+    batch = gen_random_polygon_batch(5000, rng=3)  # больше одного блока итерации
+    with PolygonWriter(path) as writer:
+        writer.write(SQUARE)
+        writer.write_many(batch)
+        writer.write_many([TRIANGLE])
+    stored = load_polygons(path)
+    expected = (SQUARE,) + batch.to_polygons() + (TRIANGLE,)
+    assert len(stored) == len(expected)
+    assert math.isclose(agr_area(stored), agr_area(expected))
+    assert math.isclose(stored.to_batch().perimeters().sum(), agr_perimeter(expected))
+    assert sum(1 for _ in filter(lambda p: flt_area_lt(p, 50), stored)) == \
+        sum(1 for _ in filter(lambda p: flt_area_lt(p, 50), expected))
+
+
+def test_empty_file(path):
+    save_polygons(path, [])
+    stored = load_polygons(path)
+    assert len(stored) == 0
+    assert list(stored) == []
+
+
+def test_not_a_polyseq_file(path):
+    path.write_bytes(b'x' * 100)
+    with pytest.raises(ValueError):
+        PolygonFile(path)
@@ -1,7 +1,20 @@
 import math
 import pytest
 
-from polyseq.transformers import tr_translate, tr_rotate, tr_symmetry, tr_homothety
+from polyseq.transformers import (
+    tr_translate,
+    tr_rotate,
+    tr_symmetry,
+    tr_homothety,
+    tr_stretch_plane,
+    tr_translate_batch,
+    tr_rotate_batch,
+    tr_symmetry_batch,
+    tr_homothety_batch,
+    tr_stretch_plane_batch,
+    Transform,
+)
+from polyseq.batch import PolygonBatch
 
 # Тестовый многоугольник (квадрат)
 SQUARE = ((0,0), (1,0), (1,1), (0,1))
@@ -96,3 +109,86 @@ def test_tr_homothety_negative_k():
     for v1, v2 in zip(scaled, expected):
         assert math.isclose(v1[0], v2[0], abs_tol=1e-9)
         assert math.isclose(v1[1], v2[1], abs_tol=1e-9)
+
+
+# ----------------- векторизованные версии -----------------
+TRIANGLE = ((0,0), (3,0), (1.5,2))
+
+@pytest.mark.parametrize("batch_fn, scalar_fn, args", [
+    (tr_translate_batch, tr_translate, (1, -2)),
+    (tr_rotate_batch, tr_rotate, (38,)),
+    (tr_symmetry_batch, tr_symmetry, ('x',)),
+    (tr_symmetry_batch, tr_symmetry, (1,)),
+    (tr_homothety_batch, tr_homothety, ((1, 2), -1.5)),
+    (tr_stretch_plane_batch, tr_stretch_plane, (2, 3)),
+])
+def test_batch_matches_scalar(batch_fn, scalar_fn, args):
+    polys = (SQUARE, TRIANGLE)
+    result = batch_fn(PolygonBatch.from_polygons(polys), *args).to_polygons()
+    expected = tuple(scalar_fn(p, *args) for p in polys)
+    for poly_r, poly_e in zip(result, expected):
+        for v1, v2 in zip(poly_r, poly_e):
+            assert math.isclose(v1[0], v2[0], abs_tol=1e-9)
+            assert math.isclose(v1[1], v2[1], abs_tol=1e-9)
+
+def test_batch_accepts_polygon_sequence():
+    result = tr_translate_batch([SQUARE], 1, 2)
+    assert isinstance(result, PolygonBatch)
+    assert result.to_polygons() == (((1,2), (2,2), (2,3), (1,3)),)
+
+def test_batch_errors():
+    batch = PolygonBatch.from_polygons([SQUARE])
+    with pytest.raises(TypeError):
+        tr_translate_batch(batch, 'a', 1)
+    with pytest.raises(ValueError):
+        tr_symmetry_batch(batch, 'z')
+    with pytest.raises(ValueError):
+        tr_homothety_batch(batch, (0,0), 0)
+
+
+# ----------------- Transform -----------------
+def assert_polys_close(result, expected):
+    assert len(result) == len(expected)
+    for v1, v2 in zip(result, expected):
+        assert math.isclose(v1[0], v2[0], abs_tol=1e-9)
+        assert math.isclose(v1[1], v2[1], abs_tol=1e-9)
+
+@pytest.mark.parametrize("transform, scalar_fn, args", [
+    (Transform.translate, tr_translate, (1, -2)),
+    (Transform.rotate, tr_rotate, (38,)),
+    (Transform.symmetry, tr_symmetry, ('y',)),
+    (Transform.homothety, tr_homothety, ((1, 2), -1.5)),
+    (Transform.stretch_plane, tr_stretch_plane, (2, 3)),
+])
+def test_transform_matches_function(transform, scalar_fn, args):
+    assert_polys_close(transform(*args)(TRIANGLE), scalar_fn(TRIANGLE, *args))
+
+def test_transform_composition_order():
+    # как в README: сначала перенос, затем поворот
+    fused = Transform.translate(0, 3).then(Transform.rotate(60))
+    assert fused == Transform.rotate(60) @ Transform.translate(0, 3)
+    assert_polys_close(fused(SQUARE), tr_rotate(tr_translate(SQUARE, 0, 3), 60))
+
+def test_transform_with_map():
+    chain = (Transform.stretch_plane(cy=3)
+             .then(Transform.rotate(45))
+             .then(Transform.homothety((0, 0), 1.5))
+             .then(Transform.translate(3, 3)))
+    polys = [SQUARE, TRIANGLE]
+    for result, poly in zip(map(chain, polys), polys):
+        expected = tr_translate(tr_homothety(tr_rotate(tr_stretch_plane(poly, cy=3), 45), (0, 0), 1.5), 3, 3)
+        assert_polys_close(result, expected)
+
+def test_transform_apply_batch():
+    t = Transform.rotate(30).then(Transform.translate(1, 1))
+    result = t.apply_batch(PolygonBatch.from_polygons([SQUARE, TRIANGLE])).to_polygons()
+    assert_polys_close(result[0], t(SQUARE))
+    assert_polys_close(result[1], t(TRIANGLE))
+
+def test_transform_errors():
+    with pytest.raises(TypeError):
+        Transform.rotate('ninety')
+    with pytest.raises(ValueError):
+        Transform.symmetry('z')
+    with pytest.raises(ValueError):
+        Transform(((1, 0, 0), (0, 1, 0), (1, 0, 1)))
@@ -4,9 +4,13 @@ import pytest
 import matplotlib
 matplotlib.use("Agg")  # без GUI
 import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
 from matplotlib.patches import Polygon
 
-from polyseq.visualization import visualize
+from polyseq.visualization import visualize, visualize_viewport
+from polyseq.batch import PolygonBatch
+from polyseq.generators import gen_reg_polygon_seq
+from polyseq.index import SpatialIndex
 
 
 # Простые полигоны для теста
@@ -64,3 +68,88 @@ def test_visualize_limits_and_aspect():
     assert ylim[0] < min(ys)
     assert ylim[1] > max(ys)
     assert ax.get_aspect() == 1.0
+
+def test_visualize_infinite_strip_far_window():
+    seq = gen_reg_polygon_seq(n_sides=4, step=1, l=1)
+    ax = visualize(seq, 10**9, 10**9 + 20)
+    assert len(ax.patches) == 20
+
+
+# ───── batched ─────
+def test_visualize_batched_single_collection_same_colors():
+    polygons = [tuple((x + k, y) for x, y in SQUARE) for k in range(50)]
+    ax_patches = visualize(polygons, 0, None)
+    ax = visualize(polygons, 0, None, batched=True)
+    assert len(ax.patches) == 0
+    assert len(ax.collections) == 1
+    collection = ax.collections[0]
+    assert isinstance(collection, PolyCollection)
+    assert len(collection.get_paths()) == 50
+    # цвета совпадают с цветами отдельных патчей
+    expected = [patch.get_facecolor() for patch in ax_patches.patches]
+    assert [tuple(c) for c in collection.get_facecolors()] == [tuple(c) for c in expected]
+    assert ax.get_xlim()[1] > 50
+
+def test_visualize_batched_kwargs_and_batch_source():
+    batch = PolygonBatch.from_polygons([SQUARE, TRIANGLE, SQUARE])
+    ax = visualize(batch, 0, 2, batched=True, fill=False, edgecolor='red', alpha=0.3)
+    collection = ax.collections[0]
+    assert len(collection.get_paths()) == 2
+    assert math.isclose(collection.get_alpha(), 0.3)
+    assert len(collection.get_facecolors()) == 0 or collection.get_facecolors()[0][3] == 0
+    assert tuple(collection.get_edgecolors()[0][:3]) == (1.0, 0.0, 0.0)
+    assert len(visualize(batch, 3, 3, batched=True).collections[0].get_paths()) == 0
+
+
+# ───── viewport ─────
+def _overlaps(poly, xlim, ylim):
+    xs, ys = [x for x, _ in poly], [y for _, y in poly]
+    return min(xs) <= xlim[1] and max(xs) >= xlim[0] and min(ys) <= ylim[1] and max(ys) >= ylim[0]
+
+@pytest.mark.parametrize('n_sides, step', [(3, 1), (4, 0.5), (6, 2.5), (5, -0.5)])
+def test_viewport_strip_matches_bbox_culling(n_sides, step):
+    seq = gen_reg_polygon_seq(n_sides=n_sides, step=step, n_figs=40, l=2)
+    for xlim in [(-3, 4), (10.3, 17.9), (-50, -10), (60, 200), (0, 1000)]:
+        ax = visualize_viewport(seq, xlim, (-1, 1))
+        expected = [poly for poly in seq if _overlaps(poly, xlim, (-1, 1))]
+        assert len(ax.patches) == len(expected)
+        for patch, poly in zip(ax.patches, expected):
+            assert all(math.isclose(a, b, abs_tol=1e-9) for a, b in zip(patch.get_xy()[:-1].ravel(),
+                                                                      itertools.chain.from_iterable(poly)))
+        plt.close(ax.figure)
+
+def test_viewport_infinite_strip_far_window_keeps_limits():
+    seq = gen_reg_polygon_seq(n_sides=6, step=0.5, l=1)
+    ax = visualize_viewport(seq, (1e12, 1e12 + 30), (-5, 5), batched=True)
+    assert 0 < len(ax.collections[0].get_paths()) <= 15
+    assert ax.get_xlim() == (1e12, 1e12 + 30)
+    assert ax.get_ylim() == (-5, 5)
+    # окно выше ленты – ничего не рисуется
+    assert len(visualize_viewport(seq, (0, 30), (5, 6)).patches) == 0
+
+def test_viewport_uses_axes_limits():
+    fig, ax = plt.subplots()
+    ax.set_xlim(0.5, 3.5)
+    ax.set_ylim(-1, 2)
+    polygons = [tuple((x + 2*k, y) for x, y in SQUARE) for k in range(10)]
+    assert visualize_viewport(iter(polygons), ax=ax) is ax
+    assert len(ax.patches) == 2
+    assert ax.get_xlim() == (0.5, 3.5)
+
+def test_viewport_batch_and_index_sources():
+    polygons = [tuple((x + 2*k, y + k) for x, y in TRIANGLE) for k in range(100)]
+    xlim, ylim = (10, 40), (8, 12)
+    expected = sum(_overlaps(poly, xlim, ylim) for poly in polygons)
+    ax = visualize_viewport(PolygonBatch.from_polygons(polygons), xlim, ylim, batched=True)
+    assert len(ax.collections[0].get_paths()) == expected
+    ax = visualize_viewport(SpatialIndex.from_polygons(polygons), xlim, ylim)
+    assert len(ax.patches) == expected
+
+def test_viewport_invalid_arguments():
+    with pytest.raises(ValueError):
+        visualize_viewport([SQUARE], xlim=(0, 1))
+    # шаг, равный минус ширине фигуры: все фигуры бесконечной ленты совпадают
+    xs = [x for x, _ in gen_reg_polygon_seq(n_sides=4).base_poly]
+    strip = gen_reg_polygon_seq(n_sides=4, step=-(max(xs) - min(xs)))
+    with pytest.raises(ValueError):
+        visualize_viewport(strip, (-1, 1), (-1, 1))